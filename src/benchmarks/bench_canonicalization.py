@@ -0,0 +1,40 @@
+"""Throughput benchmarks of text canonicalization on multi-kilobyte messages.
+
+Run from the src directory with ``python -m benchmarks.bench_canonicalization``.
+"""
+
+from timeit import repeat
+
+from services.goolabs.canonicalization import Canonicalizer, DEFAULT_CANONICALIZERS
+
+LINE = "！今日は　とても いい天気ですね。ＡＢＣ１２３のｶﾀｶﾅも 混ざっています。 \n"
+SIZES_IN_KILOBYTES = (2, 16, 64)
+NUMBER = 200
+
+
+def _message(size_in_kilobytes: int) -> str:
+    line_size = len(LINE.encode())
+    return LINE * (size_in_kilobytes * 1024 // line_size + 1)
+
+
+def main() -> None:
+    canonicalizers = {
+        "default": Canonicalizer(),
+        "nfkc": DEFAULT_CANONICALIZERS["textpair"],
+        "no spaces": Canonicalizer(unify_spaces=False),
+    }
+    for size in SIZES_IN_KILOBYTES:
+        message = _message(size)
+        megabytes = len(message.encode()) / 1024 / 1024
+        for name, canonicalizer in canonicalizers.items():
+            seconds = (
+                min(repeat(lambda: canonicalizer(message), number=NUMBER)) / NUMBER
+            )
+            print(
+                f"{size:>3} KiB {name:>10}: {seconds * 1e6:9.1f} us/message, "
+                f"{megabytes / seconds:7.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmarks of vectorized aggregations over a columnar morphology dataset.
+
+Run from the src directory with ``python -m benchmarks.bench_columnar``.
+"""
+
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+from services.analytics import ColumnarExporter, ColumnarReader
+from services.goolabs import AnalyzedMorpheme, AnalyzedMorphology, PartOfSpeechType
+
+FORMS = [f"語{index}" for index in range(20000)]
+POS_TYPES = list(PartOfSpeechType)
+RECORDS = 20000
+MORPHEMES_PER_RECORD = 50
+
+
+def _morphology(generator: np.random.Generator) -> AnalyzedMorphology:
+    forms = generator.zipf(1.3, MORPHEMES_PER_RECORD) % len(FORMS)
+    pos_types = generator.integers(len(POS_TYPES), size=MORPHEMES_PER_RECORD)
+    return AnalyzedMorphology(
+        [
+            [
+                AnalyzedMorpheme(FORMS[form], POS_TYPES[pos], None)
+                for form, pos in zip(forms, pos_types)
+            ]
+        ],
+        [],
+        [],
+    )
+
+
+def main() -> None:
+    generator = np.random.default_rng(0)
+    with TemporaryDirectory() as path:
+        started_at = perf_counter()
+        with ColumnarExporter(path) as exporter:
+            for _ in range(RECORDS):
+                exporter.write(_morphology(generator))
+        print(
+            f"export: {RECORDS * MORPHEMES_PER_RECORD} morphemes "
+            f"in {perf_counter() - started_at:.2f} s"
+        )
+
+        reader = ColumnarReader(path)
+        started_at = perf_counter()
+        counts = np.bincount(reader.read_column("morphemes", "form"))
+        top = np.argsort(counts)[::-1][:10]
+        pos_counts = np.bincount(reader.read_column("morphemes", "pos"))
+        print(
+            f"form and pos counts: {(perf_counter() - started_at) * 1e3:.1f} ms, "
+            f"top forms {reader.read_dictionary('morphemes', 'form')[top].tolist()}, "
+            f"{len(pos_counts)} pos types"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Micro-benchmarks of GoolabsDatetime.from_goolabs_format.
+
+Run from the src directory with ``python -m benchmarks.bench_goolabs_datetime``.
+"""
+
+from timeit import repeat
+
+from services.goolabs import GoolabsDatetime
+from services.goolabs.goolabs_value_objects import _parse_goolabs_format
+
+SAMPLES = {
+    "year": "2015",
+    "year-month": "2022-06",
+    "full timestamp": "2016-04-01T10:30:00",
+}
+NUMBER = 100_000
+
+
+def _best_time_per_call(statement, number: int = NUMBER) -> float:
+    return min(repeat(statement, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    for form, date_string in SAMPLES.items():
+        warm = _best_time_per_call(
+            lambda: GoolabsDatetime.from_goolabs_format(date_string)
+        )
+
+        def cold() -> GoolabsDatetime:
+            _parse_goolabs_format.cache_clear()
+            return GoolabsDatetime.from_goolabs_format(date_string)
+
+        cold_time = _best_time_per_call(cold)
+        print(
+            f"{form:>15} {date_string!r:>23}: "
+            f"memoized {warm * 1e9:7.1f} ns/call, "
+            f"unmemoized {cold_time * 1e9:7.1f} ns/call"
+        )
+
+
+if __name__ == "__main__":
+    main()
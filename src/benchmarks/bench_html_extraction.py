@@ -0,0 +1,68 @@
+"""Throughput benchmarks of article extraction from large HTML pages.
+
+Compares the streaming extractor and the main content extractor built on it,
+which the bot runs, with the BeautifulSoup tree based extraction they replaced
+when beautifulsoup4 is installed.
+
+Run from the src directory with ``python -m benchmarks.bench_html_extraction``.
+"""
+
+from timeit import repeat
+
+from utils.html_article_extractor import extract_article
+from utils.main_content_extractor import extract_main_content
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+BLOCK = """<div class="item"><a href="/news/1">関連記事へのリンク</a>
+<p>今日は<b>とても</b>いい天気ですね。公園まで  散歩に行きましょう。</p>
+<script>window.dataLayer.push({"event": "view"});</script>
+<style>.item { margin: 0 }</style></div>
+"""
+SIZES_IN_KILOBYTES = (16, 256, 1024)
+NUMBER = 5
+
+
+def _page(size_in_kilobytes: int) -> bytes:
+    block_size = len(BLOCK.encode())
+    blocks = BLOCK * (size_in_kilobytes * 1024 // block_size + 1)
+    return (
+        f"<html><head><title>記事</title></head><body>{blocks}</body></html>".encode()
+    )
+
+
+def _extract_article_with_beautiful_soup(content: bytes) -> tuple[str, str]:
+    soup = BeautifulSoup(content, features="html.parser")
+    title = soup.title.string
+    for script in soup(["script", "style"]):
+        script.extract()
+    lines = (line.strip() for line in soup.get_text().splitlines())
+    chunks = tuple(
+        chunk
+        for line in lines
+        for phrase in line.split("  ")
+        if (chunk := phrase.strip())
+    )
+    return title, "\n".join(chunks)
+
+
+def main() -> None:
+    extractors = {"streaming": extract_article, "main": extract_main_content}
+    if BeautifulSoup is not None:
+        extractors["bs4"] = _extract_article_with_beautiful_soup
+    for size in SIZES_IN_KILOBYTES:
+        page = _page(size)
+        megabytes = len(page) / 1024 / 1024
+        for name, extractor in extractors.items():
+            seconds = min(repeat(lambda: extractor(page), number=NUMBER)) / NUMBER
+            print(
+                f"{size:>5} KiB {name:>9}: {seconds * 1e3:8.1f} ms/page, "
+                f"{megabytes / seconds:6.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
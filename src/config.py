@@ -2,6 +2,7 @@ import logging
 
 import os
 import json
+from datetime import timedelta
 
 from log_config import configure_logging
 
@@ -14,6 +15,22 @@ def get_bool_variable(name: str, default: bool = False) -> bool:
         return value.lower() in ("true", "1")
 
 
+def get_int_variable(name: str, default: int | None = None) -> int | None:
+    value = os.environ.get(name, None)
+    if value is None:
+        return default
+    else:
+        return int(value)
+
+
+def get_float_variable(name: str, default: float | None = None) -> float | None:
+    value = os.environ.get(name, None)
+    if value is None:
+        return default
+    else:
+        return float(value)
+
+
 def load_commands_language_aliases_from_json(
     path: str, default_language: str = "en"
 ) -> dict:
@@ -43,6 +60,65 @@ LOCALIZATION_PATH = os.getenv("LOCALIZATION_PATH", "../localization")
 
 # Goolabs
 GOOLABS_APP_ID = os.getenv("GOOLABS_APP_ID")
+GOOLABS_CHRONO_CACHE_GRANULARITY = (
+    timedelta(seconds=seconds)
+    if (seconds := get_int_variable("GOOLABS_CHRONO_CACHE_GRANULARITY"))
+    else None
+)
+GOOLABS_CHRONO_CACHE_SIZE = get_int_variable("GOOLABS_CHRONO_CACHE_SIZE", 1024)
+GOOLABS_ENABLE_PREFILTERS = get_bool_variable("GOOLABS_ENABLE_PREFILTERS", False)
+GOOLABS_CANONICALIZE_TEXT = get_bool_variable("GOOLABS_CANONICALIZE_TEXT", True)
+GOOLABS_MORPH_SENTENCE_CACHE_SIZE = get_int_variable(
+    "GOOLABS_MORPH_SENTENCE_CACHE_SIZE", 0
+)
+GOOLABS_MORPH_MAX_CHUNK_SIZE = get_int_variable("GOOLABS_MORPH_MAX_CHUNK_SIZE")
+GOOLABS_MAX_CONCURRENT_REQUESTS = get_int_variable("GOOLABS_MAX_CONCURRENT_REQUESTS", 4)
+GOOLABS_SIMILARITY_CACHE_SIZE = get_int_variable("GOOLABS_SIMILARITY_CACHE_SIZE", 1024)
+GOOLABS_APPROXIMATE_SIMILARITY_INDEX_SIZE = get_int_variable(
+    "GOOLABS_APPROXIMATE_SIMILARITY_INDEX_SIZE", 0
+)
+GOOLABS_READING_DICTIONARY_PATH = os.getenv("GOOLABS_READING_DICTIONARY_PATH")
+GOOLABS_READING_DICTIONARY_SAVE_EVERY = get_int_variable(
+    "GOOLABS_READING_DICTIONARY_SAVE_EVERY", 1000
+)
+GOOLABS_LOCAL_FURIGANA_MIN_CONFIDENCE = get_float_variable(
+    "GOOLABS_LOCAL_FURIGANA_MIN_CONFIDENCE", 0.9
+)
+GOOLABS_KEYWORD_CACHE_SIZE = get_int_variable("GOOLABS_KEYWORD_CACHE_SIZE", 256)
+
+# Articles
+ARTICLE_FETCH_CONNECT_TIMEOUT = get_float_variable("ARTICLE_FETCH_CONNECT_TIMEOUT", 5)
+ARTICLE_FETCH_READ_TIMEOUT = get_float_variable("ARTICLE_FETCH_READ_TIMEOUT", 10)
+ARTICLE_FETCH_TOTAL_TIMEOUT = get_float_variable("ARTICLE_FETCH_TOTAL_TIMEOUT", 20)
+ARTICLE_MAX_BYTES = get_int_variable("ARTICLE_MAX_BYTES", 5 * 1024 * 1024)
+ARTICLE_FETCH_LIMIT_PER_HOST = get_int_variable("ARTICLE_FETCH_LIMIT_PER_HOST", 4)
+ARTICLE_MAX_BODY_LENGTH = get_int_variable("ARTICLE_MAX_BODY_LENGTH", 20000)
+ARTICLE_CACHE_MAX_BYTES = get_int_variable("ARTICLE_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+ARTICLE_CACHE_TTL = get_float_variable("ARTICLE_CACHE_TTL", 600)
+ARTICLE_CACHE_PATH = os.getenv("ARTICLE_CACHE_PATH")
+ARTICLE_PARSING_PROCESSES = get_int_variable("ARTICLE_PARSING_PROCESSES", 2)
+ARTICLE_PARSING_MAX_JOBS_PER_PROCESS = get_int_variable(
+    "ARTICLE_PARSING_MAX_JOBS_PER_PROCESS", 100
+)
+ARTICLE_PARSING_CPU_TIME_LIMIT = get_float_variable("ARTICLE_PARSING_CPU_TIME_LIMIT", 5)
+ARTICLE_MAX_CONCURRENT_LOADS = get_int_variable("ARTICLE_MAX_CONCURRENT_LOADS", 8)
+ARTICLE_MAX_CONCURRENT_LOADS_PER_HOST = get_int_variable(
+    "ARTICLE_MAX_CONCURRENT_LOADS_PER_HOST", 2
+)
+ARTICLE_MAX_URLS_PER_COMMAND = get_int_variable("ARTICLE_MAX_URLS_PER_COMMAND", 10)
+
+# Scheduler
+SCHEDULER_MAX_CONCURRENCY = get_int_variable("SCHEDULER_MAX_CONCURRENCY", 8)
+SCHEDULER_MAX_CONCURRENCY_PER_GUILD = get_int_variable(
+    "SCHEDULER_MAX_CONCURRENCY_PER_GUILD", 4
+)
+SCHEDULER_MAX_CONCURRENCY_PER_USER = get_int_variable(
+    "SCHEDULER_MAX_CONCURRENCY_PER_USER", 2
+)
+SCHEDULER_MAX_QUEUED = get_int_variable("SCHEDULER_MAX_QUEUED", 256)
+SCHEDULER_MAX_QUEUED_PER_GUILD = get_int_variable("SCHEDULER_MAX_QUEUED_PER_GUILD", 32)
+SCHEDULER_MAX_QUEUED_PER_USER = get_int_variable("SCHEDULER_MAX_QUEUED_PER_USER", 4)
+SCHEDULER_INTERACTIVE_RESERVED = get_int_variable("SCHEDULER_INTERACTIVE_RESERVED", 2)
 
 # Discord
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
@@ -1,15 +1,37 @@
+import asyncio
+from contextlib import nullcontext
+from typing import Any, Callable
+
 from discord.ext import commands
 from multilingual_discord.ext.commands import *
 import discord
 
-from services.goolabs import GoolabsService
+from services.goolabs import ExtractedKeywords, GoolabsService
 
-from utils.html_article_extractor import extract_article
+from utils.article_cache import ArticleCache
+from utils.article_fetcher import ArticleFetcher, FetchedArticle
+from utils.exceptions import ArticleFetchError, SchedulerOverloadedError
+from utils.fair_scheduler import FairScheduler, Priority
+from utils.host_limiter import HostLimiter
+from utils.html_parsing_pool import HTMLParsingPool
 
-from discord_bot.exceptions import NoSentenceException
+from discord_bot.exceptions import (
+    NoSentenceException,
+    NoURLException,
+    TooManyURLsException,
+)
 from discord_bot.display import goolabs_display
 
-from config import DISCORD_LANGUAGE_ALIASES as DLA
+from config import (
+    ARTICLE_MAX_BODY_LENGTH,
+    ARTICLE_MAX_CONCURRENT_LOADS,
+    ARTICLE_MAX_CONCURRENT_LOADS_PER_HOST,
+    ARTICLE_MAX_URLS_PER_COMMAND,
+    DISCORD_LANGUAGE_ALIASES as DLA,
+)
+
+# Focuses of keywords extracted by the all subcommand, None stands for no focus
+_KEYWORD_FOCUSES = (None, "ORG", "PSN", "LOC")
 
 
 async def _get_sentence_from_context(
@@ -40,13 +62,128 @@ class GoolabsCog(commands.Cog):
     def __init__(self, client):
         self.client = client
         self.service = GoolabsService()
+        self.fetcher = ArticleFetcher()
+        self.article_cache = ArticleCache()
+        self.parsing_pool = HTMLParsingPool()
+        self.scheduler = FairScheduler()
+        self.article_limiter = HostLimiter(
+            ARTICLE_MAX_CONCURRENT_LOADS, ARTICLE_MAX_CONCURRENT_LOADS_PER_HOST
+        )
+
+    def cog_unload(self) -> None:
+        self.article_cache.save()
+        self.service.close()
+        self.parsing_pool.close()
+        self.scheduler.close()
+        self.client.loop.create_task(self.fetcher.close())
+
+    async def _extract_article(self, article: FetchedArticle) -> tuple[str, str]:
+        return await self.parsing_pool.extract_main_content(
+            article.content, article.charset, ARTICLE_MAX_BODY_LENGTH
+        )
+
+    async def _get_article(self, url: str) -> tuple[str, str]:
+        return await self.article_cache.load(url, self.fetcher, self._extract_article)
+
+    async def _run(
+        self,
+        ctx: MultilingualContext,
+        function: Callable,
+        *args,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs,
+    ) -> Any:
+        """Runs the blocking service method in a thread once the scheduler
+        gives the turn to the author, the cost of the call is the length of its texts"""
+        # Direct messages are scheduled as guilds of their own
+        guild = ctx.guild.id if ctx.guild is not None else ctx.author.id
+        cost = sum(len(arg) for arg in args if isinstance(arg, str))
+        return await self.scheduler.run(
+            guild,
+            ctx.author.id,
+            function,
+            *args,
+            cost=cost,
+            priority=priority,
+            **kwargs,
+        )
+
+    async def _get_article_keywords(
+        self,
+        ctx: MultilingualContext,
+        url: str,
+        focus: str | None,
+        priority: Priority = Priority.INTERACTIVE,
+        scheduled: asyncio.Semaphore = None,
+    ) -> tuple[str, ExtractedKeywords]:
+        """Returns the title and keywords of the article, the semaphore
+        bounds the number of jobs of one command passed to the scheduler"""
+        # The load slot is released before waiting for the scheduler,
+        # so articles of other commands are not blocked by queued jobs
+        async with self.article_limiter.acquire(url):
+            title, body = await self._get_article(url)
+        async with scheduled or nullcontext():
+            return title, await self._run(
+                ctx,
+                self.service.extract_keywords,
+                title,
+                body,
+                focus=focus,
+                priority=priority,
+            )
+
+    async def _reply_with_keywords(
+        self, ctx: MultilingualContext, urls: tuple[str, ...], focus: str = None
+    ) -> None:
+        if not urls:
+            raise NoURLException
+        if len(urls) > ARTICLE_MAX_URLS_PER_COMMAND:
+            raise TooManyURLsException(ARTICLE_MAX_URLS_PER_COMMAND)
+        if len(urls) == 1:
+            title, result = await self._get_article_keywords(ctx, urls[0], focus)
+            await ctx.reply(
+                embed=goolabs_display.display_keywords(ctx.language, result, title)
+            )
+            return
+        # Several articles are bulk work, interactive commands go ahead of it.
+        # Articles wait for their turn instead of overflowing the queue
+        # of the author. The reply is edited as articles are completed in any order
+        urls = list(urls)
+        articles = {}
+        scheduled = asyncio.Semaphore(max(self.scheduler.max_queued_per_user, 1))
+        message = await ctx.reply(
+            embed=goolabs_display.display_keywords_of_articles(
+                ctx.language, urls, articles
+            )
+        )
+
+        async def get_indexed_article_keywords(index: int, url: str) -> tuple:
+            try:
+                return index, await self._get_article_keywords(
+                    ctx, url, focus, Priority.BULK, scheduled
+                )
+            except Exception as exception:
+                return index, exception
+
+        for completed in asyncio.as_completed(
+            [get_indexed_article_keywords(index, url) for index, url in enumerate(urls)]
+        ):
+            index, article = await completed
+            articles[index] = article
+            await message.edit(
+                embed=goolabs_display.display_keywords_of_articles(
+                    ctx.language, urls, articles
+                )
+            )
 
     @multilingual_command(language_aliases=DLA["CHRONO"])
     async def chrono(self, ctx: MultilingualContext, *, sentence: str = None) -> None:
         sentence = await _get_sentence_from_context(ctx, sentence)
         await ctx.reply(
             embed=goolabs_display.display_times(
-                ctx.language, self.service.normalize_times(sentence), sentence
+                ctx.language,
+                await self._run(ctx, self.service.normalize_times, sentence),
+                sentence,
             )
         )
 
@@ -55,7 +192,9 @@ class GoolabsCog(commands.Cog):
         sentence = await _get_sentence_from_context(ctx, sentence)
         await ctx.reply(
             embed=goolabs_display.display_named_entities(
-                ctx.language, self.service.extract_named_entities(sentence), sentence
+                ctx.language,
+                await self._run(ctx, self.service.extract_named_entities, sentence),
+                sentence,
             )
         )
 
@@ -64,7 +203,9 @@ class GoolabsCog(commands.Cog):
         sentence = await _get_sentence_from_context(ctx, sentence)
         await ctx.reply(
             embed=goolabs_display.display_furigana(
-                ctx.language, self.service.convert_to_furigana(sentence), sentence
+                ctx.language,
+                await self._run(ctx, self.service.convert_to_furigana, sentence),
+                sentence,
             )
         )
 
@@ -86,7 +227,9 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_furigana(
                 ctx.language,
-                self.service.convert_to_furigana(sentence, "hiragana"),
+                await self._run(
+                    ctx, self.service.convert_to_furigana, sentence, "hiragana"
+                ),
                 sentence,
             )
         )
@@ -97,50 +240,54 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_furigana(
                 ctx.language,
-                self.service.convert_to_furigana(sentence, "katakana"),
+                await self._run(
+                    ctx, self.service.convert_to_furigana, sentence, "katakana"
+                ),
                 sentence,
             )
         )
 
     @multilingual_group(invoke_without_command=True, language_aliases=DLA["KEYWORDS"])
-    async def keywords(self, ctx: MultilingualContext, url: str) -> None:
-        title, body = extract_article(url)
-        await ctx.reply(
-            embed=goolabs_display.display_keywords(
-                ctx.language, self.service.extract_keywords(title, body), title
-            )
-        )
+    async def keywords(self, ctx: MultilingualContext, *urls: str) -> None:
+        await self._reply_with_keywords(ctx, urls)
 
     @keywords.command(name="org", language_aliases=DLA["ORG"])
-    async def keywords_org(self, ctx: MultilingualContext, url: str) -> None:
-        title, body = extract_article(url)
-        await ctx.reply(
-            embed=goolabs_display.display_keywords(
-                ctx.language,
-                self.service.extract_keywords(title, body, focus="ORG"),
-                title,
-            )
-        )
+    async def keywords_org(self, ctx: MultilingualContext, *urls: str) -> None:
+        await self._reply_with_keywords(ctx, urls, focus="ORG")
 
     @keywords.command(name="psn", language_aliases=DLA["PSN"])
-    async def keywords_psn(self, ctx: MultilingualContext, url: str) -> None:
-        title, body = extract_article(url)
-        await ctx.reply(
-            embed=goolabs_display.display_keywords(
-                ctx.language,
-                self.service.extract_keywords(title, body, focus="PSN"),
-                title,
-            )
-        )
+    async def keywords_psn(self, ctx: MultilingualContext, *urls: str) -> None:
+        await self._reply_with_keywords(ctx, urls, focus="PSN")
 
     @keywords.command(name="loc", language_aliases=DLA["LOC"])
-    async def keywords_loc(self, ctx: MultilingualContext, url: str) -> None:
-        title, body = extract_article(url)
+    async def keywords_loc(self, ctx: MultilingualContext, *urls: str) -> None:
+        await self._reply_with_keywords(ctx, urls, focus="LOC")
+
+    @keywords.command(name="all", language_aliases=DLA["ALL"])
+    async def keywords_all(self, ctx: MultilingualContext, url: str) -> None:
+        async with self.article_limiter.acquire(url):
+            title, body = await self._get_article(url)
+        # Focuses wait for their turn instead of overflowing the queue
+        # of the author, the rest are cancelled once one of them fails
+        scheduled = asyncio.Semaphore(max(self.scheduler.max_queued_per_user, 1))
+
+        async def extract_keywords(focus: str | None) -> ExtractedKeywords:
+            async with scheduled:
+                return await self._run(
+                    ctx, self.service.extract_keywords, title, body, focus=focus
+                )
+
+        tasks = [
+            asyncio.create_task(extract_keywords(focus)) for focus in _KEYWORD_FOCUSES
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
         await ctx.reply(
-            embed=goolabs_display.display_keywords(
-                ctx.language,
-                self.service.extract_keywords(title, body, focus="LOC"),
-                title,
+            embed=goolabs_display.display_all_keywords(
+                ctx.language, dict(zip(_KEYWORD_FOCUSES, results)), title
             )
         )
 
@@ -151,7 +298,9 @@ class GoolabsCog(commands.Cog):
         sentence = await _get_sentence_from_context(ctx, sentence)
         await ctx.reply(
             embed=goolabs_display.display_morphology(
-                ctx.language, self.service.analyze_morphology(sentence), sentence
+                ctx.language,
+                await self._run(ctx, self.service.analyze_morphology, sentence),
+                sentence,
             )
         )
 
@@ -163,8 +312,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_nouns(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="名詞|名詞接尾辞|冠名詞|英語接尾辞"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="名詞|名詞接尾辞|冠名詞|英語接尾辞",
                 ),
                 sentence,
             )
@@ -178,8 +330,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_verbs(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="動詞語幹|動詞活用語尾|動詞接尾辞|冠動詞"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="動詞語幹|動詞活用語尾|動詞接尾辞|冠動詞",
                 ),
                 sentence,
             )
@@ -193,8 +348,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_adjectives(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="形容詞語幹|形容詞接尾辞|冠形容詞"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="形容詞語幹|形容詞接尾辞|冠形容詞",
                 ),
                 sentence,
             )
@@ -208,8 +366,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_numbers(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="Number|助数詞|助助数詞|冠数詞"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="Number|助数詞|助助数詞|冠数詞",
                 ),
                 sentence,
             )
@@ -223,8 +384,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_morphology(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="補助名詞|接続詞|接続接尾辞|判定詞|連体詞"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="補助名詞|接続詞|接続接尾辞|判定詞|連体詞",
                 ),
                 sentence,
             )
@@ -238,7 +402,9 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_morphology(
                 ctx.language,
-                self.service.analyze_morphology(sentence, pos_filter="連用詞"),
+                await self._run(
+                    ctx, self.service.analyze_morphology, sentence, pos_filter="連用詞"
+                ),
                 sentence,
             )
         )
@@ -251,7 +417,12 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_morphology(
                 ctx.language,
-                self.service.analyze_morphology(sentence, pos_filter="独立詞|間投詞"),
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="独立詞|間投詞",
+                ),
                 sentence,
             )
         )
@@ -264,8 +435,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_morphology(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="格助詞|引用助詞|連用助詞|終助詞"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="格助詞|引用助詞|連用助詞|終助詞",
                 ),
                 sentence,
             )
@@ -279,8 +453,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_morphology(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="括弧|句点|読点|空白|Symbol"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="括弧|句点|読点|空白|Symbol",
                 ),
                 sentence,
             )
@@ -294,8 +471,11 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_morphology(
                 ctx.language,
-                self.service.analyze_morphology(
-                    sentence, pos_filter="Alphabet|Kana|Katakana|Kanji|Roman|Undef"
+                await self._run(
+                    ctx,
+                    self.service.analyze_morphology,
+                    sentence,
+                    pos_filter="Alphabet|Kana|Katakana|Kanji|Roman|Undef",
                 ),
                 sentence,
             )
@@ -306,7 +486,9 @@ class GoolabsCog(commands.Cog):
         sentence = await _get_sentence_from_context(ctx, sentence)
         await ctx.reply(
             embed=goolabs_display.display_slots(
-                ctx.language, self.service.extract_slot_values(sentence), sentence
+                ctx.language,
+                await self._run(ctx, self.service.extract_slot_values, sentence),
+                sentence,
             )
         )
 
@@ -317,7 +499,7 @@ class GoolabsCog(commands.Cog):
         await ctx.reply(
             embed=goolabs_display.display_similarity(
                 ctx.language,
-                self.service.calculate_similarity(text1, text2),
+                await self._run(ctx, self.service.calculate_similarity, text1, text2),
                 text1,
                 text2,
             )
@@ -331,4 +513,26 @@ class GoolabsCog(commands.Cog):
                         return await ctx.reply(
                             goolabs_display.display_no_sentence_exception(ctx.language)
                         )
+                    case NoURLException():
+                        return await ctx.reply(
+                            goolabs_display.display_no_url_exception(ctx.language)
+                        )
+                    case TooManyURLsException() as urls_error:
+                        return await ctx.reply(
+                            goolabs_display.display_too_many_urls_exception(
+                                ctx.language, urls_error
+                            )
+                        )
+                    case SchedulerOverloadedError():
+                        return await ctx.reply(
+                            goolabs_display.display_scheduler_overloaded_exception(
+                                ctx.language
+                            )
+                        )
+                    case ArticleFetchError() as fetch_error:
+                        return await ctx.reply(
+                            goolabs_display.display_article_fetch_exception(
+                                ctx.language, fetch_error
+                            )
+                        )
         await ctx.reply(goolabs_display.display_error(ctx.language))
@@ -2,6 +2,8 @@ from typing import Generator, Iterable
 
 from discord import Embed
 
+from utils.exceptions import ArticleFetchError, SchedulerOverloadedError
+from discord_bot.exceptions import TooManyURLsException
 from utils.translator import Translator
 from services.goolabs import *
 
@@ -14,6 +16,22 @@ def display_error(language: str) -> str:
     return Translator(language)("ERROR")
 
 
+def display_no_url_exception(language: str) -> str:
+    return Translator(language)("NO_URL_EXCEPTION")
+
+
+def display_too_many_urls_exception(language: str, error: TooManyURLsException) -> str:
+    return Translator(language)(error.code).format(max_urls=error.max_urls)
+
+
+def display_article_fetch_exception(language: str, error: ArticleFetchError) -> str:
+    return Translator(language)(error.code)
+
+
+def display_scheduler_overloaded_exception(language: str) -> str:
+    return Translator(language)(SchedulerOverloadedError.code)
+
+
 def display_times(language: str, result: NormalizedTimes, initial: str) -> Embed:
     tr = Translator(language)
     embed = Embed(
@@ -84,6 +102,62 @@ def display_keywords(language: str, result: ExtractedKeywords, title: str) -> Em
     return embed
 
 
+def display_all_keywords(
+    language: str, results: dict[str | None, ExtractedKeywords], title: str
+) -> Embed:
+    """Displays keywords extracted from one article with every focus,
+    results are keyed by the focus, None for keywords without a focus"""
+    tr = Translator(language)
+    embed = Embed(
+        title=tr("KEYWORDS_EMBED_TITLE"),
+        description=tr("KEYWORDS_EMBED_DESCRIPTION").format(title=title),
+    )
+    for focus, result in results.items():
+        keywords = "\n".join(
+            f"{keyword.text} — {keyword.score}" for keyword in result.keywords
+        )
+        embed.add_field(
+            name=tr(focus) if focus else tr("KEYWORDS_ALL_GENERAL"),
+            value=(keywords or tr("NOTHING"))[:1024],
+        )
+    return embed
+
+
+def _display_article_keywords(
+    tr: Translator, url: str, article: tuple[str, ExtractedKeywords] | Exception | None
+) -> tuple[str, str]:
+    match article:
+        case None:
+            return url[:256], tr("KEYWORDS_PENDING")
+        case ArticleFetchError() | SchedulerOverloadedError():
+            return url[:256], tr(article.code)
+        case Exception():
+            return url[:256], tr("ERROR")
+        case (title, result):
+            keywords = ", ".join(keyword.text for keyword in result.keywords)
+            return (title or url)[:256], f"{url}\n{keywords or tr('NOTHING')}"[:1024]
+
+
+def display_keywords_of_articles(
+    language: str,
+    urls: list[str],
+    articles: dict[int, tuple[str, ExtractedKeywords] | Exception],
+) -> Embed:
+    """Displays keywords of articles extracted so far, articles are indexed
+    by positions of their URLs, failed ones are displayed with their errors"""
+    tr = Translator(language)
+    embed = Embed(
+        title=tr("KEYWORDS_EMBED_TITLE"),
+        description=tr("KEYWORDS_ARTICLES_EMBED_DESCRIPTION").format(
+            done=len(articles), total=len(urls)
+        ),
+    )
+    for index, url in enumerate(urls):
+        name, value = _display_article_keywords(tr, url, articles.get(index))
+        embed.add_field(name=name, value=value, inline=False)
+    return embed
+
+
 def _display_morpheme(tr: Translator, morpheme: AnalyzedMorpheme) -> str:
     if morpheme.read:
         return f"**{morpheme.form}** ({morpheme.read}) — {tr(morpheme.pos.value)}"
@@ -8,3 +8,19 @@ class NoCachedMessageException(Exception):
     """Can't retrieve the cached message"""
 
     code = "NO_CACHED_MESSAGE_EXCEPTION"
+
+
+class NoURLException(Exception):
+    """No URL was provided into command that needs it"""
+
+    code = "NO_URL_EXCEPTION"
+
+
+class TooManyURLsException(Exception):
+    """More URLs were provided into command than it accepts"""
+
+    code = "TOO_MANY_URLS_EXCEPTION"
+
+    def __init__(self, max_urls: int) -> None:
+        super().__init__(f"At most {max_urls} URLs are accepted")
+        self.max_urls = max_urls
@@ -0,0 +1,12 @@
+from .columnar import ColumnarExporter, ColumnarReader, NULL_CODE
+from .vocabulary import (
+    TokenTable,
+    ScriptRatios,
+    VocabularyReport,
+    count_forms,
+    count_readings,
+    get_pos_distribution,
+    get_script_ratios,
+    get_script_ratios_per_group,
+    build_vocabulary_report,
+)
@@ -0,0 +1,281 @@
+"""Columnar on-disk storage of Goolabs results for analytics.
+
+A dataset is a directory with a table subdirectory per result kind. Rows are
+buffered and written as row groups with a .npy file per column, so readers
+can memory-map columns and aggregate them with vectorized NumPy operations.
+String columns are dictionary-encoded: they store int32 codes of values kept
+in a dictionary file of the column, None is stored as NULL_CODE.
+"""
+
+import json
+import os
+from array import array
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from services.goolabs import (
+    AnalyzedMorphology,
+    BatchItemResult,
+    ExtractedKeywords,
+    ExtractedNamedEntities,
+)
+
+NULL_CODE = -1
+DICTIONARY = "dictionary"
+# Array typecodes of plain columns, dictionary-encoded columns hold "i" codes
+TABLE_SCHEMAS = {
+    "records": {"record_id": "q", "group": DICTIONARY},
+    "morphemes": {
+        "record_id": "q",
+        "sentence": "i",
+        "form": DICTIONARY,
+        "pos": DICTIONARY,
+        "read": DICTIONARY,
+    },
+    "entities": {"record_id": "q", "text": DICTIONARY, "entity_type": DICTIONARY},
+    "keywords": {"record_id": "q", "text": DICTIONARY, "score": "d"},
+}
+_MANIFEST_FILE_NAME = "manifest.json"
+_EXPORTED_RESULT_TYPES = (AnalyzedMorphology, ExtractedNamedEntities, ExtractedKeywords)
+
+
+def _get_typecode(table: str, column: str) -> str:
+    typecode = TABLE_SCHEMAS[table][column]
+    return "i" if typecode == DICTIONARY else typecode
+
+
+def _get_dictionary_path(path: str, table: str, column: str) -> str:
+    return os.path.join(path, table, f"{column}.dictionary.json")
+
+
+def _get_row_group_path(path: str, table: str, row_group: int, column: str) -> str:
+    return os.path.join(path, table, f"{row_group:06d}.{column}.npy")
+
+
+def _write_json_atomically(path: str, value: Any) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(value, file, ensure_ascii=False)
+    os.replace(temporary_path, path)
+
+
+class ColumnarExporter:
+    """
+    Appends morphology, named entities and keywords results to a columnar dataset,
+    an existing dataset is continued. Every written result is a record
+    with an optional group, e.g. a guild or a channel, its rows reference
+    the record by record_id.
+
+    Args:
+        path (str): the directory of the dataset
+        row_group_size (int): the number of buffered rows of a table
+            written as one row group
+    """
+
+    def __init__(self, path: str, row_group_size: int = 65536) -> None:
+        self.path = path
+        self.row_group_size = row_group_size
+        manifest_path = os.path.join(path, _MANIFEST_FILE_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        else:
+            manifest = {"next_record_id": 0, "tables": {}}
+        self.next_record_id = manifest["next_record_id"]
+        self._row_groups = {
+            table: manifest["tables"].get(table, {"row_groups": []})["row_groups"]
+            for table in TABLE_SCHEMAS
+        }
+        self._buffers = {table: self._create_buffer(table) for table in TABLE_SCHEMAS}
+        self._dictionaries = {}
+        for table, schema in TABLE_SCHEMAS.items():
+            os.makedirs(os.path.join(path, table), exist_ok=True)
+            for column, typecode in schema.items():
+                if typecode == DICTIONARY:
+                    self._dictionaries[table, column] = self._load_dictionary(
+                        table, column
+                    )
+
+    def write(self, result: Any, group: str = None) -> int:
+        """Writes the result as a new record, returns its record_id"""
+        if not isinstance(result, _EXPORTED_RESULT_TYPES):
+            raise TypeError(f"{result=} cannot be exported")
+        record_id = self.next_record_id
+        self.next_record_id += 1
+        self._append("records", record_id=record_id, group=group)
+        match result:
+            case AnalyzedMorphology(word_list=word_list):
+                for sentence_index, sentence in enumerate(word_list):
+                    for morpheme in sentence:
+                        self._append(
+                            "morphemes",
+                            record_id=record_id,
+                            sentence=sentence_index,
+                            form=morpheme.form,
+                            pos=morpheme.pos and morpheme.pos.value,
+                            read=morpheme.read,
+                        )
+            case ExtractedNamedEntities(entities=entities):
+                for entity in entities:
+                    self._append(
+                        "entities",
+                        record_id=record_id,
+                        text=entity.text,
+                        entity_type=entity.entity_type.value,
+                    )
+            case ExtractedKeywords(keywords=keywords):
+                for keyword in keywords:
+                    self._append(
+                        "keywords",
+                        record_id=record_id,
+                        text=keyword.text,
+                        score=keyword.score,
+                    )
+        return record_id
+
+    def write_batch_results(
+        self, results: Iterable[BatchItemResult], group: str = None
+    ) -> int:
+        """Writes results of the *_many service methods skipping failed items,
+        returns the number of written results"""
+        written = 0
+        for result in results:
+            if result.error is None:
+                self.write(result.result, group)
+                written += 1
+        return written
+
+    def flush(self) -> None:
+        for table in TABLE_SCHEMAS:
+            self._flush_table(table)
+        for (table, column), (values, _) in self._dictionaries.items():
+            _write_json_atomically(
+                _get_dictionary_path(self.path, table, column), values
+            )
+        # The manifest is written last, so it never references missing files
+        _write_json_atomically(
+            os.path.join(self.path, _MANIFEST_FILE_NAME),
+            {
+                "next_record_id": self.next_record_id,
+                "tables": {
+                    table: {"row_groups": row_groups}
+                    for table, row_groups in self._row_groups.items()
+                },
+            },
+        )
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ColumnarExporter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _create_buffer(table: str) -> dict[str, array]:
+        return {
+            column: array(_get_typecode(table, column))
+            for column in TABLE_SCHEMAS[table]
+        }
+
+    def _load_dictionary(
+        self, table: str, column: str
+    ) -> tuple[list[str], dict[str, int]]:
+        path = _get_dictionary_path(self.path, table, column)
+        values = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                values = json.load(file)
+        return values, {value: code for code, value in enumerate(values)}
+
+    def _encode(self, table: str, column: str, value: str | None) -> int:
+        if value is None:
+            return NULL_CODE
+        values, codes = self._dictionaries[table, column]
+        if (code := codes.get(value)) is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def _append(self, table: str, **row: Any) -> None:
+        buffer = self._buffers[table]
+        for column, value in row.items():
+            if TABLE_SCHEMAS[table][column] == DICTIONARY:
+                value = self._encode(table, column, value)
+            buffer[column].append(value)
+        if len(buffer["record_id"]) >= self.row_group_size:
+            self._flush_table(table)
+
+    def _flush_table(self, table: str) -> None:
+        buffer = self._buffers[table]
+        if not (row_count := len(buffer["record_id"])):
+            return
+        row_group = len(self._row_groups[table])
+        for column, values in buffer.items():
+            np.save(
+                _get_row_group_path(self.path, table, row_group, column),
+                np.asarray(values),
+            )
+        self._row_groups[table].append(row_count)
+        self._buffers[table] = self._create_buffer(table)
+
+
+class ColumnarReader:
+    """
+    Reads columns of a dataset written by ColumnarExporter as memory-mapped
+    NumPy arrays.
+
+    Args:
+        path (str): the directory of the dataset
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, _MANIFEST_FILE_NAME), encoding="utf-8") as file:
+            manifest = json.load(file)
+        self._row_groups = {
+            table: manifest["tables"].get(table, {"row_groups": []})["row_groups"]
+            for table in TABLE_SCHEMAS
+        }
+
+    def get_row_count(self, table: str) -> int:
+        return sum(self._row_groups[table])
+
+    def iter_row_groups(
+        self, table: str, columns: Iterable[str] = None
+    ) -> Iterator[dict[str, np.ndarray]]:
+        columns = list(columns or TABLE_SCHEMAS[table])
+        for row_group in range(len(self._row_groups[table])):
+            yield {
+                column: np.load(
+                    _get_row_group_path(self.path, table, row_group, column),
+                    mmap_mode="r",
+                )
+                for column in columns
+            }
+
+    def read_column(self, table: str, column: str) -> np.ndarray:
+        arrays = [
+            row_group[column] for row_group in self.iter_row_groups(table, [column])
+        ]
+        if not arrays:
+            return np.empty(0, np.dtype(_get_typecode(table, column)))
+        return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+    def read_dictionary(self, table: str, column: str) -> np.ndarray:
+        """Returns the values of the dictionary-encoded column with None appended,
+        so indexing it with codes maps NULL_CODE to None"""
+        path = _get_dictionary_path(self.path, table, column)
+        values = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                values = json.load(file)
+        dictionary = np.empty(len(values) + 1, dtype=object)
+        dictionary[: len(values)] = values
+        return dictionary
+
+    def decode_column(self, table: str, column: str) -> np.ndarray:
+        return self.read_dictionary(table, column)[self.read_column(table, column)]
@@ -0,0 +1,220 @@
+"""Vocabulary statistics over morphemes encoded as integer token IDs.
+
+Forms, readings, POS and groups of morphemes are interned once into int32
+codes, so every statistic is a vectorized NumPy operation over the code
+arrays, characters are classified once per distinct form.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from services.goolabs import AnalyzedMorphology
+from .columnar import ColumnarReader, NULL_CODE
+
+_KANJI_PATTERN = re.compile(r"[々〇㐀-䶿一-鿿豈-﫿]")
+_KANA_PATTERN = re.compile(r"[ぁ-ゟァ-ヿㇰ-ㇿｦ-ﾝ]")
+
+
+class _Interner:
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+
+    def __call__(self, value: str | None) -> int:
+        if value is None:
+            return NULL_CODE
+        return self.codes.setdefault(value, len(self.codes))
+
+    def to_dictionary(self) -> np.ndarray:
+        # None is appended, so NULL_CODE indexes it
+        dictionary = np.empty(len(self.codes) + 1, dtype=object)
+        dictionary[: len(self.codes)] = list(self.codes)
+        return dictionary
+
+
+@dataclass
+class ScriptRatios:
+    kanji: float
+    kana: float
+
+
+@dataclass
+class VocabularyReport:
+    morpheme_count: int
+    distinct_form_count: int
+    top_forms: list[tuple[str, int]]
+    top_readings: list[tuple[str, int]]
+    pos_distribution: dict[str, float]
+    script_ratios: ScriptRatios
+
+
+@dataclass
+class TokenTable:
+    """
+    Morphemes as parallel arrays of codes, NULL_CODE marks missing values.
+
+    Args:
+        groups (np.ndarray): the group code of every morpheme, e.g. a guild or a channel
+        forms (np.ndarray): the form code of every morpheme
+        reads (np.ndarray): the reading code of every morpheme
+        pos (np.ndarray): the POS code of every morpheme
+        group_dictionary (np.ndarray): the group of every group code
+        form_dictionary (np.ndarray): the form of every form code
+        read_dictionary (np.ndarray): the reading of every reading code
+        pos_dictionary (np.ndarray): the POS value of every POS code
+    """
+
+    groups: np.ndarray
+    forms: np.ndarray
+    reads: np.ndarray
+    pos: np.ndarray
+    group_dictionary: np.ndarray
+    form_dictionary: np.ndarray
+    read_dictionary: np.ndarray
+    pos_dictionary: np.ndarray
+
+    @classmethod
+    def from_morphologies(
+        cls, morphologies: Iterable[tuple[str | None, AnalyzedMorphology]]
+    ) -> "TokenTable":
+        """Encodes pairs of a group and a morphology result"""
+        interners = [_Interner() for _ in range(4)]
+        group_interner, form_interner, read_interner, pos_interner = interners
+        columns = [[], [], [], []]
+        groups, forms, reads, pos = columns
+        for group, morphology in morphologies:
+            group_code = group_interner(group)
+            for sentence in morphology.word_list:
+                for morpheme in sentence:
+                    groups.append(group_code)
+                    forms.append(form_interner(morpheme.form))
+                    reads.append(read_interner(morpheme.read))
+                    pos.append(pos_interner(morpheme.pos and morpheme.pos.value))
+        return cls(
+            *(np.array(column, dtype=np.int32) for column in columns),
+            *(interner.to_dictionary() for interner in interners),
+        )
+
+    @classmethod
+    def from_columnar(cls, reader: ColumnarReader) -> "TokenTable":
+        """Reads morphemes of a dataset written by ColumnarExporter
+        with groups of their records"""
+        record_groups = np.full(
+            reader.get_row_count("records"), NULL_CODE, dtype=np.int32
+        )
+        record_groups[reader.read_column("records", "record_id")] = reader.read_column(
+            "records", "group"
+        )
+        return cls(
+            record_groups[reader.read_column("morphemes", "record_id")],
+            reader.read_column("morphemes", "form"),
+            reader.read_column("morphemes", "read"),
+            reader.read_column("morphemes", "pos"),
+            reader.read_dictionary("records", "group"),
+            reader.read_dictionary("morphemes", "form"),
+            reader.read_dictionary("morphemes", "read"),
+            reader.read_dictionary("morphemes", "pos"),
+        )
+
+    def get_group_mask(self, group: str | None) -> np.ndarray | slice:
+        """Returns the index of morphemes of the group, all morphemes if group is None"""
+        if group is None:
+            return slice(None)
+        codes = np.flatnonzero(self.group_dictionary[:-1] == group)
+        if not len(codes):
+            return np.zeros(len(self.groups), dtype=bool)
+        return self.groups == codes[0]
+
+
+def _count_codes(
+    codes: np.ndarray, dictionary: np.ndarray, top: int | None
+) -> list[tuple[str, int]]:
+    counts = np.bincount(codes[codes != NULL_CODE], minlength=len(dictionary) - 1)
+    # Stable sorting keeps forms with equal counts in the order they were seen
+    order = np.argsort(-counts, kind="stable")
+    order = order[counts[order] > 0][:top]
+    return list(zip(dictionary[order].tolist(), counts[order].tolist()))
+
+
+def count_forms(
+    tokens: TokenTable, group: str = None, top: int = None
+) -> list[tuple[str, int]]:
+    """Returns forms with their counts, the most frequent first"""
+    return _count_codes(
+        tokens.forms[tokens.get_group_mask(group)], tokens.form_dictionary, top
+    )
+
+
+def count_readings(
+    tokens: TokenTable, group: str = None, top: int = None
+) -> list[tuple[str, int]]:
+    """Returns readings with their counts, the most frequent first"""
+    return _count_codes(
+        tokens.reads[tokens.get_group_mask(group)], tokens.read_dictionary, top
+    )
+
+
+def get_pos_distribution(tokens: TokenTable, group: str = None) -> dict[str, float]:
+    """Returns the share of every POS among morphemes with a known POS"""
+    counts = _count_codes(
+        tokens.pos[tokens.get_group_mask(group)], tokens.pos_dictionary, None
+    )
+    total = sum(count for _, count in counts)
+    return {pos: count / total for pos, count in counts}
+
+
+def _count_script_characters(tokens: TokenTable) -> tuple[np.ndarray, np.ndarray]:
+    # Classifies characters once per distinct form, the last entry is for None
+    forms = tokens.form_dictionary
+    kanji = np.array([len(_KANJI_PATTERN.findall(f or "")) for f in forms])
+    kana = np.array([len(_KANA_PATTERN.findall(f or "")) for f in forms])
+    return kanji, kana
+
+
+def _get_ratios(kanji: float, kana: float, total: float) -> ScriptRatios:
+    if not total:
+        return ScriptRatios(0.0, 0.0)
+    return ScriptRatios(kanji / total, kana / total)
+
+
+def get_script_ratios(tokens: TokenTable, group: str = None) -> ScriptRatios:
+    """Returns the shares of kanji and kana among characters of forms"""
+    kanji, kana = _count_script_characters(tokens)
+    forms = tokens.forms[tokens.get_group_mask(group)]
+    lengths = np.array([len(form or "") for form in tokens.form_dictionary])
+    return _get_ratios(kanji[forms].sum(), kana[forms].sum(), lengths[forms].sum())
+
+
+def get_script_ratios_per_group(tokens: TokenTable) -> dict[str | None, ScriptRatios]:
+    """Returns the shares of kanji and kana among characters of forms of every group"""
+    kanji, kana = _count_script_characters(tokens)
+    lengths = np.array([len(form or "") for form in tokens.form_dictionary])
+    # Shifts codes, so the NULL_CODE group gets the bin 0
+    groups = tokens.groups + 1
+    bin_count = len(tokens.group_dictionary)
+    sums = [
+        np.bincount(groups, weights=values[tokens.forms], minlength=bin_count)
+        for values in (kanji, kana, lengths)
+    ]
+    group_names = [None, *tokens.group_dictionary[:-1].tolist()]
+    return {
+        group_names[code]: _get_ratios(*(values[code] for values in sums))
+        for code in np.unique(groups).tolist()
+    }
+
+
+def build_vocabulary_report(
+    tokens: TokenTable, group: str = None, top: int = 10
+) -> VocabularyReport:
+    mask = tokens.get_group_mask(group)
+    forms = tokens.forms[mask]
+    return VocabularyReport(
+        len(forms),
+        len(np.unique(forms[forms != NULL_CODE])),
+        count_forms(tokens, group, top),
+        count_readings(tokens, group, top),
+        get_pos_distribution(tokens, group),
+        get_script_ratios(tokens, group),
+    )
@@ -1,4 +1,6 @@
 from .goolabs_service import GoolabsService
+from .batch import BatchItemResult
+from .similarity import SimilarityMatrix
 from .goolabs_value_objects import (
     GoolabsDatetime,
     NamedEntityType,
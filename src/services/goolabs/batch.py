@@ -0,0 +1,67 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Generator, Iterable
+
+from utils.rate_limiter import RateLimiter
+
+
+@dataclass
+class BatchItemResult:
+    index: int
+    item: Any
+    result: Any = None
+    error: Exception | None = None
+
+
+def run_batch(
+    function: Callable[[Any], Any],
+    items: Iterable,
+    concurrency: int,
+    rate_limit: float = None,
+    ordered: bool = True,
+) -> Generator[BatchItemResult, None, None]:
+    """Calls the function for every item with at most concurrency calls running
+    and at most rate_limit calls started per second, yields results in the order
+    of items or as they are completed. Items are consumed lazily and at most
+    twice as many items as concurrency are in flight, so memory usage does not
+    depend on the number of items. Exceptions raised for an item are returned
+    as its error instead of stopping the batch."""
+    rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+    max_pending = 2 * concurrency
+
+    def process(index: int, item: Any) -> BatchItemResult:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            return BatchItemResult(index, item, function(item))
+        except Exception as error:
+            return BatchItemResult(index, item, error=error)
+
+    with ThreadPoolExecutor(
+        concurrency, thread_name_prefix="goolabs-batch"
+    ) as executor:
+        pending: deque[Future] | set[Future] = deque() if ordered else set()
+        for index, item in enumerate(items):
+            if len(pending) >= max_pending:
+                yield from _pop_completed(pending)
+            future = executor.submit(process, index, item)
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+        while pending:
+            yield from _pop_completed(pending)
+
+
+def _pop_completed(
+    pending: deque[Future] | set[Future],
+) -> Generator[BatchItemResult, None, None]:
+    # Waits for the first pending item in order or for any pending item
+    if isinstance(pending, deque):
+        yield pending.popleft().result()
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield future.result()
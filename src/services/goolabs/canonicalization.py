@@ -0,0 +1,61 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+
+# Spaces other than the ordinary one are mapped to it, line breaks are kept
+# because they separate sentences for the Goolabs API
+_SPACE_TRANSLATION_TABLE = str.maketrans(
+    {
+        **dict.fromkeys("\t\v\f\u00a0\u1680\u202f\u205f\u3000", " "),
+        **dict.fromkeys(map(chr, range(0x2000, 0x200B)), " "),
+        **dict.fromkeys("\u2028\u2029", "\n"),
+    }
+)
+_TRAILING_WHITESPACE_PATTERN = re.compile(r"[^\S\n]+$", re.MULTILINE)
+# Leftovers of the "!" and "！" command prefixes
+_PREFIX_RESIDUE = "!！"
+
+
+@dataclass(frozen=True)
+class Canonicalizer:
+    """
+    Normalizes text passed to a Goolabs API method, so equivalent texts
+    produce the same cache keys and requests.
+
+    Args:
+        nfkc (bool): whether to apply the NFKC normalization
+        unify_spaces (bool): whether to map full-width and other spaces to " "
+            and unicode line separators to "\\n"
+        strip_trailing_whitespace (bool): whether to strip whitespace
+            at the ends of lines and of the text
+        strip_prefix_residue (bool): whether to strip leading "!" and "！"
+    """
+
+    nfkc: bool = False
+    unify_spaces: bool = True
+    strip_trailing_whitespace: bool = True
+    strip_prefix_residue: bool = True
+
+    def __call__(self, text: str) -> str:
+        if self.nfkc:
+            text = unicodedata.normalize("NFKC", text)
+        if self.unify_spaces:
+            text = text.translate(_SPACE_TRANSLATION_TABLE)
+        if self.strip_trailing_whitespace:
+            text = _TRAILING_WHITESPACE_PATTERN.sub("", text).rstrip()
+        if self.strip_prefix_residue:
+            text = text.lstrip(_PREFIX_RESIDUE)
+        return text
+
+
+# Only transformations that do not change what the API extracts are enabled:
+# hiragana and morph echo their whole input in the output, including spaces
+# and "!", so their texts are sent as they are, and NFKC is used only
+# where the output does not contain the input text
+DEFAULT_CANONICALIZERS = {
+    "chrono": Canonicalizer(),
+    "entity": Canonicalizer(),
+    "keyword": Canonicalizer(),
+    "slot": Canonicalizer(),
+    "textpair": Canonicalizer(nfkc=True),
+}
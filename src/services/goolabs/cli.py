@@ -0,0 +1,195 @@
+"""Command line tool analyzing JSONL files with GoolabsService methods.
+
+Every input line is a JSON string passed as the first argument of the method
+or a JSON object with arguments of the method as keys. Every output line is
+a JSON object with the index and input of the line and the result or the error.
+
+Run from the src directory with ``python -m services.goolabs <method> ...``.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+from itertools import islice
+from typing import Any, Callable, Iterator, TextIO
+
+import config
+from .batch import BatchItemResult, run_batch
+from .goolabs_service import GoolabsService
+from .serialization import to_jsonable
+
+METHOD_NAMES = (
+    "normalize_times",
+    "extract_named_entities",
+    "convert_to_furigana",
+    "extract_keywords",
+    "analyze_morphology",
+    "extract_slot_values",
+    "calculate_similarity",
+)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m services.goolabs",
+        description="Streams JSONL lines through a GoolabsService method.",
+    )
+    parser.add_argument("method", choices=METHOD_NAMES)
+    parser.add_argument(
+        "-i", "--input", default="-", help="input JSONL file, defaults to stdin"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="output JSONL file, defaults to stdout"
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=config.GOOLABS_MAX_CONCURRENT_REQUESTS,
+        help="max number of concurrent requests",
+    )
+    parser.add_argument(
+        "-r", "--rate-limit", type=float, help="max number of requests per second"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="max number of entries in every cache of the service",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="file the progress is saved to, an existing checkpoint is resumed from",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=100,
+        help="number of lines written between checkpoints",
+    )
+    args = parser.parse_args(argv)
+    if args.checkpoint and args.output == "-":
+        parser.error("--checkpoint requires --output to be a file")
+    return args
+
+
+def _read_checkpoint(path: str | None, output_path: str) -> tuple[int, int]:
+    # Returns the number of completed lines and the size of the output file
+    # written for them, starts over if the output the checkpoint was written
+    # for is missing or shorter than it was
+    if path is None or not os.path.exists(path):
+        return 0, 0
+    with open(path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    if (
+        not os.path.exists(output_path)
+        or os.path.getsize(output_path) < checkpoint["output_size"]
+    ):
+        print(
+            f"Output {output_path} does not match checkpoint {path}, starting over",
+            file=sys.stderr,
+        )
+        return 0, 0
+    return checkpoint["completed"], checkpoint["output_size"]
+
+
+def _write_checkpoint(path: str, completed: int, output_size: int) -> None:
+    # Replaces the checkpoint atomically, so a crash cannot corrupt it
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump({"completed": completed, "output_size": output_size}, file)
+    os.replace(temporary_path, path)
+
+
+def _open_output(path: str, output_size: int) -> TextIO:
+    if path == "-":
+        return sys.stdout
+    if not output_size:
+        return open(path, "w", encoding="utf-8")
+    # Drops lines written after the last checkpoint
+    file = open(path, "r+", encoding="utf-8")
+    file.truncate(output_size)
+    file.seek(output_size)
+    return file
+
+
+def _create_line_processor(method: Callable) -> Callable[[tuple[int, str]], Any]:
+    first_parameter = next(iter(inspect.signature(method).parameters))
+
+    def process_line(numbered_line: tuple[int, str]) -> Any:
+        _, line = numbered_line
+        match json.loads(line):
+            case str() as value:
+                return method(**{first_parameter: value})
+            case dict() as kwargs:
+                return method(**kwargs)
+            case value:
+                raise ValueError(f"Line {value=} is neither a string nor an object")
+
+    return process_line
+
+
+def _format_result(result: BatchItemResult) -> str:
+    line_number, line_input = result.item
+    try:
+        line_input = json.loads(line_input)
+    except ValueError:
+        line_input = line_input.rstrip("\n")
+    line = {"index": line_number, "input": line_input}
+    if result.error is None:
+        line["result"] = to_jsonable(result.result)
+    else:
+        line["error"] = {
+            "type": type(result.error).__name__,
+            "message": str(result.error),
+        }
+    return json.dumps(line, ensure_ascii=False) + "\n"
+
+
+def _read_numbered_lines(file: TextIO, start: int) -> Iterator[tuple[int, str]]:
+    # Skips lines completed before the checkpoint and blank lines,
+    # numbers lines in the whole file, so they can be checkpointed
+    return (
+        (line_number, line)
+        for line_number, line in enumerate(islice(file, start, None), start)
+        if line.strip()
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    service = GoolabsService(
+        chrono_cache_size=args.cache_size,
+        morph_sentence_cache_size=args.cache_size,
+        similarity_cache_size=args.cache_size,
+        keyword_cache_size=args.cache_size,
+        max_concurrent_requests=args.concurrency,
+    )
+    start, output_size = _read_checkpoint(args.checkpoint, args.output)
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_file = _open_output(args.output, output_size)
+    try:
+        results = run_batch(
+            _create_line_processor(getattr(service, args.method)),
+            _read_numbered_lines(input_file, start),
+            args.concurrency,
+            args.rate_limit,
+        )
+        completed = start
+        for written, result in enumerate(results, 1):
+            output_file.write(_format_result(result))
+            completed = result.item[0] + 1
+            if args.checkpoint and written % args.checkpoint_every == 0:
+                output_file.flush()
+                _write_checkpoint(args.checkpoint, completed, output_file.tell())
+        output_file.flush()
+        if args.checkpoint:
+            _write_checkpoint(args.checkpoint, completed, output_file.tell())
+    finally:
+        service.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
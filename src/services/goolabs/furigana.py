@@ -0,0 +1,85 @@
+from typing import Iterable
+
+from .goolabs_value_types import KanaType, PartOfSpeechType
+
+_KATAKANA_TO_HIRAGANA_TABLE = str.maketrans(
+    {chr(code): chr(code - 0x60) for code in range(ord("ァ"), ord("ゖ") + 0x60 + 1)}
+)
+_HIRAGANA_TO_KATAKANA_TABLE = str.maketrans(
+    {chr(code): chr(code + 0x60) for code in range(ord("ぁ"), ord("ゖ") + 1)}
+)
+# Morphemes of these parts of speech start a new phrase unless they follow
+# a prefix or continue a compound, the Goolabs API separates phrases with spaces
+_PHRASE_HEAD_POS = {
+    pos.value
+    for pos in (
+        PartOfSpeechType.NOUN,
+        PartOfSpeechType.VERB_STEM,
+        PartOfSpeechType.ADJECTIVE_STEM,
+        PartOfSpeechType.ADNOMINAL_ADJECTIVE,
+        PartOfSpeechType.ADVERB,
+        PartOfSpeechType.CONJUNCTION,
+        PartOfSpeechType.INDEPENDENT_WORD,
+        PartOfSpeechType.INTERJECTION,
+        PartOfSpeechType.NUMBER,
+        PartOfSpeechType.ALPHABET,
+        PartOfSpeechType.KATAKANA,
+        PartOfSpeechType.KANJI,
+        PartOfSpeechType.ROMAN,
+    )
+}
+_PREFIX_POS = {
+    pos.value
+    for pos in (
+        PartOfSpeechType.NOUN_PREFIX,
+        PartOfSpeechType.VERB_PREFIX,
+        PartOfSpeechType.ADJECTIVE_PREFIX,
+        PartOfSpeechType.ORDINAL_NUMBER_PREFIX,
+    )
+}
+_COMPOUND_POS = {
+    pos.value
+    for pos in (
+        PartOfSpeechType.NOUN,
+        PartOfSpeechType.NUMBER,
+        PartOfSpeechType.ALPHABET,
+        PartOfSpeechType.KATAKANA,
+        PartOfSpeechType.KANJI,
+        PartOfSpeechType.ROMAN,
+    )
+}
+_COMPOUND_CONTINUATION_POS = _COMPOUND_POS | {PartOfSpeechType.VERB_STEM.value}
+# Marks readings that are already converted phrases, e.g. parts of a text
+# converted by the Goolabs API, so they are separated from neighbours
+PHRASE = "phrase"
+
+
+def to_kana(text: str, kana_type: KanaType) -> str:
+    if kana_type is KanaType.HIRAGANA:
+        return text.translate(_KATAKANA_TO_HIRAGANA_TABLE)
+    return text.translate(_HIRAGANA_TO_KATAKANA_TABLE)
+
+
+def _starts_phrase(pos: str | None, previous_pos: str | None) -> bool:
+    if pos == PHRASE:
+        return True
+    if pos not in _PHRASE_HEAD_POS or previous_pos in _PREFIX_POS:
+        return False
+    if previous_pos == PHRASE:
+        return True
+    return not (previous_pos in _COMPOUND_POS and pos in _COMPOUND_CONTINUATION_POS)
+
+
+def join_readings(
+    readings: Iterable[tuple[str, str | None]], kana_type: KanaType
+) -> str:
+    """Joins pairs of a reading and a POS value of morphemes into furigana,
+    approximating phrase boundaries of the Goolabs API by parts of speech"""
+    parts = []
+    previous_pos = None
+    for reading, pos in readings:
+        if parts and _starts_phrase(pos, previous_pos):
+            parts.append(" ")
+        parts.append(reading)
+        previous_pos = pos
+    return to_kana("".join(parts), kana_type)
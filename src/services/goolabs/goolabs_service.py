@@ -1,9 +1,33 @@
-from datetime import datetime, date
-from typing import Iterable, Literal, Type
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta, timezone
+from hashlib import blake2b
+from time import time
+from typing import Callable, Generator, Iterable, Literal, Type
 
 import config
 from goolabs import GoolabsAPI
-from services.exceptions import UnexpectedGoolabsAPIResponseError
+from services.exceptions import (
+    UnexpectedGoolabsAPIResponseError,
+    InvalidArgsForGoolabsRequestError,
+)
+from utils.cache import LRUCache
+from .canonicalization import DEFAULT_CANONICALIZERS
+from .batch import BatchItemResult, run_batch
+from .furigana import PHRASE, join_readings
+from .near_duplicates import MinHashLSHIndex
+from .prefilters import GoolabsPrefilter
+from .reading_dictionary import ReadingDictionary
+from .similarity import (
+    SimilarityMatrix,
+    get_character_ngrams,
+    calculate_ngram_similarity,
+    get_pair_key,
+)
+from .sentences import (
+    split_sentences,
+    group_segments_into_chunks,
+    assign_analyzed_sentences_to_segments,
+)
 from .goolabs_value_objects import (
     NamedEntityType,
     KanaType,
@@ -35,6 +59,7 @@ from .utils import (
     response_processing_method,
     goolabs_methods_class,
     convert_the_datetime_value_to_goolabs_format,
+    quantize_datetime,
     convert_num_value_to_int_in_range,
     check_if_the_value_is_in_type_enum,
     convert_the_type_enum_value_to_string,
@@ -44,6 +69,17 @@ from .utils import (
 )
 
 
+# The Goolabs API uses the current Japan time when doc_time is omitted
+_GOOLABS_TIMEZONE = timezone(timedelta(hours=9), "JST")
+# A cached score of a near-duplicate pair is reused only if it is this close
+# to 0 or 1. It is a heuristic, the API may score the texts differently
+_NEAR_DUPLICATE_THRESHOLD = 0.9
+_EXTREME_SIMILARITY_MARGIN = 0.05
+# Article bodies are encoded for hashing in chunks of this many characters,
+# so a whole encoded copy of a body is never made
+_KEYWORD_HASH_CHUNK_SIZE = 64 * 1024
+
+
 def _create_goolabs_datetime(date_string: str) -> GoolabsDatetime:
     try:
         return GoolabsDatetime.from_goolabs_format(date_string)
@@ -191,6 +227,37 @@ def _create_analyzed_morphology_from_response(response: dict) -> AnalyzedMorphol
     return AnalyzedMorphology(word_list, info_filter, pos_filter)
 
 
+def _filter_analyzed_morphology(
+    word_list: list[AnalyzedSentence],
+    info_filter: str | None,
+    pos_filter: str | None,
+) -> AnalyzedMorphology:
+    # Applies filters to morphemes analyzed with all info and all parts of speech
+    # the same way the Goolabs API does it
+    info_filter = get_type_enum_list_from_response_filters_string(
+        MorphemeInfoType, info_filter or None
+    )
+    pos_filter = get_type_enum_list_from_response_filters_string(
+        PartOfSpeechType, pos_filter or None
+    )
+    with_form = MorphemeInfoType.FORM in info_filter
+    with_pos = MorphemeInfoType.PART_OF_SPEECH in info_filter
+    with_read = MorphemeInfoType.READ in info_filter
+    word_list = [
+        [
+            AnalyzedMorpheme(
+                morpheme.form if with_form else None,
+                morpheme.pos if with_pos else None,
+                morpheme.read if with_read else None,
+            )
+            for morpheme in sentence
+            if morpheme.pos in pos_filter
+        ]
+        for sentence in word_list
+    ]
+    return AnalyzedMorphology(word_list, info_filter, pos_filter)
+
+
 def _create_name_slot(name_entity: dict[str, str]) -> NameSlot:
     match name_entity:
         case {
@@ -320,6 +387,19 @@ def _create_calculated_similarity_from_response(response: dict) -> CalculatedSim
     return CalculatedSimilarity(score)
 
 
+def _get_keyword_cache_key(
+    title: str, body: str, max_num: int | None, focus: str | None
+) -> bytes:
+    # Every field is prefixed with its length, so different splits
+    # of the same characters between fields produce different keys
+    key_hash = blake2b(digest_size=16)
+    for field in (title, body, str(max_num), str(focus)):
+        key_hash.update(len(field).to_bytes(8, "little"))
+        for start in range(0, len(field), _KEYWORD_HASH_CHUNK_SIZE):
+            key_hash.update(field[start : start + _KEYWORD_HASH_CHUNK_SIZE].encode())
+    return key_hash.digest()
+
+
 @goolabs_methods_class
 class GoolabsService:
     """The class used to call Goolabs API methods with args validation
@@ -334,15 +414,329 @@ class GoolabsService:
         methods should return a dict of a corresponding method response,
         defaults to GoolabsAPI class
     :type api_class: Type[GoolabsAPI], optional
+    :param chrono_cache_granularity: The granularity the omitted doc_time of normalize_times
+        is quantized to, enables caching of normalize_times results if set,
+        defaults to value of GOOLABS_CHRONO_CACHE_GRANULARITY variable set in config
+    :type chrono_cache_granularity: timedelta, optional
+    :param chrono_cache_size: The max number of cached normalize_times results,
+        defaults to value of GOOLABS_CHRONO_CACHE_SIZE variable set in config
+    :type chrono_cache_size: int, optional
+    :param enable_prefilters: Whether to return empty results of normalize_times,
+        extract_named_entities and extract_slot_values without making requests
+        for sentences that cannot contain anything to extract,
+        defaults to value of GOOLABS_ENABLE_PREFILTERS variable set in config
+    :type enable_prefilters: bool, optional
+    :param canonicalizers: The functions used to normalize texts passed to Goolabs API methods
+        before requests are made and cache keys are computed, with names of the methods as keys,
+        texts passed to methods that are not in the dict are used as they are,
+        defaults to DEFAULT_CANONICALIZERS if GOOLABS_CANONICALIZE_TEXT variable set in config
+        is true or to an empty dict otherwise
+    :type canonicalizers: dict[str, Callable[[str], str]], optional
+    :param morph_sentence_cache_size: The max number of sentences with cached morphology,
+        enables analyze_morphology to request only sentences missing in the cache
+        and convert_to_furigana to use readings of texts with all sentences cached if set,
+        defaults to value of GOOLABS_MORPH_SENTENCE_CACHE_SIZE variable set in config
+    :type morph_sentence_cache_size: int, optional
+    :param morph_max_chunk_size: The max length of text analyze_morphology sends in one request,
+        longer texts are split into chunks on sentence boundaries analyzed concurrently,
+        defaults to value of GOOLABS_MORPH_MAX_CHUNK_SIZE variable set in config
+    :type morph_max_chunk_size: int, optional
+    :param max_concurrent_requests: The max number of concurrent chunk and similarity requests
+        made by all method calls together, the threads making them are shared by the service,
+        defaults to value of GOOLABS_MAX_CONCURRENT_REQUESTS variable set in config
+    :type max_concurrent_requests: int, optional
+    :param similarity_cache_size: The max number of cached scores of text pairs
+        shared by calculate_similarity and calculate_similarity_matrix,
+        defaults to value of GOOLABS_SIMILARITY_CACHE_SIZE variable set in config
+    :type similarity_cache_size: int, optional
+    :param approximate_similarity_index_size: The max number of analyzed texts kept
+        in the MinHash index, enables calculate_similarity and calculate_similarity_matrix
+        to reuse extreme cached scores of near-duplicate texts instead of making requests if set,
+        the reused score only approximates the score of the pair, the API may score
+        a near-duplicate differently, identical texts are never requested regardless,
+        defaults to value of GOOLABS_APPROXIMATE_SIMILARITY_INDEX_SIZE variable set in config
+    :type approximate_similarity_index_size: int, optional
+    :param reading_dictionary_path: The directory of the dictionary of readings learned
+        from analyze_morphology results, enables convert_to_furigana to convert texts
+        with known forms locally and to request only the unknown part of other texts if set,
+        defaults to value of GOOLABS_READING_DICTIONARY_PATH variable set in config
+    :type reading_dictionary_path: str, optional
+    :param reading_dictionary_save_every: The number of new observations after which
+        the reading dictionary is saved in a background thread,
+        defaults to value of GOOLABS_READING_DICTIONARY_SAVE_EVERY variable set in config
+    :type reading_dictionary_save_every: int, optional
+    :param local_furigana_min_confidence: The min share of observations of the most frequent
+        reading of a form required to use the reading for local conversion to furigana,
+        defaults to value of GOOLABS_LOCAL_FURIGANA_MIN_CONFIDENCE variable set in config
+    :type local_furigana_min_confidence: float, optional
+    :param keyword_cache_size: The max number of cached extract_keywords results
+        keyed by a hash of the article text and params, so identical articles
+        from different URLs are requested once,
+        defaults to value of GOOLABS_KEYWORD_CACHE_SIZE variable set in config
+    :type keyword_cache_size: int, optional
     """
 
     def __init__(
         self,
         app_id: str = config.GOOLABS_APP_ID,
         api_class: Type[GoolabsAPI] = GoolabsAPI,
+        chrono_cache_granularity: timedelta = config.GOOLABS_CHRONO_CACHE_GRANULARITY,
+        chrono_cache_size: int = config.GOOLABS_CHRONO_CACHE_SIZE,
+        enable_prefilters: bool = config.GOOLABS_ENABLE_PREFILTERS,
+        canonicalizers: dict[str, Callable[[str], str]] = (
+            DEFAULT_CANONICALIZERS if config.GOOLABS_CANONICALIZE_TEXT else {}
+        ),
+        morph_sentence_cache_size: int = config.GOOLABS_MORPH_SENTENCE_CACHE_SIZE,
+        morph_max_chunk_size: int = config.GOOLABS_MORPH_MAX_CHUNK_SIZE,
+        max_concurrent_requests: int = config.GOOLABS_MAX_CONCURRENT_REQUESTS,
+        similarity_cache_size: int = config.GOOLABS_SIMILARITY_CACHE_SIZE,
+        approximate_similarity_index_size: int = config.GOOLABS_APPROXIMATE_SIMILARITY_INDEX_SIZE,
+        reading_dictionary_path: str = config.GOOLABS_READING_DICTIONARY_PATH,
+        reading_dictionary_save_every: int = config.GOOLABS_READING_DICTIONARY_SAVE_EVERY,
+        local_furigana_min_confidence: float = config.GOOLABS_LOCAL_FURIGANA_MIN_CONFIDENCE,
+        keyword_cache_size: int = config.GOOLABS_KEYWORD_CACHE_SIZE,
     ) -> None:
         """Constructor method"""
         self.api = api_class(app_id)
+        self.chrono_cache_granularity = chrono_cache_granularity
+        self.chrono_cache = (
+            LRUCache(chrono_cache_size) if chrono_cache_granularity else None
+        )
+        self.prefilter = GoolabsPrefilter() if enable_prefilters else None
+        self.canonicalizers = canonicalizers
+        self.morph_sentence_cache = (
+            LRUCache(morph_sentence_cache_size) if morph_sentence_cache_size else None
+        )
+        self.morph_max_chunk_size = morph_max_chunk_size
+        self._executor = ThreadPoolExecutor(
+            max_concurrent_requests, thread_name_prefix="goolabs"
+        )
+        self.similarity_cache = LRUCache(similarity_cache_size)
+        self.approximate_similarity_index = (
+            MinHashLSHIndex(approximate_similarity_index_size)
+            if approximate_similarity_index_size
+            else None
+        )
+        self.reading_dictionary = (
+            ReadingDictionary(reading_dictionary_path, reading_dictionary_save_every)
+            if reading_dictionary_path
+            else None
+        )
+        self.local_furigana_min_confidence = local_furigana_min_confidence
+        self.keyword_cache = LRUCache(keyword_cache_size)
+
+    def close(self) -> None:
+        """Saves the reading dictionary and stops threads of concurrent requests"""
+        if self.reading_dictionary is not None:
+            self.reading_dictionary.close()
+        self._executor.shutdown(wait=False)
+
+    def _prepare_text(self, api_name: str, parameter_name: str, text: str) -> str:
+        # Canonicalizes a text passed to any API method and indexes it
+        # as an analyzed text
+        if (canonicalizer := self.canonicalizers.get(api_name)) is not None:
+            if not (canonical_text := canonicalizer(text)):
+                raise InvalidArgsForGoolabsRequestError(
+                    f"Parameter '{parameter_name}' with {text=} is empty after canonicalization"
+                )
+            text = canonical_text
+        if self.approximate_similarity_index is not None:
+            self.approximate_similarity_index.insert(text)
+        return text
+
+    def _can_skip_request(self, api_name: str, sentence: str) -> bool:
+        return self.prefilter is not None and self.prefilter.can_skip(
+            api_name, sentence
+        )
+
+    def _get_current_doc_time(self) -> str:
+        now = datetime.now(_GOOLABS_TIMEZONE).replace(tzinfo=None, microsecond=0)
+        if self.chrono_cache_granularity:
+            now = quantize_datetime(now, self.chrono_cache_granularity)
+        return now.isoformat()
+
+    def _get_current_doc_time_bucket(self) -> tuple[str, float]:
+        now = datetime.now(_GOOLABS_TIMEZONE).replace(tzinfo=None)
+        bucket_start = quantize_datetime(now, self.chrono_cache_granularity)
+        bucket_end = bucket_start + self.chrono_cache_granularity
+        return bucket_start.isoformat(), time() + (bucket_end - now).total_seconds()
+
+    def _request_normalized_times(
+        self, sentence: str, doc_time: str | None
+    ) -> NormalizedTimes:
+        return _create_normalized_times_from_response(
+            self.api.chrono(sentence=sentence, doc_time=doc_time)
+        )
+
+    def _request_analyzed_morphology(
+        self, sentence: str, info_filter: str = None, pos_filter: str = None
+    ) -> AnalyzedMorphology:
+        morphology = _create_analyzed_morphology_from_response(
+            self.api.morph(
+                sentence=sentence, info_filter=info_filter, pos_filter=pos_filter
+            ),
+            [
+                ("info_filter", str) if info_filter else None,
+                ("pos_filter", str) if pos_filter else None,
+            ],
+        )
+        if self.reading_dictionary is not None:
+            self.reading_dictionary.observe_sentences(morphology.word_list)
+        return morphology
+
+    def _request_converted_to_furigana(
+        self, sentence: str, output_type: str
+    ) -> ConvertedToFurigana:
+        return _create_converted_to_furigana_from_response(
+            self.api.hiragana(sentence=sentence, output_type=output_type)
+        )
+
+    def _get_furigana_from_sentence_cache(
+        self, sentence: str, output_type: str
+    ) -> ConvertedToFurigana | None:
+        # Readings of cached unfiltered morphology are the furigana of sentences,
+        # returns None if any sentence of the text is not cached
+        readings = []
+        for segment in split_sentences(sentence):
+            if (cached := self.morph_sentence_cache.get(segment)) is None:
+                return None
+            readings.extend(
+                (morpheme.read or morpheme.form, morpheme.pos and morpheme.pos.value)
+                for analyzed_sentence in cached
+                for morpheme in analyzed_sentence
+            )
+        kana_type = KanaType(output_type)
+        return ConvertedToFurigana(join_readings(readings, kana_type), kana_type)
+
+    def _convert_to_furigana_locally(
+        self, sentence: str, output_type: str
+    ) -> ConvertedToFurigana:
+        # Known forms are read from the reading dictionary, a single unknown span
+        # is converted by the API, the whole sentence is converted by the API
+        # if nothing is known or there are several spans, so no more than
+        # one request is made
+        parts = []
+        for token in self.reading_dictionary.segment(
+            sentence, self.local_furigana_min_confidence
+        ):
+            if token.reading is not None:
+                parts.append((token.reading, token.pos))
+            elif parts and isinstance(parts[-1], str):
+                parts[-1] += token.text
+            else:
+                parts.append(token.text)
+        unknown_spans = [part for part in parts if isinstance(part, str)]
+        if len(unknown_spans) > 1 or len(unknown_spans) == len(parts):
+            return self._request_converted_to_furigana(sentence, output_type)
+        kana_type = KanaType(output_type)
+        readings = [
+            (
+                (self._request_converted_to_furigana(part, output_type).text, PHRASE)
+                if isinstance(part, str)
+                else part
+            )
+            for part in parts
+        ]
+        return ConvertedToFurigana(join_readings(readings, kana_type), kana_type)
+
+    def _request_analyzed_morphology_in_chunks(
+        self, segments: list[str], info_filter: str = None, pos_filter: str = None
+    ) -> list[tuple[list[str], AnalyzedMorphology]]:
+        # Analyzes chunks of segments concurrently, returns chunks with their results
+        chunks = group_segments_into_chunks(segments, self.morph_max_chunk_size)
+
+        def request_chunk(chunk: list[str]) -> AnalyzedMorphology:
+            return self._request_analyzed_morphology(
+                "".join(chunk), info_filter, pos_filter
+            )
+
+        if len(chunks) > 1:
+            results = self._executor.map(request_chunk, chunks)
+        else:
+            results = map(request_chunk, chunks)
+        return list(zip(chunks, results))
+
+    def _request_chunked_analyzed_morphology(
+        self, sentence: str, info_filter: str = None, pos_filter: str = None
+    ) -> AnalyzedMorphology:
+        if not self.morph_max_chunk_size or len(sentence) <= self.morph_max_chunk_size:
+            return self._request_analyzed_morphology(sentence, info_filter, pos_filter)
+        results = [
+            morphology
+            for _, morphology in self._request_analyzed_morphology_in_chunks(
+                split_sentences(sentence), info_filter, pos_filter
+            )
+        ]
+        return AnalyzedMorphology(
+            [
+                analyzed_sentence
+                for morphology in results
+                for analyzed_sentence in morphology.word_list
+            ],
+            results[0].info_filter,
+            results[0].pos_filter,
+        )
+
+    def _get_approximate_similarity_score(
+        self, text1: str, text2: str
+    ) -> float | None:
+        # Looks for an extreme cached score of a near-duplicate of either text
+        # paired with the other text, the score approximates the one of the pair
+        index = self.approximate_similarity_index
+        for text, other_text in ((text1, text2), (text2, text1)):
+            for near_duplicate, _ in index.find_near_duplicates(
+                text, _NEAR_DUPLICATE_THRESHOLD
+            ):
+                score = self.similarity_cache.get(
+                    get_pair_key(near_duplicate, other_text)
+                )
+                if score is not None and (
+                    score <= _EXTREME_SIMILARITY_MARGIN
+                    or score >= 1 - _EXTREME_SIMILARITY_MARGIN
+                ):
+                    return score
+        return None
+
+    def _request_similarity_score(self, text1: str, text2: str) -> float:
+        if text1 == text2:
+            return 1.0
+        key = get_pair_key(text1, text2)
+        if (score := self.similarity_cache.get(key)) is not None:
+            return score
+        if self.approximate_similarity_index is not None:
+            score = self._get_approximate_similarity_score(text1, text2)
+        if score is None:
+            score = _create_calculated_similarity_from_response(
+                self.api.textpair(text1=text1, text2=text2)
+            ).score
+            self.similarity_cache.set(key, score)
+        return score
+
+    def _get_word_list_using_sentence_cache(
+        self, sentence: str
+    ) -> list[AnalyzedSentence] | None:
+        # Requests unfiltered morphology only for sentences missing in the cache,
+        # returns None if the response cannot be mapped back to the sentences
+        segments = split_sentences(sentence)
+        analyzed = {}
+        for segment in segments:
+            if (cached := self.morph_sentence_cache.get(segment)) is not None:
+                analyzed[segment] = cached
+        misses = list(dict.fromkeys(s for s in segments if s not in analyzed))
+        for chunk, morphology in self._request_analyzed_morphology_in_chunks(misses):
+            assigned = assign_analyzed_sentences_to_segments(
+                chunk, morphology.word_list
+            )
+            if assigned is None:
+                return None
+            for segment, analyzed_sentences in zip(chunk, assigned):
+                self.morph_sentence_cache.set(segment, analyzed_sentences)
+                analyzed[segment] = analyzed_sentences
+        return [
+            analyzed_sentence
+            for segment in segments
+            for analyzed_sentence in analyzed[segment]
+        ]
 
     def normalize_times(
         self, sentence: str, doc_time: str | datetime = None
@@ -356,6 +750,9 @@ class GoolabsService:
         :param doc_time: the reference datetime used for time normalization,
             should be a datetime string in the "%Y-%m-%dT%H:%M:%S" format or a datetime instance,
             if omitted, the current time is used,
+            if omitted and the chrono cache is enabled, the current time quantized
+            to the cache granularity is used, so relative times are anchored to the start
+            of the current bucket and the result is cached until the bucket rolls over,
             defaults to None
         :type doc_time: str or datetime, optional
         :return: A NormalizedTimes object created from response dict
@@ -363,12 +760,26 @@ class GoolabsService:
         :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
         :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
         """
-        return _create_normalized_times_from_response(
-            self.api.chrono(
-                sentence=sentence,
-                doc_time=convert_the_datetime_value_to_goolabs_format(doc_time),
+        sentence = self._prepare_text("chrono", "sentence", sentence)
+        doc_time = convert_the_datetime_value_to_goolabs_format(doc_time)
+        if self._can_skip_request("chrono", sentence):
+            return NormalizedTimes(
+                [],
+                GoolabsDatetime.from_goolabs_format(
+                    doc_time or self._get_current_doc_time()
+                ),
             )
-        )
+        if self.chrono_cache is None:
+            return self._request_normalized_times(sentence, doc_time)
+
+        expires_at = None
+        if doc_time is None:
+            doc_time, expires_at = self._get_current_doc_time_bucket()
+        key = (sentence, doc_time)
+        if (result := self.chrono_cache.get(key)) is None:
+            result = self._request_normalized_times(sentence, doc_time)
+            self.chrono_cache.set(key, result, expires_at)
+        return result
 
     def extract_named_entities(
         self,
@@ -395,13 +806,19 @@ class GoolabsService:
         :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
         :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
         """
-        return _create_extracted_named_entities_from_response(
-            self.api.entity(
-                sentence=sentence,
-                class_filter=convert_filters_to_goolabs_format(
-                    NamedEntityType, class_filter
+        sentence = self._prepare_text("entity", "sentence", sentence)
+        class_filter_string = convert_filters_to_goolabs_format(
+            NamedEntityType, class_filter
+        )
+        if self._can_skip_request("entity", sentence):
+            return ExtractedNamedEntities(
+                [],
+                get_type_enum_list_from_response_filters_string(
+                    NamedEntityType, class_filter_string
                 ),
-            ),
+            )
+        return _create_extracted_named_entities_from_response(
+            self.api.entity(sentence=sentence, class_filter=class_filter_string),
             [("class_filter", str) if class_filter is not None else None],
         )
 
@@ -425,14 +842,15 @@ class GoolabsService:
         :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
         :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
         """
-        return _create_converted_to_furigana_from_response(
-            self.api.hiragana(
-                sentence=sentence,
-                output_type=convert_the_type_enum_value_to_string(
-                    KanaType, output_type, True
-                ),
-            )
-        )
+        sentence = self._prepare_text("hiragana", "sentence", sentence)
+        output_type = convert_the_type_enum_value_to_string(KanaType, output_type, True)
+        if self.morph_sentence_cache is not None and (
+            cached := self._get_furigana_from_sentence_cache(sentence, output_type)
+        ):
+            return cached
+        if self.reading_dictionary is not None:
+            return self._convert_to_furigana_locally(sentence, output_type)
+        return self._request_converted_to_furigana(sentence, output_type)
 
     def extract_keywords(
         self,
@@ -463,15 +881,18 @@ class GoolabsService:
         :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
         :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
         """
-        return _create_extracted_keywords_from_response(
-            self.api.keyword(
-                title=title,
-                body=body,
-                max_num=convert_num_value_to_int_in_range(max_num),
-                focus=convert_the_type_enum_value_to_string(KeywordFocusType, focus),
-            ),
-            [("focus", str) if focus is not None else None],
-        )
+        title = self._prepare_text("keyword", "title", title)
+        body = self._prepare_text("keyword", "body", body)
+        max_num = convert_num_value_to_int_in_range(max_num)
+        focus = convert_the_type_enum_value_to_string(KeywordFocusType, focus)
+        key = _get_keyword_cache_key(title, body, max_num, focus)
+        if (result := self.keyword_cache.get(key)) is None:
+            result = _create_extracted_keywords_from_response(
+                self.api.keyword(title=title, body=body, max_num=max_num, focus=focus),
+                [("focus", str) if focus is not None else None],
+            )
+            self.keyword_cache.set(key, result)
+        return result
 
     def analyze_morphology(
         self,
@@ -557,21 +978,16 @@ class GoolabsService:
         :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
         :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
         """
-        return _create_analyzed_morphology_from_response(
-            self.api.morph(
-                sentence=sentence,
-                info_filter=convert_filters_to_goolabs_format(
-                    MorphemeInfoType, info_filter
-                ),
-                pos_filter=convert_filters_to_goolabs_format(
-                    PartOfSpeechType, pos_filter
-                ),
-            ),
-            [
-                ("info_filter", str) if info_filter else None,
-                ("pos_filter", str) if pos_filter else None,
-            ],
-        )
+        sentence = self._prepare_text("morph", "sentence", sentence)
+        info_filter = convert_filters_to_goolabs_format(MorphemeInfoType, info_filter)
+        pos_filter = convert_filters_to_goolabs_format(PartOfSpeechType, pos_filter)
+        if self.morph_sentence_cache is None or (
+            (word_list := self._get_word_list_using_sentence_cache(sentence)) is None
+        ):
+            return self._request_chunked_analyzed_morphology(
+                sentence, info_filter, pos_filter
+            )
+        return _filter_analyzed_morphology(word_list, info_filter, pos_filter)
 
     def extract_slot_values(
         self,
@@ -598,11 +1014,21 @@ class GoolabsService:
         :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
         :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
         """
+        sentence = self._prepare_text("slot", "sentence", sentence)
+        slot_filter_string = convert_filters_to_goolabs_format(SlotType, slot_filter)
+        if self._can_skip_request("slot", sentence):
+            slot_types = get_type_enum_list_from_response_filters_string(
+                SlotType, slot_filter_string
+            )
+            return ExtractedSlotValues(
+                *(
+                    [] if slot_type in slot_types else None
+                    for slot_type in _SLOT_FUNCTION_DICT
+                ),
+                slot_types,
+            )
         return _create_extracted_slot_values_from_response(
-            self.api.slot(
-                sentence=sentence,
-                slot_filter=convert_filters_to_goolabs_format(SlotType, slot_filter),
-            ),
+            self.api.slot(sentence=sentence, slot_filter=slot_filter_string),
             [("slot_filter", str) if slot_filter is not None else None],
         )
 
@@ -621,6 +1047,144 @@ class GoolabsService:
         :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
         :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
         """
-        return _create_calculated_similarity_from_response(
-            self.api.textpair(text1=text1, text2=text2)
+        text1 = self._prepare_text("textpair", "text1", text1)
+        text2 = self._prepare_text("textpair", "text2", text2)
+        return CalculatedSimilarity(self._request_similarity_score(text1, text2))
+
+    def calculate_similarity_matrix(
+        self, texts: Iterable[str], ngram_threshold: float = None
+    ) -> SimilarityMatrix:
+        """The method used to calculate similarity between every 2 of passed texts.
+        Identical texts are compared once, every pair is requested only once
+        regardless of its order and requests are made concurrently.
+        Returns a SimilarityMatrix object with scores received from the Goolabs API.
+
+        :param texts: the texts that will be compared, should be non-empty strings
+        :type texts: Iterable[str]
+        :param ngram_threshold: the min Jaccard similarity of character bigrams
+            of 2 texts required to request their score, scores of other pairs are nan,
+            if omitted, every pair is requested,
+            defaults to None
+        :type ngram_threshold: float, optional
+        :return: A SimilarityMatrix object with the score of every pair of texts
+        :rtype: SimilarityMatrix
+        :raises InvalidArgsForGoolabsRequestError: if passed params are invalid for a Goolabs API request
+        :raises UnexpectedGoolabsAPIResponseError: if received response has unexpected format
+        """
+        rows = {}
+        indices = []
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text:
+                raise InvalidArgsForGoolabsRequestError(
+                    f"Parameter 'texts[{index}]' with {text=} is not a non-empty string"
+                )
+            text = self._prepare_text("textpair", f"texts[{index}]", text)
+            indices.append(rows.setdefault(text, len(rows)))
+        matrix = SimilarityMatrix.empty(list(rows), indices)
+
+        pairs = [
+            (row, column)
+            for row in range(matrix.size)
+            for column in range(row + 1, matrix.size)
+        ]
+        if ngram_threshold is not None:
+            ngrams = [get_character_ngrams(text) for text in matrix.texts]
+            pairs = [
+                (row, column)
+                for row, column in pairs
+                if calculate_ngram_similarity(ngrams[row], ngrams[column])
+                >= ngram_threshold
+            ]
+        scores = self._executor.map(
+            lambda pair: self._request_similarity_score(
+                matrix.texts[pair[0]], matrix.texts[pair[1]]
+            ),
+            pairs,
+        )
+        for (row, column), score in zip(pairs, scores):
+            matrix.set_score(row, column, score)
+        return matrix
+
+    def analyze_morphology_many(
+        self,
+        sentences: Iterable[str],
+        info_filter: Iterable[str | MorphemeInfoType] | str = None,
+        pos_filter: Iterable[str | PartOfSpeechType] | str = None,
+        concurrency: int = config.GOOLABS_MAX_CONCURRENT_REQUESTS,
+        rate_limit: float = None,
+        ordered: bool = True,
+    ) -> Generator[BatchItemResult, None, None]:
+        """The method used to analyze morphology of many sentences concurrently.
+        Yields a BatchItemResult object for every sentence with an AnalyzedMorphology object
+        as its result or with the exception raised for the sentence as its error.
+
+        :param sentences: the sentences analyzed with analyze_morphology,
+            consumed lazily, so it can be a generator of any length
+        :type sentences: Iterable[str]
+        :param info_filter: the filters passed to analyze_morphology for every sentence,
+            defaults to None
+        :type info_filter: str or list of str/MorphemeInfoType, optional
+        :param pos_filter: the filters passed to analyze_morphology for every sentence,
+            defaults to None
+        :type pos_filter: str or list of str/PartOfSpeechType, optional
+        :param concurrency: the max number of sentences analyzed at the same time,
+            defaults to value of GOOLABS_MAX_CONCURRENT_REQUESTS variable set in config
+        :type concurrency: int, optional
+        :param rate_limit: the max number of sentences started to be analyzed per second,
+            if omitted, the rate is not limited,
+            defaults to None
+        :type rate_limit: float, optional
+        :param ordered: whether to yield results in the order of sentences
+            or as soon as they are completed,
+            defaults to True
+        :type ordered: bool, optional
+        :return: A generator of BatchItemResult objects
+        :rtype: Generator[BatchItemResult, None, None]
+        """
+        return run_batch(
+            lambda sentence: self.analyze_morphology(sentence, info_filter, pos_filter),
+            sentences,
+            concurrency,
+            rate_limit,
+            ordered,
+        )
+
+    def convert_to_furigana_many(
+        self,
+        sentences: Iterable[str],
+        output_type: Literal["hiragana", "katakana"] | KanaType = "hiragana",
+        concurrency: int = config.GOOLABS_MAX_CONCURRENT_REQUESTS,
+        rate_limit: float = None,
+        ordered: bool = True,
+    ) -> Generator[BatchItemResult, None, None]:
+        """The method used to convert many sentences to furigana concurrently.
+        Yields a BatchItemResult object for every sentence with a ConvertedToFurigana object
+        as its result or with the exception raised for the sentence as its error.
+
+        :param sentences: the sentences converted with convert_to_furigana,
+            consumed lazily, so it can be a generator of any length
+        :type sentences: Iterable[str]
+        :param output_type: the output type passed to convert_to_furigana for every sentence,
+            defaults to "hiragana"
+        :type output_type: str or KanaType, optional
+        :param concurrency: the max number of sentences converted at the same time,
+            defaults to value of GOOLABS_MAX_CONCURRENT_REQUESTS variable set in config
+        :type concurrency: int, optional
+        :param rate_limit: the max number of sentences started to be converted per second,
+            if omitted, the rate is not limited,
+            defaults to None
+        :type rate_limit: float, optional
+        :param ordered: whether to yield results in the order of sentences
+            or as soon as they are completed,
+            defaults to True
+        :type ordered: bool, optional
+        :return: A generator of BatchItemResult objects
+        :rtype: Generator[BatchItemResult, None, None]
+        """
+        return run_batch(
+            lambda sentence: self.convert_to_furigana(sentence, output_type),
+            sentences,
+            concurrency,
+            rate_limit,
+            ordered,
         )
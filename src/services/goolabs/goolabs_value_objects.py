@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Literal
 
 from .goolabs_value_types import (
@@ -13,6 +14,36 @@ from .goolabs_value_types import (
     SlotType,
 )
 
+_GOOLABS_FORMAT_MEMO_SIZE = 1024
+
+
+@lru_cache(maxsize=_GOOLABS_FORMAT_MEMO_SIZE)
+def _parse_goolabs_format(date_string: str) -> tuple[tuple, bool, bool]:
+    # Picks the branch by the shape of the string instead of trying
+    # fromisoformat first, returns the datetime fields with is_month_set
+    # and is_day_set flags, so results can be memoized without sharing
+    # mutable GoolabsDatetime instances
+    match date_string.split("-", 2):
+        case [str(year)] if year.isdecimal() and len(year) <= 4:
+            return (int(year), 1, 1), False, False
+        case [str(year), str(month)] if year.isdecimal() and month.isdecimal():
+            return (int(year), int(month), 1), True, False
+    dt = datetime.fromisoformat(date_string)
+    return (
+        (
+            dt.year,
+            dt.month,
+            dt.day,
+            dt.hour,
+            dt.minute,
+            dt.second,
+            dt.microsecond,
+            dt.tzinfo,
+        ),
+        True,
+        True,
+    )
+
 
 class GoolabsDatetime(datetime):
     def __new__(cls, *args, **kwargs) -> GoolabsDatetime:
@@ -23,22 +54,10 @@ class GoolabsDatetime(datetime):
 
     @classmethod
     def from_goolabs_format(cls, date_string: str) -> GoolabsDatetime:
-        try:
-            dt = cls.fromisoformat(date_string)
-            dt.is_month_set = True
-            dt.is_day_set = True
-        except ValueError as ex:
-            match date_string.split("-"):
-                case [str(year)] if year.isdecimal():
-                    dt = cls(int(year), 1, 1)
-                    dt.is_month_set = False
-                    dt.is_day_set = False
-                case [str(year), str(month)] if year.isdecimal() and month.isdecimal():
-                    dt = cls(int(year), int(month), 1)
-                    dt.is_month_set = True
-                    dt.is_day_set = False
-                case _:
-                    raise ex
+        fields, is_month_set, is_day_set = _parse_goolabs_format(date_string)
+        dt = cls(*fields)
+        dt.is_month_set = is_month_set
+        dt.is_day_set = is_day_set
         return dt
 
     def to_goolabs_format(self, *args, **kwargs) -> str:
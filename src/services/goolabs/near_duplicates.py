@@ -0,0 +1,135 @@
+import random
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+
+import numpy as np
+
+from .similarity import get_character_ngrams
+
+# Permutations are simulated with universal hashing modulo a Mersenne prime,
+# 32-bit hashes and coefficients keep a * hash + b within 64-bit integers
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_COEFFICIENT = 1 << 32
+
+
+def _hash_ngram(ngram: str) -> int:
+    # Python's hash is salted per process, blake2b keeps signatures stable
+    return int.from_bytes(blake2b(ngram.encode(), digest_size=4).digest(), "little")
+
+
+class MinHashLSHIndex:
+    """
+    Thread-safe index of MinHash signatures of character n-grams of texts
+    with locality-sensitive hashing, used to find texts similar to a new one
+    without comparing it with every indexed text. The least recently inserted
+    or found texts are evicted when the index is full.
+
+    Args:
+        max_size (int): the max number of texts kept in the index
+        num_permutations (int): the length of MinHash signatures
+        bands (int): the number of LSH bands signatures are split into,
+            more bands find less similar texts
+        ngram_size (int): the length of character n-grams
+        seed (int): the seed of the permutations
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        num_permutations: int = 64,
+        bands: int = 16,
+        ngram_size: int = 2,
+        seed: int = 1,
+    ) -> None:
+        if num_permutations % bands:
+            raise ValueError(
+                f"{num_permutations=} should be divisible by the number of {bands=}"
+            )
+        generator = random.Random(seed)
+        self.max_size = max_size
+        self.ngram_size = ngram_size
+        permutations = [
+            (
+                generator.randrange(1, _MAX_COEFFICIENT),
+                generator.randrange(_MAX_COEFFICIENT),
+            )
+            for _ in range(num_permutations)
+        ]
+        self._a, self._b = (
+            np.array(coefficients, dtype=np.uint64)[:, np.newaxis]
+            for coefficients in zip(*permutations)
+        )
+        self._rows = num_permutations // bands
+        self._signatures: OrderedDict[str, tuple[int, ...]] = OrderedDict()
+        self._buckets: list[dict[tuple[int, ...], set[str]]] = [
+            {} for _ in range(bands)
+        ]
+        self._lock = Lock()
+
+    def get_signature(self, text: str) -> tuple[int, ...]:
+        ngrams = get_character_ngrams(text, self.ngram_size)
+        hashes = np.fromiter(map(_hash_ngram, ngrams), np.uint64, len(ngrams))
+        # Every permutation is applied to all hashes at once
+        values = (self._a * hashes + self._b) % _MERSENNE_PRIME
+        return tuple(values.min(axis=1).tolist())
+
+    def insert(self, text: str) -> None:
+        if self.max_size <= 0:
+            return
+        signature = None if text in self._signatures else self.get_signature(text)
+        with self._lock:
+            if text in self._signatures:
+                self._signatures.move_to_end(text)
+                return
+            self._signatures[text] = signature
+            for band, key in enumerate(self._get_band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(text)
+            while len(self._signatures) > self.max_size:
+                self._remove(*self._signatures.popitem(last=False))
+
+    def find_near_duplicates(
+        self, text: str, threshold: float
+    ) -> list[tuple[str, float]]:
+        """Returns indexed texts with the estimated Jaccard similarity of n-grams
+        with the text not lower than threshold, the most similar texts first"""
+        signature = self.get_signature(text)
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._get_band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            near_duplicates = []
+            for candidate in candidates:
+                similarity = self._estimate_similarity(
+                    signature, self._signatures[candidate]
+                )
+                if similarity >= threshold:
+                    self._signatures.move_to_end(candidate)
+                    near_duplicates.append((candidate, similarity))
+        return sorted(near_duplicates, key=lambda pair: pair[1], reverse=True)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _get_band_keys(self, signature: tuple[int, ...]) -> list[tuple[int, ...]]:
+        return [
+            signature[start : start + self._rows]
+            for start in range(0, len(signature), self._rows)
+        ]
+
+    def _remove(self, text: str, signature: tuple[int, ...]) -> None:
+        # Should be called with the lock acquired
+        for band, key in enumerate(self._get_band_keys(signature)):
+            bucket = self._buckets[band][key]
+            bucket.discard(text)
+            if not bucket:
+                del self._buckets[band][key]
+
+    @staticmethod
+    def _estimate_similarity(
+        signature1: tuple[int, ...], signature2: tuple[int, ...]
+    ) -> float:
+        return sum(map(int.__eq__, signature1, signature2)) / len(signature1)
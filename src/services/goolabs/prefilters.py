@@ -0,0 +1,58 @@
+import re
+from dataclasses import dataclass
+from threading import Lock
+
+# The prefilters are conservative: a sentence is skipped only when it
+# contains none of the characters the corresponding Goolabs API could build
+# a non-empty result from, any doubt means a request is made. Kana words
+# cannot be listed exhaustively, so any kana means a request is made
+
+_DIGITS = r"\d"
+_KANA = r"ぁ-ゟァ-ヿㇰ-ㇿｦ-ﾟ"
+_KANJI = r"々〇㐀-䶿一-鿿豈-﫿"
+_LATIN = r"A-Za-zＡ-Ｚａ-ｚ"
+_TIME_KANJI = (
+    "〇一二三四五六七八九十百千万億兆零壱弐参拾"
+    "年月日時分秒週曜旬期暦紀元"
+    "朝昼晩夜夕宵暁深午前後半頃末初"
+    "今明昨先来去翌毎"
+    "春夏秋冬旦"
+    "令和平成昭大正治"
+)
+
+_API_PATTERNS = {
+    "chrono": re.compile(f"[{_DIGITS}{_KANA}{_LATIN}{_TIME_KANJI}]"),
+    "entity": re.compile(f"[{_DIGITS}{_KANA}{_LATIN}{_KANJI}]"),
+    "slot": re.compile(f"[{_DIGITS}{_KANA}{_LATIN}{_KANJI}]"),
+}
+
+
+@dataclass
+class PrefilterStats:
+    checked: int = 0
+    skipped: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.skipped / self.checked if self.checked else 0.0
+
+
+class GoolabsPrefilter:
+    """
+    Decides locally whether a result of a Goolabs API method is trivially empty,
+    so the request for it can be skipped. Counts checked and skipped sentences
+    for every API method in stats.
+    """
+
+    API_NAMES = set(_API_PATTERNS)
+
+    def __init__(self) -> None:
+        self.stats = {api_name: PrefilterStats() for api_name in self.API_NAMES}
+        self._lock = Lock()
+
+    def can_skip(self, api_name: str, sentence: str) -> bool:
+        skip = _API_PATTERNS[api_name].search(sentence) is None
+        with self._lock:
+            self.stats[api_name].checked += 1
+            self.stats[api_name].skipped += skip
+        return skip
@@ -0,0 +1,305 @@
+import json
+import os
+import shutil
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from threading import Lock, RLock, Thread
+from typing import Iterable
+
+import numpy as np
+
+from .goolabs_value_objects import AnalyzedSentence
+
+_CURRENT_FILE_NAME = "current.json"
+_HIRAGANA_AND_KATAKANA = set(
+    map(chr, [*range(ord("ぁ"), ord("ゖ") + 1), *range(ord("ァ"), ord("ヺ") + 1)])
+) | {"ー", "ゝ", "ゞ", "ヽ", "ヾ"}
+
+
+@dataclass
+class ReadingToken:
+    text: str
+    reading: str | None
+    pos: str | None
+
+
+class _MappedStrings:
+    # A sequence of UTF-8 strings stored in a byte blob with offsets,
+    # compared as bytes, which sorts them by code points
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray) -> None:
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return self._blob[self._offsets[index] : self._offsets[index + 1]].tobytes()
+
+
+def _pack_strings(strings: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in strings], out=offsets[1:])
+    return np.frombuffer(b"".join(strings), dtype=np.uint8), offsets
+
+
+class ReadingDictionary:
+    """
+    Thread-safe dictionary of readings of morpheme forms with their observation
+    counts. Saved snapshots are sorted arrays memory-mapped from a directory,
+    observations made after the last snapshot are kept in memory and merged
+    into a new snapshot generation on save. The snapshot is written without
+    holding the lock, so observations and lookups are not blocked by saving.
+
+    Args:
+        path (str): the directory the dictionary is loaded from and saved to,
+            if omitted, the dictionary is kept in memory only
+        save_every (int): the number of new observations saved automatically
+            as a new snapshot in a background thread, if omitted,
+            the dictionary is saved only by save and close
+    """
+
+    def __init__(self, path: str = None, save_every: int = None) -> None:
+        self.path = path
+        self.save_every = save_every
+        self._lock = RLock()
+        self._save_lock = Lock()
+        self._observations: dict[str, dict[str, int]] = {}
+        self._pos: dict[tuple[str, str], str] = {}
+        # Observations being written as a new snapshot
+        self._saving_observations: dict[str, dict[str, int]] = {}
+        self._saving_pos: dict[tuple[str, str], str] = {}
+        self._saving_thread: Thread | None = None
+        self._unsaved_count = 0
+        self._max_form_length = 0
+        self._load_snapshot()
+
+    def observe(self, form: str, reading: str, pos: str | None = None) -> None:
+        with self._lock:
+            readings = self._observations.setdefault(form, {})
+            readings[reading] = readings.get(reading, 0) + 1
+            if pos is not None:
+                self._pos[form, reading] = pos
+            self._max_form_length = max(self._max_form_length, len(form))
+            self._unsaved_count += 1
+            if (
+                self.path is not None
+                and self.save_every
+                and self._unsaved_count >= self.save_every
+                and not (self._saving_thread and self._saving_thread.is_alive())
+            ):
+                self._saving_thread = Thread(
+                    target=self.save, name="reading-dictionary-save", daemon=True
+                )
+                self._saving_thread.start()
+
+    def observe_sentences(self, word_list: Iterable[AnalyzedSentence]) -> None:
+        for sentence in word_list:
+            for morpheme in sentence:
+                if morpheme.form and morpheme.read:
+                    self.observe(
+                        morpheme.form,
+                        morpheme.read,
+                        morpheme.pos and morpheme.pos.value,
+                    )
+
+    def get_readings(self, form: str) -> dict[str, tuple[int, str | None]]:
+        """Returns the observation count and the POS value of every reading of the form"""
+        with self._lock:
+            readings = {}
+            key = form.encode()
+            start = bisect_left(self._forms, key)
+            for row in range(start, bisect_right(self._forms, key, lo=start)):
+                reading = self._readings[row].decode()
+                readings[reading] = (
+                    int(self._counts[row]),
+                    self._pos_values[self._pos_codes[row]],
+                )
+            for observations, pos in (
+                (self._saving_observations, self._saving_pos),
+                (self._observations, self._pos),
+            ):
+                for reading, count in observations.get(form, {}).items():
+                    saved_count, saved_pos = readings.get(reading, (0, None))
+                    readings[reading] = (
+                        saved_count + count,
+                        pos.get((form, reading), saved_pos),
+                    )
+            return readings
+
+    def lookup(self, form: str) -> tuple[str, str | None, float] | None:
+        """Returns the most frequent reading of the form, its POS value
+        and the share of observations with the reading"""
+        if not (readings := self.get_readings(form)):
+            return None
+        reading, (count, pos) = max(readings.items(), key=lambda item: item[1][0])
+        return reading, pos, count / sum(count for count, _ in readings.values())
+
+    def segment(self, text: str, min_confidence: float = 0.0) -> list[ReadingToken]:
+        """Splits the text into the longest known forms, the reading of a form
+        observed with its most frequent reading less often than min_confidence
+        and of characters not starting any form is None, kana characters
+        are read as they are and whitespace is skipped"""
+        tokens = []
+        index = 0
+        while index < len(text):
+            character = text[index]
+            if character.isspace():
+                index += 1
+                continue
+            for length in range(min(self._max_form_length, len(text) - index), 0, -1):
+                if found := self.lookup(text[index : index + length]):
+                    reading, pos, confidence = found
+                    if confidence < min_confidence:
+                        reading = None
+                    tokens.append(
+                        ReadingToken(text[index : index + length], reading, pos)
+                    )
+                    index += length
+                    break
+            else:
+                reading = character if character in _HIRAGANA_AND_KATAKANA else None
+                tokens.append(ReadingToken(character, reading, None))
+                index += 1
+        return tokens
+
+    def save(self) -> None:
+        """Writes all observations as a new snapshot generation"""
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._observations:
+                    return
+                # Readers see the observations being saved until the new
+                # snapshot is loaded, later observations are kept apart
+                self._saving_observations, self._observations = self._observations, {}
+                self._saving_pos, self._pos = self._pos, {}
+                self._unsaved_count = 0
+                generation = self._generation
+                max_form_length = self._max_form_length
+            try:
+                self._write_snapshot(generation + 1, max_form_length)
+            except BaseException:
+                # The observations are kept for the next save
+                with self._lock:
+                    self._restore_saving_observations()
+                raise
+            with self._lock:
+                self._saving_observations = {}
+                self._saving_pos = {}
+                self._load_snapshot()
+            shutil.rmtree(os.path.join(self.path, str(generation)), ignore_errors=True)
+
+    def close(self) -> None:
+        """Waits for a background save and saves the remaining observations"""
+        if self._saving_thread is not None:
+            self._saving_thread.join()
+        self.save()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._iterate_forms())
+
+    def _write_snapshot(self, generation: int, max_form_length: int) -> None:
+        rows = self._merge_rows(self._saving_observations, self._saving_pos)
+        pos_values = sorted({pos for *_, pos in rows if pos is not None})
+        pos_codes = {pos: code for code, pos in enumerate(pos_values)}
+        directory = os.path.join(self.path, str(generation))
+        os.makedirs(directory, exist_ok=True)
+        arrays = {
+            "counts": np.array([row[2] for row in rows], dtype=np.int64),
+            "pos_codes": np.array(
+                [pos_codes.get(row[3], -1) for row in rows], dtype=np.int32
+            ),
+        }
+        for name, strings in (("forms", 0), ("readings", 1)):
+            blob, offsets = _pack_strings([row[strings] for row in rows])
+            arrays[f"{name}_blob"] = blob
+            arrays[f"{name}_offsets"] = offsets
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+        with open(os.path.join(directory, "meta.json"), "w") as file:
+            json.dump(
+                {"pos_values": pos_values, "max_form_length": max_form_length},
+                file,
+                ensure_ascii=False,
+            )
+        # Switching the current generation is atomic, readers of the old one
+        # keep their memory maps until they reload
+        current_path = os.path.join(self.path, _CURRENT_FILE_NAME)
+        with open(f"{current_path}.tmp", "w") as file:
+            json.dump({"generation": generation}, file)
+        os.replace(f"{current_path}.tmp", current_path)
+
+    def _restore_saving_observations(self) -> None:
+        # Should be called with the lock acquired, merges the observations
+        # of a failed save with the ones made during it
+        for form, readings in self._saving_observations.items():
+            observed = self._observations.setdefault(form, {})
+            for reading, count in readings.items():
+                observed[reading] = observed.get(reading, 0) + count
+                self._unsaved_count += count
+        self._pos = self._saving_pos | self._pos
+        self._saving_observations = {}
+        self._saving_pos = {}
+
+    def _iterate_forms(self) -> Iterable[str]:
+        unsaved = {**self._saving_observations, **self._observations}
+        previous = None
+        for index in range(len(self._forms)):
+            if (form := self._forms[index]) != previous:
+                previous = form
+                if form.decode() not in unsaved:
+                    yield form.decode()
+        yield from unsaved
+
+    def _merge_rows(
+        self, observations: dict[str, dict[str, int]], pos: dict[tuple[str, str], str]
+    ) -> list[tuple[bytes, bytes, int, str | None]]:
+        # Merges the observations into rows of the current snapshot, which is
+        # replaced only by the saving thread, so it is read without the lock
+        rows = {
+            (self._forms[row], self._readings[row]): (
+                int(self._counts[row]),
+                self._pos_values[self._pos_codes[row]],
+            )
+            for row in range(len(self._counts))
+        }
+        for form, readings in observations.items():
+            for reading, count in readings.items():
+                key = (form.encode(), reading.encode())
+                saved_count, saved_pos = rows.get(key, (0, None))
+                rows[key] = (saved_count + count, pos.get((form, reading), saved_pos))
+        return sorted(
+            ((*key, count, row_pos) for key, (count, row_pos) in rows.items()),
+            key=lambda row: row[:2],
+        )
+
+    def _load_snapshot(self) -> None:
+        self._generation = 0
+        current_path = self.path and os.path.join(self.path, _CURRENT_FILE_NAME)
+        if current_path is None or not os.path.exists(current_path):
+            empty_offsets = np.zeros(1, dtype=np.int64)
+            empty_blob = np.zeros(0, dtype=np.uint8)
+            self._forms = _MappedStrings(empty_blob, empty_offsets)
+            self._readings = _MappedStrings(empty_blob, empty_offsets)
+            self._counts = np.zeros(0, dtype=np.int64)
+            self._pos_codes = np.zeros(0, dtype=np.int32)
+            self._pos_values = [None]
+            return
+        with open(current_path) as file:
+            self._generation = json.load(file)["generation"]
+        directory = os.path.join(self.path, str(self._generation))
+
+        def load(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+        with open(os.path.join(directory, "meta.json")) as file:
+            meta = json.load(file)
+        self._forms = _MappedStrings(load("forms_blob"), load("forms_offsets"))
+        self._readings = _MappedStrings(load("readings_blob"), load("readings_offsets"))
+        self._counts = load("counts")
+        self._pos_codes = load("pos_codes")
+        # NULL POS code -1 indexes the appended None
+        self._pos_values = [*meta["pos_values"], None]
+        self._max_form_length = max(self._max_form_length, meta["max_form_length"])
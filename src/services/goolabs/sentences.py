@@ -0,0 +1,71 @@
+import re
+
+from .goolabs_value_objects import AnalyzedSentence
+
+# A sentence ends with terminal punctuation followed by closing brackets
+# and line breaks, or with line breaks, so segments concatenate back
+# to the initial text
+_SENTENCE_PATTERN = re.compile(r".+?(?:[。！？!?]+[」』）)］\]]*\n*|\n+|$)", re.DOTALL)
+
+
+def split_sentences(text: str) -> list[str]:
+    return _SENTENCE_PATTERN.findall(text)
+
+
+def group_segments_into_chunks(
+    segments: list[str], max_chunk_size: int | None
+) -> list[list[str]]:
+    """Groups consecutive segments into chunks with total length not exceeding
+    max_chunk_size, a segment longer than max_chunk_size makes a chunk on its own"""
+    if not max_chunk_size:
+        return [segments] if segments else []
+    chunks = []
+    chunk = []
+    chunk_size = 0
+    for segment in segments:
+        if chunk and chunk_size + len(segment) > max_chunk_size:
+            chunks.append(chunk)
+            chunk = []
+            chunk_size = 0
+        chunk.append(segment)
+        chunk_size += len(segment)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _remove_whitespace(text: str) -> str:
+    return "".join(text.split())
+
+
+def assign_analyzed_sentences_to_segments(
+    segments: list[str], word_list: list[AnalyzedSentence]
+) -> list[list[AnalyzedSentence]] | None:
+    """Maps sentences analyzed from the concatenated segments back to the segments
+    using forms of morphemes, returns None if the forms do not match the segments
+    or a sentence spans several segments"""
+    if _remove_whitespace("".join(segments)) != "".join(
+        _remove_whitespace(morpheme.form or "")
+        for sentence in word_list
+        for morpheme in sentence
+    ):
+        return None
+
+    segment_ends = []
+    length = 0
+    for segment in segments:
+        length += len(_remove_whitespace(segment))
+        segment_ends.append(length)
+
+    assigned = [[] for _ in segments]
+    index = offset = 0
+    for sentence in word_list:
+        while index < len(segments) - 1 and offset >= segment_ends[index]:
+            index += 1
+        offset += sum(
+            len(_remove_whitespace(morpheme.form or "")) for morpheme in sentence
+        )
+        if offset > segment_ends[index]:
+            return None
+        assigned[index].append(sentence)
+    return assigned
@@ -0,0 +1,32 @@
+from array import array
+from dataclasses import fields, is_dataclass
+from datetime import date
+from enum import Enum
+from math import isnan
+from typing import Any
+
+from .goolabs_value_objects import GoolabsDatetime
+
+
+def to_jsonable(value: Any) -> Any:
+    """Converts results of GoolabsService methods to values json.dumps accepts"""
+    match value:
+        case float() if isnan(value):
+            # NaN is not valid JSON
+            return None
+        case Enum():
+            return value.value
+        case GoolabsDatetime():
+            return value.to_goolabs_format()
+        case date():
+            return value.isoformat()
+        case list() | tuple() | array():
+            return [to_jsonable(item) for item in value]
+        case dict():
+            return {key: to_jsonable(item) for key, item in value.items()}
+        case _ if is_dataclass(value):
+            return {
+                field.name: to_jsonable(getattr(value, field.name))
+                for field in fields(value)
+            }
+    return value
@@ -0,0 +1,64 @@
+from array import array
+from dataclasses import dataclass
+from math import nan
+
+
+@dataclass
+class SimilarityMatrix:
+    """
+    Similarity scores between texts stored row-major in a flat array of floats.
+    Identical texts share one row, scores of pairs skipped by the prefilter are nan.
+
+    Args:
+        texts (list[str]): the distinct texts the rows and columns correspond to
+        indices (list[int]): the row of every text passed to calculate_similarity_matrix
+        scores (array): the len(texts) x len(texts) symmetric matrix of scores
+    """
+
+    texts: list[str]
+    indices: list[int]
+    scores: array
+
+    @classmethod
+    def empty(cls, texts: list[str], indices: list[int]) -> "SimilarityMatrix":
+        size = len(texts)
+        scores = array("d", [nan]) * (size * size)
+        for row in range(size):
+            scores[row * size + row] = 1.0
+        return cls(texts, indices, scores)
+
+    @property
+    def size(self) -> int:
+        return len(self.texts)
+
+    def set_score(self, row: int, column: int, score: float) -> None:
+        self.scores[row * self.size + column] = score
+        self.scores[column * self.size + row] = score
+
+    def get_score(self, index1: int, index2: int) -> float:
+        """Returns the score between the texts passed with the indices"""
+        return self.scores[self.indices[index1] * self.size + self.indices[index2]]
+
+    def to_rows(self) -> list[list[float]]:
+        return [
+            self.scores[row * self.size : (row + 1) * self.size].tolist()
+            for row in range(self.size)
+        ]
+
+
+def get_character_ngrams(text: str, n: int = 2) -> set[str]:
+    if len(text) <= n:
+        return {text}
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+def calculate_ngram_similarity(ngrams1: set[str], ngrams2: set[str]) -> float:
+    """Returns the Jaccard similarity of two sets of character n-grams"""
+    if not ngrams1 or not ngrams2:
+        return 0.0
+    return len(ngrams1 & ngrams2) / len(ngrams1 | ngrams2)
+
+
+def get_pair_key(text1: str, text2: str) -> tuple[str, str]:
+    # textpair is symmetric, so (a, b) and (b, a) share one key
+    return (text1, text2) if text1 <= text2 else (text2, text1)
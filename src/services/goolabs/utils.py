@@ -1,5 +1,5 @@
 from copy import copy
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from functools import wraps
 import inspect
@@ -88,20 +88,25 @@ def _validate_the_parameter_is_a_non_empty_string(
 def _validate_non_default_parameters_are_not_empty_strings(
     func: Callable, args: tuple, kwargs: dict
 ) -> None:
+    parameters = inspect.signature(func).parameters
     non_default_arg_names = [
         arg_name
-        for arg_name, parameter in inspect.signature(func).parameters.items()
+        for arg_name, parameter in parameters.items()
         if parameter.default is inspect.Parameter.empty
     ]
     non_default_arg_names.remove("self")
     for arg_name in copy(non_default_arg_names):
         if arg_name in kwargs:
-            _validate_the_parameter_is_a_non_empty_string(arg_name, kwargs[arg_name])
+            if parameters[arg_name].annotation is str:
+                _validate_the_parameter_is_a_non_empty_string(
+                    arg_name, kwargs[arg_name]
+                )
             non_default_arg_names.remove(arg_name)
     for index, parameter_value in enumerate(args[: len(non_default_arg_names)]):
-        _validate_the_parameter_is_a_non_empty_string(
-            non_default_arg_names[index], parameter_value
-        )
+        if parameters[non_default_arg_names[index]].annotation is str:
+            _validate_the_parameter_is_a_non_empty_string(
+                non_default_arg_names[index], parameter_value
+            )
 
 
 def goolabs_methods_class(cls: Any, logger: Logger = getLogger(__name__)) -> Any:
@@ -165,6 +170,12 @@ def convert_the_datetime_value_to_goolabs_format(
             raise InvalidArgsForGoolabsRequestError(f"{datetime_value=} unrecognised")
 
 
+def quantize_datetime(datetime_value: datetime, granularity: timedelta) -> datetime:
+    # Floors the datetime to the start of the granularity bucket it falls into
+    offset = (datetime_value.replace(tzinfo=None) - datetime.min) % granularity
+    return datetime_value - offset
+
+
 def convert_num_value_to_int_in_range(
     num_value: int | str | None, min_value: int = 1, max_value: int = 10
 ) -> int | None:
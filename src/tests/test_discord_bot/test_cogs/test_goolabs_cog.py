@@ -0,0 +1,228 @@
+import asyncio
+from threading import Event, Lock
+from time import sleep
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from config import ARTICLE_MAX_URLS_PER_COMMAND
+from discord_bot.cogs.goolabs_cog import GoolabsCog
+from discord_bot.exceptions import NoURLException, TooManyURLsException
+from utils.exceptions import ArticleFetchError
+from utils.host_limiter import HostLimiter
+
+
+class TestGoolabsCogKeywords(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.cog = GoolabsCog(MagicMock())
+        self.addCleanup(self.cog.scheduler.close)
+        self.cog._get_article = AsyncMock(return_value=("title", "body"))
+        self.ctx = MagicMock()
+        self.ctx.reply = AsyncMock(return_value=MagicMock(edit=AsyncMock()))
+        patcher = patch(
+            "discord_bot.cogs.goolabs_cog.goolabs_display.display_keywords_of_articles"
+        )
+        self.display = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_schedules_every_article_of_a_command_with_default_limits(
+        self,
+    ) -> None:
+        def extract_keywords(title: str, body: str, focus: str = None) -> str:
+            # Keeps the jobs overlapping, so they compete for the scheduler
+            sleep(0.01)
+            return "keywords"
+
+        self.cog.service.extract_keywords = extract_keywords
+        urls = tuple(
+            f"https://example{index}.com/"
+            for index in range(ARTICLE_MAX_URLS_PER_COMMAND)
+        )
+
+        await self.cog._reply_with_keywords(self.ctx, urls)
+
+        articles = self.display.call_args.args[2]
+        self.assertEqual(
+            [articles[index] for index in range(len(urls))],
+            [("title", "keywords")] * len(urls),
+        )
+        self.assertEqual(
+            (self.cog.scheduler.running, self.cog.scheduler.queued), (0, 0)
+        )
+
+    async def test_rejects_commands_without_urls_or_with_too_many(self) -> None:
+        with self.assertRaises(NoURLException):
+            await self.cog._reply_with_keywords(self.ctx, ())
+        with self.assertRaises(TooManyURLsException):
+            await self.cog._reply_with_keywords(
+                self.ctx, ("https://example.com/",) * (ARTICLE_MAX_URLS_PER_COMMAND + 1)
+            )
+        self.ctx.reply.assert_not_awaited()
+
+    async def test_displays_failed_articles_next_to_extracted_ones(self) -> None:
+        error = ArticleFetchError("Failed")
+        urls = tuple(f"https://example{index}.com/" for index in range(3))
+
+        async def get_article(url: str) -> tuple[str, str]:
+            if url == urls[1]:
+                raise error
+            return "title", "body"
+
+        self.cog._get_article = get_article
+        self.cog.service.extract_keywords = lambda title, body, focus=None: "keywords"
+
+        await self.cog._reply_with_keywords(self.ctx, urls)
+
+        self.assertEqual(
+            self.display.call_args.args[2],
+            {0: ("title", "keywords"), 1: error, 2: ("title", "keywords")},
+        )
+        self.assertEqual(
+            (self.cog.scheduler.running, self.cog.scheduler.queued), (0, 0)
+        )
+
+    async def test_keeps_articles_at_positions_of_their_urls(self) -> None:
+        urls = tuple(f"https://example{index}.com/" for index in range(3))
+
+        async def get_article(url: str) -> tuple[str, str]:
+            # Later articles are loaded first
+            await asyncio.sleep(0.01 * (len(urls) - urls.index(url)))
+            return url, "body"
+
+        self.cog._get_article = get_article
+        self.cog.service.extract_keywords = lambda title, body, focus=None: title
+        displayed = []
+        self.display.side_effect = lambda language, urls, articles: displayed.append(
+            dict(articles)
+        )
+
+        await self.cog._reply_with_keywords(self.ctx, urls)
+
+        self.assertEqual(
+            [list(articles) for articles in displayed], [[], [2], [2, 1], [2, 1, 0]]
+        )
+        self.assertEqual(
+            displayed[-1], {index: (url, url) for index, url in enumerate(urls)}
+        )
+
+    async def test_releases_article_load_slots_before_waiting_for_scheduler(
+        self,
+    ) -> None:
+        self.cog.article_limiter = HostLimiter(1, 1)
+        blocker = Event()
+        self.addCleanup(blocker.set)
+        self.cog.service.extract_keywords = lambda title, body, focus=None: (
+            blocker.wait()
+        )
+        urls = tuple(f"https://example{index}.com/" for index in range(2))
+        task = asyncio.create_task(self.cog._reply_with_keywords(self.ctx, urls))
+
+        async def wait_for_loads() -> None:
+            while self.cog._get_article.await_count < len(urls):
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_loads(), 1)
+        blocker.set()
+        await task
+
+
+class TestGoolabsCogAllKeywords(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.cog = GoolabsCog(MagicMock())
+        self.addCleanup(self.cog.scheduler.close)
+        self.cog._get_article = AsyncMock(return_value=("title", "body"))
+        self.ctx = MagicMock()
+        self.ctx.reply = AsyncMock()
+        patcher = patch(
+            "discord_bot.cogs.goolabs_cog.goolabs_display.display_all_keywords"
+        )
+        self.display = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.blocker = Event()
+        # Threads of a failed test must not block the exit
+        self.addCleanup(self.blocker.set)
+
+    async def test_extracts_keywords_with_every_focus(self) -> None:
+        self.cog.service.extract_keywords = lambda title, body, focus=None: focus
+
+        await self.cog.keywords_all(self.cog, self.ctx, "https://example.com/")
+
+        self.display.assert_called_once_with(
+            self.ctx.language,
+            {None: None, "ORG": "ORG", "PSN": "PSN", "LOC": "LOC"},
+            "title",
+        )
+        self.assertEqual(
+            (self.cog.scheduler.running, self.cog.scheduler.queued), (0, 0)
+        )
+
+    async def test_passes_at_most_queue_limit_of_user_jobs_to_scheduler(
+        self,
+    ) -> None:
+        self.cog.scheduler.max_queued_per_user = 1
+        lock = Lock()
+        running = [0]
+        max_running = [0]
+
+        def extract_keywords(title: str, body: str, focus: str = None) -> str:
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return focus
+
+        self.cog.service.extract_keywords = extract_keywords
+
+        await self.cog.keywords_all(self.cog, self.ctx, "https://example.com/")
+
+        self.assertEqual(max_running[0], 1)
+        self.display.assert_called_once()
+
+    async def test_cancels_other_focuses_after_failure(self) -> None:
+        focuses = []
+
+        def extract_keywords(title: str, body: str, focus: str = None) -> str:
+            focuses.append(focus)
+            if focus == "ORG":
+                raise ValueError("Failed")
+            self.blocker.wait()
+            return focus
+
+        self.cog.service.extract_keywords = extract_keywords
+
+        with self.assertRaises(ValueError):
+            await self.cog.keywords_all(self.cog, self.ctx, "https://example.com/")
+        await asyncio.sleep(0)
+
+        # The slot of the failed focus is taken by the next one,
+        # the last one is cancelled while queued
+        self.assertNotIn("LOC", focuses)
+        self.assertEqual(
+            (self.cog.scheduler.running, self.cog.scheduler.queued), (0, 0)
+        )
+        self.display.assert_not_called()
+
+    async def test_releases_article_load_slot_before_extracting_keywords(
+        self,
+    ) -> None:
+        self.cog.article_limiter = HostLimiter(1, 1)
+        self.cog.service.extract_keywords = lambda title, body, focus=None: (
+            self.blocker.wait()
+        )
+        urls = [f"https://example{index}.com/" for index in range(2)]
+        tasks = [
+            # Commands of different authors, which are queued separately
+            asyncio.create_task(
+                self.cog.keywords_all(self.cog, MagicMock(reply=AsyncMock()), url)
+            )
+            for url in urls
+        ]
+
+        async def wait_for_loads() -> None:
+            while self.cog._get_article.await_count < len(urls):
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_loads(), 1)
+        self.blocker.set()
+        await asyncio.gather(*tasks)
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from discord_bot.display import goolabs_display
+from services.goolabs import ExtractedKeywords, Keyword
+from utils.exceptions import ArticleFetchTimeoutError, SchedulerOverloadedError
+
+
+class TestDisplayKeywordsOfArticles(TestCase):
+    def test_displays_articles_at_positions_of_their_urls(self) -> None:
+        urls = [f"https://example{index}.com/" for index in range(5)]
+        keywords = ExtractedKeywords([Keyword("東京", 0.5), Keyword("駅", 0.2)], None)
+        articles = {
+            0: ("記事", keywords),
+            1: ArticleFetchTimeoutError("Timeout"),
+            2: SchedulerOverloadedError("Overloaded"),
+            3: ValueError("Unexpected"),
+        }
+
+        embed = goolabs_display.display_keywords_of_articles("en", urls, articles)
+
+        self.assertEqual(embed.description, "Extracted keywords from 4 of 5 articles")
+        self.assertEqual(
+            [(field.name, field.value) for field in embed.fields],
+            [
+                ("記事", f"{urls[0]}\n東京, 駅"),
+                (urls[1], "The article took too long to load"),
+                (
+                    urls[2],
+                    "Too many requests are waiting right now, please try again a bit later",
+                ),
+                (urls[3], "Error"),
+                (urls[4], "Loading..."),
+            ],
+        )
+
+    def test_displays_url_of_articles_without_title_or_keywords(self) -> None:
+        urls = ["https://example.com/"]
+
+        embed = goolabs_display.display_keywords_of_articles(
+            "en", urls, {0: (None, ExtractedKeywords([], None))}
+        )
+
+        self.assertEqual(
+            (embed.fields[0].name, embed.fields[0].value),
+            (urls[0], f"{urls[0]}\nThere is nothing"),
+        )
+
+
+class TestDisplayAllKeywords(TestCase):
+    def test_displays_keywords_of_every_focus(self) -> None:
+        results = {
+            None: ExtractedKeywords([Keyword("東京", 0.5), Keyword("駅", 0.2)], None),
+            "ORG": ExtractedKeywords([], None),
+            "PSN": ExtractedKeywords([Keyword("山田", 0.3)], None),
+        }
+
+        embed = goolabs_display.display_all_keywords("en", results, "記事")
+
+        self.assertEqual(
+            embed.description, "Extracted keywords from the article:\n記事"
+        )
+        self.assertEqual(
+            [(field.name, field.value) for field in embed.fields],
+            [
+                ("General keywords", "東京 — 0.5\n駅 — 0.2"),
+                ("Organization names", "There is nothing"),
+                ("Person names", "山田 — 0.3"),
+            ],
+        )
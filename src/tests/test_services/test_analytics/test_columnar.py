@@ -0,0 +1,114 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from services.analytics import ColumnarExporter, ColumnarReader, NULL_CODE
+from services.goolabs import (
+    AnalyzedMorpheme,
+    AnalyzedMorphology,
+    BatchItemResult,
+    ExtractedKeywords,
+    ExtractedNamedEntities,
+    Keyword,
+    NamedEntity,
+    NamedEntityType,
+    PartOfSpeechType,
+)
+
+
+def _morphology(*forms: str) -> AnalyzedMorphology:
+    return AnalyzedMorphology(
+        [[AnalyzedMorpheme(form, PartOfSpeechType.NOUN, None) for form in forms]],
+        [],
+        [],
+    )
+
+
+class TestColumnarExport(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = self.directory.name
+
+    def test_writes_dictionary_encoded_morphemes(self) -> None:
+        with ColumnarExporter(self.path, row_group_size=2) as exporter:
+            exporter.write(_morphology("猫", "犬", "猫"), group="guild")
+
+        reader = ColumnarReader(self.path)
+
+        self.assertEqual(reader.get_row_count("morphemes"), 3)
+        self.assertEqual(reader.read_column("morphemes", "form").tolist(), [0, 1, 0])
+        self.assertEqual(
+            reader.decode_column("morphemes", "form").tolist(), ["猫", "犬", "猫"]
+        )
+        self.assertEqual(
+            reader.read_column("morphemes", "read").tolist(), [NULL_CODE] * 3
+        )
+        self.assertEqual(
+            reader.decode_column("morphemes", "pos").tolist(), ["名詞"] * 3
+        )
+        self.assertEqual(reader.decode_column("records", "group").tolist(), ["guild"])
+
+    def test_splits_rows_into_row_groups(self) -> None:
+        with ColumnarExporter(self.path, row_group_size=2) as exporter:
+            exporter.write(_morphology("猫", "犬", "鳥"))
+
+        row_groups = list(ColumnarReader(self.path).iter_row_groups("morphemes"))
+
+        self.assertEqual([len(group["form"]) for group in row_groups], [2, 1])
+        self.assertIsInstance(row_groups[0]["form"], np.memmap)
+
+    def test_continues_existing_dataset(self) -> None:
+        with ColumnarExporter(self.path) as exporter:
+            exporter.write(_morphology("猫"))
+        with ColumnarExporter(self.path) as exporter:
+            record_id = exporter.write(_morphology("犬", "猫"))
+
+        reader = ColumnarReader(self.path)
+
+        self.assertEqual(record_id, 1)
+        self.assertEqual(reader.read_column("morphemes", "form").tolist(), [0, 1, 0])
+        self.assertEqual(
+            reader.read_column("morphemes", "record_id").tolist(), [0, 1, 1]
+        )
+
+    def test_writes_entities_and_keywords(self) -> None:
+        with ColumnarExporter(self.path) as exporter:
+            exporter.write(
+                ExtractedNamedEntities(
+                    [NamedEntity("東京", NamedEntityType.LOCATION_NAME)], []
+                )
+            )
+            exporter.write(ExtractedKeywords([Keyword("天気", 0.5)], None))
+
+        reader = ColumnarReader(self.path)
+
+        self.assertEqual(
+            reader.decode_column("entities", "entity_type").tolist(), ["LOC"]
+        )
+        self.assertEqual(reader.read_column("keywords", "score").tolist(), [0.5])
+        self.assertEqual(reader.read_column("keywords", "record_id").tolist(), [1])
+
+    def test_write_batch_results_skips_errors(self) -> None:
+        with ColumnarExporter(self.path) as exporter:
+            written = exporter.write_batch_results(
+                [
+                    BatchItemResult(0, "猫", _morphology("猫")),
+                    BatchItemResult(1, "", error=ValueError()),
+                ]
+            )
+
+        self.assertEqual(written, 1)
+        self.assertEqual(ColumnarReader(self.path).get_row_count("records"), 1)
+
+    def test_reads_empty_table(self) -> None:
+        ColumnarExporter(self.path).close()
+
+        column = ColumnarReader(self.path).read_column("keywords", "score")
+
+        self.assertEqual((column.dtype, len(column)), (np.float64, 0))
+
+    def test_raises_TypeError_on_unsupported_result(self) -> None:
+        with self.assertRaises(TypeError):
+            ColumnarExporter(self.path).write("猫")
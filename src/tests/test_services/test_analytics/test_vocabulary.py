@@ -0,0 +1,91 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from services.analytics import (
+    ColumnarExporter,
+    ColumnarReader,
+    ScriptRatios,
+    TokenTable,
+    build_vocabulary_report,
+    count_forms,
+    count_readings,
+    get_pos_distribution,
+    get_script_ratios,
+    get_script_ratios_per_group,
+)
+from services.goolabs import AnalyzedMorpheme, AnalyzedMorphology, PartOfSpeechType
+
+
+def _morphology(*morphemes: tuple[str, PartOfSpeechType, str]) -> AnalyzedMorphology:
+    return AnalyzedMorphology(
+        [[AnalyzedMorpheme(form, pos, read) for form, pos, read in morphemes]], [], []
+    )
+
+
+NOUN = PartOfSpeechType.NOUN
+VERB_STEM = PartOfSpeechType.VERB_STEM
+MORPHOLOGIES = [
+    ("guild1", _morphology(("猫", NOUN, "ねこ"), ("見", VERB_STEM, "み"))),
+    ("guild2", _morphology(("猫", NOUN, "ねこ"), ("いぬ", NOUN, "いぬ"))),
+    (None, _morphology(("ABC", NOUN, None))),
+]
+
+
+class TestVocabularyStatistics(TestCase):
+    def setUp(self) -> None:
+        self.tokens = TokenTable.from_morphologies(MORPHOLOGIES)
+
+    def test_count_forms(self) -> None:
+        self.assertEqual(
+            count_forms(self.tokens), [("猫", 2), ("見", 1), ("いぬ", 1), ("ABC", 1)]
+        )
+        self.assertEqual(count_forms(self.tokens, "guild2", top=1), [("猫", 1)])
+        self.assertEqual(count_forms(self.tokens, "unknown"), [])
+
+    def test_count_readings_skips_missing_readings(self) -> None:
+        self.assertEqual(
+            count_readings(self.tokens), [("ねこ", 2), ("み", 1), ("いぬ", 1)]
+        )
+
+    def test_get_pos_distribution(self) -> None:
+        self.assertEqual(
+            get_pos_distribution(self.tokens, "guild1"),
+            {NOUN.value: 0.5, VERB_STEM.value: 0.5},
+        )
+
+    def test_get_script_ratios(self) -> None:
+        self.assertEqual(
+            get_script_ratios(self.tokens, "guild2"), ScriptRatios(1 / 3, 2 / 3)
+        )
+
+    def test_get_script_ratios_per_group(self) -> None:
+        self.assertEqual(
+            get_script_ratios_per_group(self.tokens),
+            {
+                None: ScriptRatios(0.0, 0.0),
+                "guild1": ScriptRatios(1.0, 0.0),
+                "guild2": ScriptRatios(1 / 3, 2 / 3),
+            },
+        )
+
+    def test_build_vocabulary_report(self) -> None:
+        report = build_vocabulary_report(self.tokens, "guild1", top=1)
+
+        self.assertEqual(
+            (report.morpheme_count, report.distinct_form_count, report.top_forms),
+            (2, 2, [("猫", 1)]),
+        )
+
+    def test_from_columnar_reads_the_same_tokens(self) -> None:
+        with TemporaryDirectory() as path:
+            with ColumnarExporter(path, row_group_size=2) as exporter:
+                for group, morphology in MORPHOLOGIES:
+                    exporter.write(morphology, group)
+
+            tokens = TokenTable.from_columnar(ColumnarReader(path))
+
+            self.assertEqual(count_forms(tokens), count_forms(self.tokens))
+            self.assertEqual(
+                get_script_ratios_per_group(tokens),
+                get_script_ratios_per_group(self.tokens),
+            )
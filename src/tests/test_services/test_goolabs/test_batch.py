@@ -0,0 +1,75 @@
+from threading import Barrier, Event, Lock
+from unittest import TestCase
+
+from services.goolabs.batch import run_batch
+
+
+class TestRunBatch(TestCase):
+    def test_yields_results_in_the_order_of_items(self) -> None:
+        results = list(run_batch(lambda item: item * 2, range(10), concurrency=3))
+
+        self.assertEqual([result.index for result in results], list(range(10)))
+        self.assertEqual([result.result for result in results], list(range(0, 20, 2)))
+
+    def test_yields_results_as_completed(self) -> None:
+        first_item_can_finish = Event()
+
+        def function(item: int) -> int:
+            if item == 0:
+                first_item_can_finish.wait(5)
+            return item
+
+        results = run_batch(function, range(2), concurrency=2, ordered=False)
+        first_result = next(results)
+        first_item_can_finish.set()
+
+        self.assertEqual(first_result.index, 1)
+        self.assertEqual([result.index for result in results], [0])
+
+    def test_captures_exceptions_per_item(self) -> None:
+        def function(item: int) -> int:
+            if item == 1:
+                raise ValueError(item)
+            return item
+
+        results = list(run_batch(function, range(3), concurrency=2))
+
+        self.assertEqual([result.result for result in results], [0, None, 2])
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual(results[1].item, 1)
+
+    def test_limits_the_number_of_concurrent_calls(self) -> None:
+        lock = Lock()
+        # Calls wait for each other, so they overlap as much as the limit allows
+        barrier = Barrier(2, timeout=5)
+        running = max_running = 0
+
+        def function(item: int) -> int:
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            barrier.wait()
+            with lock:
+                running -= 1
+            return item
+
+        results = list(run_batch(function, range(50), concurrency=2))
+
+        self.assertEqual([result.error for result in results], [None] * 50)
+        self.assertEqual(max_running, 2)
+
+    def test_consumes_items_lazily(self) -> None:
+        consumed = []
+
+        def items():
+            for item in range(100):
+                consumed.append(item)
+                yield item
+
+        results = run_batch(lambda item: item, items(), concurrency=2)
+        next(results)
+
+        self.assertLessEqual(len(consumed), 5)
+        results.close()
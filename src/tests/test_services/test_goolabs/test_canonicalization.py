@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from services.goolabs.canonicalization import Canonicalizer
+
+
+class TestCanonicalizer(TestCase):
+    def test_unifies_spaces(self) -> None:
+        self.assertEqual(Canonicalizer()("今日は　晴れ です"), "今日は 晴れ です")
+
+    def test_keeps_line_breaks(self) -> None:
+        self.assertEqual(
+            Canonicalizer()("今日は晴れ。\n明日は雨。"), "今日は晴れ。\n明日は雨。"
+        )
+
+    def test_strips_trailing_whitespace_of_lines_and_text(self) -> None:
+        self.assertEqual(
+            Canonicalizer()("今日は晴れ。 　\n明日は雨。\t\n\n"),
+            "今日は晴れ。\n明日は雨。",
+        )
+
+    def test_strips_prefix_residue(self) -> None:
+        self.assertEqual(Canonicalizer()("！!今日は晴れ！"), "今日は晴れ！")
+
+    def test_applies_nfkc_only_when_enabled(self) -> None:
+        self.assertEqual(Canonicalizer()("ＡＢＣ１２３ｶﾀｶﾅ"), "ＡＢＣ１２３ｶﾀｶﾅ")
+        self.assertEqual(Canonicalizer(nfkc=True)("ＡＢＣ１２３ｶﾀｶﾅ"), "ABC123カタカナ")
+
+    def test_keeps_text_when_everything_is_disabled(self) -> None:
+        canonicalizer = Canonicalizer(
+            unify_spaces=False,
+            strip_trailing_whitespace=False,
+            strip_prefix_residue=False,
+        )
+
+        self.assertEqual(canonicalizer("！今日は　晴れ "), "！今日は　晴れ ")
@@ -0,0 +1,138 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from services.goolabs import GoolabsService
+from services.goolabs.cli import main
+
+
+def _fake_hiragana_response(sentence: str, output_type: str) -> dict:
+    if sentence == "crash":
+        raise KeyboardInterrupt
+    return {
+        "converted": sentence,
+        "output_type": output_type,
+        "request_id": "labs.goo.ne.jp\t1654093329\t0",
+    }
+
+
+class TestCli(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, "input.jsonl")
+        self.output_path = os.path.join(self.directory.name, "output.jsonl")
+        self.checkpoint_path = os.path.join(self.directory.name, "checkpoint.json")
+        self.service = GoolabsService(None, MagicMock)
+        self.service.api.hiragana.side_effect = _fake_hiragana_response
+        patcher = patch(
+            "services.goolabs.cli.GoolabsService", return_value=self.service
+        )
+        self.service_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def _write_input(self, lines: list) -> None:
+        with open(self.input_path, "w", encoding="utf-8") as file:
+            for line in lines:
+                file.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    def _read_output(self) -> list[dict]:
+        with open(self.output_path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def _run(self, *args: str) -> None:
+        main(
+            [
+                "convert_to_furigana",
+                "-i",
+                self.input_path,
+                "-o",
+                self.output_path,
+                *args,
+            ]
+        )
+
+    def test_writes_results_and_errors_in_order(self) -> None:
+        self._write_input(["ねこ", {"sentence": "いぬ", "output_type": "katakana"}, ""])
+
+        self._run("-c", "2")
+
+        self.assertEqual(
+            self._read_output(),
+            [
+                {
+                    "index": 0,
+                    "input": "ねこ",
+                    "result": {"text": "ねこ", "kana_type": "hiragana"},
+                },
+                {
+                    "index": 1,
+                    "input": {"sentence": "いぬ", "output_type": "katakana"},
+                    "result": {"text": "いぬ", "kana_type": "katakana"},
+                },
+                {
+                    "index": 2,
+                    "input": "",
+                    "error": {
+                        "type": "InvalidArgsForGoolabsRequestError",
+                        "message": "Parameter 'sentence' with parameter_value='' "
+                        "is not a non-empty string",
+                    },
+                },
+            ],
+        )
+
+    def test_resumes_from_the_checkpoint(self) -> None:
+        self._write_input(["あ", "い", "crash", "え", "お"])
+        with self.assertRaises(KeyboardInterrupt):
+            self._run(
+                "-c",
+                "1",
+                "--checkpoint",
+                self.checkpoint_path,
+                "--checkpoint-every",
+                "1",
+            )
+
+        self._write_input(["あ", "い", "う", "え", "お"])
+        self.service.api.hiragana.reset_mock()
+        self._run("--checkpoint", self.checkpoint_path)
+
+        self.assertEqual(
+            [line["input"] for line in self._read_output()],
+            ["あ", "い", "う", "え", "お"],
+        )
+        self.assertNotIn(
+            "あ",
+            [
+                call.kwargs["sentence"]
+                for call in self.service.api.hiragana.call_args_list
+            ],
+        )
+
+    def test_starts_over_if_the_output_of_the_checkpoint_is_missing(self) -> None:
+        self._write_input(["あ", "い"])
+        with open(self.checkpoint_path, "w", encoding="utf-8") as file:
+            json.dump({"completed": 1, "output_size": 100}, file)
+
+        self._run("--checkpoint", self.checkpoint_path)
+
+        self.assertEqual([line["input"] for line in self._read_output()], ["あ", "い"])
+
+    def test_applies_cache_size_to_every_cache(self) -> None:
+        self._write_input(["あ"])
+
+        self._run("--cache-size", "7")
+
+        kwargs = self.service_class.call_args.kwargs
+        self.assertEqual(
+            {name: value for name, value in kwargs.items() if "cache" in name},
+            {
+                "chrono_cache_size": 7,
+                "morph_sentence_cache_size": 7,
+                "similarity_cache_size": 7,
+                "keyword_cache_size": 7,
+            },
+        )
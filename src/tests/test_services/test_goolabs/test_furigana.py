@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from services.goolabs import KanaType
+from services.goolabs.furigana import PHRASE, join_readings, to_kana
+
+
+class TestFurigana(TestCase):
+    def test_to_kana(self) -> None:
+        self.assertEqual(to_kana("ニホンゴを", KanaType.HIRAGANA), "にほんごを")
+        self.assertEqual(to_kana("にほんごヲ", KanaType.KATAKANA), "ニホンゴヲ")
+
+    def test_join_readings_separates_phrases(self) -> None:
+        self.assertEqual(
+            join_readings(
+                [
+                    ("カンジ", "名詞"),
+                    ("ガ", "格助詞"),
+                    ("ベンキョウ", "名詞"),
+                    ("シ", "動詞語幹"),
+                    ("マス", "動詞接尾辞"),
+                    ("。", "句点"),
+                ],
+                KanaType.HIRAGANA,
+            ),
+            "かんじが べんきょうします。",
+        )
+
+    def test_join_readings_keeps_prefixes_and_compounds_together(self) -> None:
+        self.assertEqual(
+            join_readings(
+                [
+                    ("オ", "冠名詞"),
+                    ("チャ", "名詞"),
+                    ("ノ", "格助詞"),
+                    ("ニホン", "名詞"),
+                    ("ゴ", "名詞"),
+                ],
+                KanaType.KATAKANA,
+            ),
+            "オチャノ ニホンゴ",
+        )
+
+    def test_join_readings_separates_converted_phrases(self) -> None:
+        self.assertEqual(
+            join_readings(
+                [
+                    ("ねこ", "名詞"),
+                    ("が", "格助詞"),
+                    ("すき です", PHRASE),
+                    ("。", "句点"),
+                ],
+                KanaType.HIRAGANA,
+            ),
+            "ねこが すき です。",
+        )
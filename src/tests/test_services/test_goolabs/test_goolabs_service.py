@@ -1,4 +1,6 @@
-from datetime import date
+from datetime import date, timedelta
+from math import isnan
+from tempfile import TemporaryDirectory
 
 from unittest import TestCase
 from unittest.mock import MagicMock
@@ -7,6 +9,8 @@ from services.exceptions import (
     UnexpectedGoolabsAPIResponseError,
     InvalidArgsForGoolabsRequestError,
 )
+from services.goolabs.reading_dictionary import ReadingDictionary
+from services.goolabs.sentences import split_sentences
 from services.goolabs import (
     GoolabsService,
     GoolabsDatetime,
@@ -4817,3 +4821,584 @@ class TestGoolabsService(TestCase):
             self.service.calculate_similarity(
                 "高橋さんはアメリカに出張に行きました。", "山田さんはイギリスに留学している。"
             )
+
+
+class TestGoolabsServiceChronoCache(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(
+            None, MagicMock, chrono_cache_granularity=timedelta(days=1)
+        )
+        self.service.api.chrono.return_value = {
+            "datetime_list": [["今日", "2022-06-02"]],
+            "doc_time": "2022-06-02T00:00:00",
+            "request_id": "labs.goo.ne.jp\t1654101868\t0",
+        }
+
+    def test_normalize_times_anchors_omitted_doc_time_to_the_bucket_start(
+        self,
+    ) -> None:
+        self.service.normalize_times("今日は晴れ")
+
+        doc_time = self.service.api.chrono.call_args.kwargs["doc_time"]
+        self.assertTrue(doc_time.endswith("T00:00:00"))
+
+    def test_normalize_times_reuses_result_within_the_bucket(self) -> None:
+        first = self.service.normalize_times("今日は晴れ")
+        second = self.service.normalize_times("今日は晴れ")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.service.api.chrono.call_count, 1)
+
+    def test_normalize_times_caches_results_for_passed_doc_time(self) -> None:
+        self.service.normalize_times("今日は晴れ", "2022-06-02T09:00:00")
+        self.service.normalize_times("今日は晴れ", "2022-06-02T09:00:00")
+        self.service.normalize_times("今日は晴れ", "2022-06-02T10:00:00")
+
+        self.assertEqual(self.service.api.chrono.call_count, 2)
+        self.assertEqual(
+            self.service.api.chrono.call_args.kwargs["doc_time"], "2022-06-02T10:00:00"
+        )
+
+    def test_normalize_times_does_not_cache_when_granularity_is_not_set(
+        self,
+    ) -> None:
+        service = GoolabsService(None, MagicMock)
+        service.api.chrono.return_value = self.service.api.chrono.return_value
+
+        service.normalize_times("今日は晴れ")
+        service.normalize_times("今日は晴れ")
+
+        self.assertIsNone(service.api.chrono.call_args.kwargs["doc_time"])
+        self.assertEqual(service.api.chrono.call_count, 2)
+
+
+class TestGoolabsServicePrefilters(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(None, MagicMock, enable_prefilters=True)
+
+    def test_normalize_times_returns_empty_result_without_request(self) -> None:
+        self.assertEqual(
+            self.service.normalize_times("？？？", "2022-06-02T09:00:00"),
+            NormalizedTimes([], GoolabsDatetime(2022, 6, 2, 9, 0)),
+        )
+        self.service.api.chrono.assert_not_called()
+
+    def test_extract_named_entities_returns_empty_result_without_request(
+        self,
+    ) -> None:
+        self.assertEqual(
+            self.service.extract_named_entities("？？？", "ORG|PSN"),
+            ExtractedNamedEntities(
+                [], [NamedEntityType.ORGANIZATION_NAME, NamedEntityType.PERSON_NAME]
+            ),
+        )
+        self.service.api.entity.assert_not_called()
+
+    def test_extract_slot_values_returns_empty_result_without_request(self) -> None:
+        self.assertEqual(
+            self.service.extract_slot_values("？？？", ["name", "age"]),
+            ExtractedSlotValues(
+                [], None, None, None, None, [], [SlotType.NAME, SlotType.AGE]
+            ),
+        )
+        self.service.api.slot.assert_not_called()
+
+    def test_makes_request_for_sentence_with_possible_result(self) -> None:
+        self.service.api.entity.return_value = {
+            "ne_list": [["鈴木", "PSN"]],
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        self.assertEqual(
+            self.service.extract_named_entities("鈴木さん"),
+            ExtractedNamedEntities(
+                [NamedEntity("鈴木", NamedEntityType.PERSON_NAME)],
+                list(NamedEntityType),
+            ),
+        )
+        self.service.api.entity.assert_called_once()
+
+
+class TestGoolabsServiceCanonicalization(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(
+            None, MagicMock, chrono_cache_granularity=timedelta(days=1)
+        )
+
+    def test_sends_canonicalized_sentence(self) -> None:
+        self.service.api.entity.return_value = {
+            "ne_list": [],
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        self.service.extract_named_entities("！今日は晴れ \n")
+
+        self.assertEqual(
+            self.service.api.entity.call_args.kwargs["sentence"], "今日は晴れ"
+        )
+
+    def test_sends_sentence_echoed_by_hiragana_as_it_is(self) -> None:
+        self.service.api.hiragana.return_value = {
+            "converted": "！きょうは　はれ ",
+            "output_type": "hiragana",
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        self.service.convert_to_furigana("！今日は　晴れ ")
+
+        self.assertEqual(
+            self.service.api.hiragana.call_args.kwargs["sentence"], "！今日は　晴れ "
+        )
+
+    def test_sends_sentence_echoed_by_morph_as_it_is(self) -> None:
+        self.service.api.morph.return_value = {
+            "word_list": [[["！", "Symbol", "！"], ["　", "空白", "　"]]],
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        self.service.analyze_morphology("！\u3000")
+
+        self.assertEqual(self.service.api.morph.call_args.kwargs["sentence"], "！\u3000")
+
+    def test_reuses_cached_result_for_equivalent_sentences(self) -> None:
+        self.service.api.chrono.return_value = {
+            "datetime_list": [],
+            "doc_time": "2022-06-02T00:00:00",
+            "request_id": "labs.goo.ne.jp\t1654101868\t0",
+        }
+
+        self.service.normalize_times("今日は\u3000晴れ")
+        self.service.normalize_times("今日は 晴れ  ")
+
+        self.assertEqual(self.service.api.chrono.call_count, 1)
+
+    def test_raises_InvalidArgsForGoolabsRequestError_on_empty_canonicalized_sentence(
+        self,
+    ) -> None:
+        with self.assertRaises(InvalidArgsForGoolabsRequestError):
+            self.service.normalize_times("！\u3000 ")
+
+    def test_uses_passed_canonicalizers(self) -> None:
+        service = GoolabsService(None, MagicMock, canonicalizers={})
+        service.api.hiragana.return_value = {
+            "converted": "きょうは はれ",
+            "output_type": "hiragana",
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        service.convert_to_furigana("！今日は晴れ ")
+
+        self.assertEqual(
+            service.api.hiragana.call_args.kwargs["sentence"], "！今日は晴れ "
+        )
+
+
+def _fake_morph_response(sentence: str, **kwargs) -> dict:
+    # Analyzes every character as a separate morpheme
+    return {
+        "word_list": [
+            [
+                [form, "句点" if form == "。" else "名詞", form]
+                for form in segment
+                if not form.isspace()
+            ]
+            for segment in split_sentences(sentence)
+        ],
+        "request_id": "labs.goo.ne.jp\t1654093329\t0",
+    }
+
+
+class TestGoolabsServiceMorphSentenceCache(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(None, MagicMock, morph_sentence_cache_size=16)
+        self.service.api.morph.side_effect = _fake_morph_response
+
+    def test_analyze_morphology_requests_only_uncached_sentences(self) -> None:
+        self.service.analyze_morphology("猫だ。犬だ。")
+        result = self.service.analyze_morphology("鳥だ。犬だ。猫だ。")
+
+        self.assertEqual(self.service.api.morph.call_count, 2)
+        self.assertEqual(
+            self.service.api.morph.call_args.kwargs,
+            {"sentence": "鳥だ。", "info_filter": None, "pos_filter": None},
+        )
+        self.assertEqual(
+            ["".join(morpheme.form for morpheme in s) for s in result.word_list],
+            ["鳥だ。", "犬だ。", "猫だ。"],
+        )
+
+    def test_analyze_morphology_applies_filters_locally(self) -> None:
+        self.service.analyze_morphology("猫だ。")
+        result = self.service.analyze_morphology(
+            "猫だ。", info_filter="form|read", pos_filter="句点"
+        )
+
+        self.assertEqual(self.service.api.morph.call_count, 1)
+        self.assertEqual(
+            result,
+            AnalyzedMorphology(
+                [[AnalyzedMorpheme("。", None, "。")]],
+                [MorphemeInfoType.FORM, MorphemeInfoType.READ],
+                [PartOfSpeechType.FULL_STOP_PUNCTUATION_MARK],
+            ),
+        )
+
+    def test_analyze_morphology_falls_back_to_whole_request_on_unmatched_response(
+        self,
+    ) -> None:
+        self.service.api.morph.side_effect = [
+            {
+                "word_list": [[["猫だ。犬だ。", "名詞", "ネコダイヌダ"]]],
+                "request_id": "labs.goo.ne.jp\t1654093329\t0",
+            },
+            {
+                "word_list": [[["猫", "名詞", "ネコ"]]],
+                "pos_filter": "名詞",
+                "request_id": "labs.goo.ne.jp\t1654093329\t0",
+            },
+        ]
+
+        result = self.service.analyze_morphology("猫だ。犬だ。", pos_filter="名詞")
+
+        self.assertEqual(
+            self.service.api.morph.call_args.kwargs,
+            {"sentence": "猫だ。犬だ。", "info_filter": None, "pos_filter": "名詞"},
+        )
+        self.assertEqual(
+            result.word_list, [[AnalyzedMorpheme("猫", PartOfSpeechType.NOUN, "ネコ")]]
+        )
+        self.assertEqual(len(self.service.morph_sentence_cache), 0)
+
+
+class TestGoolabsServiceChunkedMorphology(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(None, MagicMock, morph_max_chunk_size=6)
+        self.service.api.morph.side_effect = _fake_morph_response
+
+    def test_analyze_morphology_splits_long_text_into_chunks(self) -> None:
+        result = self.service.analyze_morphology("猫だ。犬だ。鳥だ。魚だ。虫だ。")
+
+        self.assertEqual(
+            sorted(
+                call.kwargs["sentence"]
+                for call in self.service.api.morph.call_args_list
+            ),
+            ["猫だ。犬だ。", "虫だ。", "鳥だ。魚だ。"],
+        )
+        self.assertEqual(
+            ["".join(morpheme.form for morpheme in s) for s in result.word_list],
+            ["猫だ。", "犬だ。", "鳥だ。", "魚だ。", "虫だ。"],
+        )
+
+    def test_analyze_morphology_sends_short_text_in_one_request(self) -> None:
+        self.service.analyze_morphology("猫だ。犬だ。")
+
+        self.service.api.morph.assert_called_once_with(
+            sentence="猫だ。犬だ。", info_filter=None, pos_filter=None
+        )
+
+    def test_analyze_morphology_splits_uncached_sentences_into_chunks(self) -> None:
+        service = GoolabsService(
+            None, MagicMock, morph_sentence_cache_size=16, morph_max_chunk_size=6
+        )
+        service.api.morph.side_effect = _fake_morph_response
+
+        service.analyze_morphology("猫だ。")
+        result = service.analyze_morphology("犬だ。猫だ。鳥だ。魚だ。")
+
+        self.assertEqual(service.api.morph.call_count, 3)
+        self.assertEqual(
+            ["".join(morpheme.form for morpheme in s) for s in result.word_list],
+            ["犬だ。", "猫だ。", "鳥だ。", "魚だ。"],
+        )
+
+
+class TestGoolabsServiceBatch(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(None, MagicMock)
+        self.service.api.morph.side_effect = _fake_morph_response
+
+    def test_analyze_morphology_many_returns_results_in_order(self) -> None:
+        results = list(
+            self.service.analyze_morphology_many(["猫だ。", "犬だ。", "鳥だ。"])
+        )
+
+        self.assertEqual(
+            [result.item for result in results], ["猫だ。", "犬だ。", "鳥だ。"]
+        )
+        self.assertEqual(
+            [
+                "".join(morpheme.form for morpheme in result.result.word_list[0])
+                for result in results
+            ],
+            ["猫だ。", "犬だ。", "鳥だ。"],
+        )
+
+    def test_analyze_morphology_many_returns_errors_per_sentence(self) -> None:
+        results = list(self.service.analyze_morphology_many(["猫だ。", ""]))
+
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, InvalidArgsForGoolabsRequestError)
+
+    def test_convert_to_furigana_many_passes_output_type(self) -> None:
+        self.service.api.hiragana.return_value = {
+            "converted": "ねこ",
+            "output_type": "katakana",
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        results = list(
+            self.service.convert_to_furigana_many(["猫"], "katakana", concurrency=1)
+        )
+
+        self.service.api.hiragana.assert_called_once_with(
+            sentence="猫", output_type="katakana"
+        )
+        self.assertIsNone(results[0].error)
+
+
+def _fake_textpair_response(text1: str, text2: str) -> dict:
+    return {
+        "score": 0.5 if text1[0] == text2[0] else 0.1,
+        "request_id": "labs.goo.ne.jp\t1654093329\t0",
+    }
+
+
+class TestGoolabsServiceSimilarityMatrix(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(None, MagicMock)
+        self.service.api.textpair.side_effect = _fake_textpair_response
+
+    def test_calculate_similarity_matrix_requests_every_distinct_pair_once(
+        self,
+    ) -> None:
+        matrix = self.service.calculate_similarity_matrix(
+            ["猫です", "猫だ", "犬です", "猫です"]
+        )
+
+        self.assertEqual(self.service.api.textpair.call_count, 3)
+        self.assertEqual(matrix.texts, ["猫です", "猫だ", "犬です"])
+        self.assertEqual(matrix.get_score(0, 3), 1.0)
+        self.assertEqual(matrix.get_score(1, 3), 0.5)
+        self.assertEqual(matrix.get_score(2, 0), 0.1)
+
+    def test_calculate_similarity_matrix_skips_pairs_below_ngram_threshold(
+        self,
+    ) -> None:
+        matrix = self.service.calculate_similarity_matrix(
+            ["猫です", "犬です", "鳥だ"], ngram_threshold=0.3
+        )
+
+        self.service.api.textpair.assert_called_once_with(
+            text1="猫です", text2="犬です"
+        )
+        self.assertTrue(isnan(matrix.get_score(0, 2)))
+
+    def test_calculate_similarity_uses_scores_cached_by_matrix(self) -> None:
+        self.service.calculate_similarity_matrix(["猫です", "犬です"])
+
+        result = self.service.calculate_similarity("犬です", "猫です")
+
+        self.assertEqual(result, CalculatedSimilarity(0.1))
+        self.service.api.textpair.assert_called_once()
+
+    def test_raises_InvalidArgsForGoolabsRequestError_on_calculate_similarity_matrix_empty_text(
+        self,
+    ) -> None:
+        with self.assertRaises(InvalidArgsForGoolabsRequestError):
+            self.service.calculate_similarity_matrix(["猫です", ""])
+
+
+_LONG_TEXT = "今日は良い天気ですね。公園まで散歩に行って、帰りに駅前の喫茶店でコーヒーを飲みましょう。"
+_LONG_TEXT_VARIANT = "今日は良い天気ですね。公園まで散歩に行って、帰りに駅前の喫茶店でコーヒーを飲みましょうか。"
+
+
+class TestGoolabsServiceApproximateSimilarity(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(
+            None, MagicMock, approximate_similarity_index_size=16
+        )
+
+    def _set_score(self, score: float) -> None:
+        self.service.api.textpair.return_value = {
+            "score": score,
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+    def test_calculate_similarity_of_identical_texts_makes_no_request(self) -> None:
+        result = self.service.calculate_similarity("猫が好きです。", "猫が好きです。")
+
+        self.assertEqual(result, CalculatedSimilarity(1.0))
+        self.service.api.textpair.assert_not_called()
+
+    def test_calculate_similarity_reuses_extreme_score_of_near_duplicate(self) -> None:
+        self._set_score(0.01)
+        self.service.calculate_similarity(_LONG_TEXT, "猫が好きです。")
+
+        result = self.service.calculate_similarity(_LONG_TEXT_VARIANT, "猫が好きです。")
+
+        self.assertEqual(result, CalculatedSimilarity(0.01))
+        self.service.api.textpair.assert_called_once()
+
+    def test_indexes_texts_analyzed_by_every_method(self) -> None:
+        self.service.api.morph.return_value = {
+            "word_list": [[["猫", "名詞", "ネコ"]]],
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+        self.service.api.entity.return_value = {
+            "ne_list": [],
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        self.service.analyze_morphology("猫")
+        self.service.extract_named_entities("今日は　晴れ ")
+
+        self.assertIn("猫", self.service.approximate_similarity_index)
+        self.assertIn("今日は 晴れ", self.service.approximate_similarity_index)
+
+    def test_calculate_similarity_requests_near_duplicate_with_moderate_score(
+        self,
+    ) -> None:
+        self._set_score(0.5)
+        self.service.calculate_similarity(_LONG_TEXT, "猫が好きです。")
+
+        self.service.calculate_similarity(_LONG_TEXT_VARIANT, "猫が好きです。")
+
+        self.assertEqual(self.service.api.textpair.call_count, 2)
+
+
+def _fake_hiragana_response(sentence: str, output_type: str) -> dict:
+    return {
+        "converted": f"<{sentence}>",
+        "output_type": output_type,
+        "request_id": "labs.goo.ne.jp\t1654093329\t0",
+    }
+
+
+class TestGoolabsServiceLocalFurigana(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.service = GoolabsService(
+            None,
+            MagicMock,
+            reading_dictionary_path=self.directory.name,
+            reading_dictionary_save_every=100,
+        )
+        self.service.api.hiragana.side_effect = _fake_hiragana_response
+        self.service.api.morph.return_value = {
+            "word_list": [
+                [
+                    ["日本語", "名詞", "ニホンゴ"],
+                    ["を", "格助詞", "ヲ"],
+                    ["分析", "名詞", "ブンセキ"],
+                    ["し", "動詞語幹", "シ"],
+                    ["ます", "動詞接尾辞", "マス"],
+                ]
+            ],
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+        self.service.analyze_morphology("日本語を分析します")
+
+    def test_close_saves_the_reading_dictionary(self) -> None:
+        self.service.close()
+
+        self.assertEqual(self.service.reading_dictionary.save_every, 100)
+        self.assertEqual(
+            ReadingDictionary(self.directory.name).lookup("日本語"),
+            ("ニホンゴ", "名詞", 1.0),
+        )
+
+    def test_convert_to_furigana_of_known_text_makes_no_request(self) -> None:
+        result = self.service.convert_to_furigana("日本語を分析します", "katakana")
+
+        self.assertEqual(
+            result, ConvertedToFurigana("ニホンゴヲ ブンセキシマス", KanaType.KATAKANA)
+        )
+        self.service.api.hiragana.assert_not_called()
+
+    def test_convert_to_furigana_requests_only_the_unknown_span(self) -> None:
+        result = self.service.convert_to_furigana("日本語を勉強します")
+
+        self.service.api.hiragana.assert_called_once_with(
+            sentence="勉強", output_type="hiragana"
+        )
+        self.assertEqual(result.text, "にほんごを <勉強> します")
+
+    def test_convert_to_furigana_requests_the_sentence_with_several_unknown_spans(
+        self,
+    ) -> None:
+        result = self.service.convert_to_furigana("英語を勉強します")
+
+        self.service.api.hiragana.assert_called_once_with(
+            sentence="英語を勉強します", output_type="hiragana"
+        )
+        self.assertEqual(result.text, "<英語を勉強します>")
+
+
+class TestGoolabsServiceFuriganaFromMorphology(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(None, MagicMock, morph_sentence_cache_size=16)
+        self.service.api.morph.return_value = {
+            "word_list": [
+                [
+                    ["日本語", "名詞", "ニホンゴ"],
+                    ["を", "格助詞", "ヲ"],
+                    ["分析", "名詞", "ブンセキ"],
+                    ["し", "動詞語幹", "シ"],
+                    ["ます", "動詞接尾辞", "マス"],
+                    ["。", "句点", "。"],
+                ]
+            ],
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+        self.service.analyze_morphology("日本語を分析します。")
+
+    def test_convert_to_furigana_uses_cached_morphology(self) -> None:
+        result = self.service.convert_to_furigana("日本語を分析します。")
+
+        self.assertEqual(
+            result, ConvertedToFurigana("にほんごを ぶんせきします。", KanaType.HIRAGANA)
+        )
+        self.service.api.hiragana.assert_not_called()
+
+    def test_convert_to_furigana_requests_text_with_uncached_sentences(self) -> None:
+        self.service.api.hiragana.return_value = {
+            "converted": "にほんごを ぶんせきします。 ねこ",
+            "output_type": "hiragana",
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+        self.service.convert_to_furigana("日本語を分析します。猫")
+
+        self.service.api.hiragana.assert_called_once()
+
+
+class TestGoolabsServiceKeywordCache(TestCase):
+    def setUp(self) -> None:
+        self.service = GoolabsService(None, MagicMock)
+        self.service.api.keyword.side_effect = lambda **kwargs: {
+            "keywords": [{"天気": 0.5}],
+            **({"focus": kwargs["focus"]} if kwargs["focus"] else {}),
+            "request_id": "labs.goo.ne.jp\t1654093329\t0",
+        }
+
+    def test_extract_keywords_caches_identical_articles(self) -> None:
+        first = self.service.extract_keywords("天気", "今日は良い天気です。")
+        second = self.service.extract_keywords("天気", "今日は良い天気です。 ")
+
+        self.assertEqual(first, second)
+        self.service.api.keyword.assert_called_once()
+
+    def test_extract_keywords_keys_include_params(self) -> None:
+        self.service.extract_keywords("天気", "今日は良い天気です。")
+        self.service.extract_keywords("天気", "今日は良い天気です。", max_num=3)
+        self.service.extract_keywords("天気", "今日は良い天気です。", focus="LOC")
+
+        self.assertEqual(self.service.api.keyword.call_count, 3)
+
+    def test_extract_keywords_keys_separate_title_and_body(self) -> None:
+        self.service.extract_keywords("天気", "今日は")
+        self.service.extract_keywords("天気今日", "は")
+
+        self.assertEqual(self.service.api.keyword.call_count, 2)
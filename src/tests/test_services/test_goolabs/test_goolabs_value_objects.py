@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+from unittest import TestCase
+
+from services.goolabs import GoolabsDatetime
+
+
+class TestGoolabsDatetime(TestCase):
+    def test_from_goolabs_format_processes_year(self) -> None:
+        dt = GoolabsDatetime.from_goolabs_format("2015")
+
+        self.assertEqual(dt, GoolabsDatetime(2015, 1, 1))
+        self.assertFalse(dt.is_month_set)
+        self.assertFalse(dt.is_day_set)
+        self.assertEqual(dt.to_goolabs_format(), "2015")
+
+    def test_from_goolabs_format_processes_year_and_month(self) -> None:
+        dt = GoolabsDatetime.from_goolabs_format("2022-06")
+
+        self.assertEqual(dt, GoolabsDatetime(2022, 6, 1))
+        self.assertTrue(dt.is_month_set)
+        self.assertFalse(dt.is_day_set)
+        self.assertEqual(dt.to_goolabs_format(), "2022-6")
+
+    def test_from_goolabs_format_processes_full_timestamp(self) -> None:
+        dt = GoolabsDatetime.from_goolabs_format("2016-04-01T10:30")
+
+        self.assertEqual(dt, GoolabsDatetime(2016, 4, 1, 10, 30))
+        self.assertTrue(dt.is_month_set)
+        self.assertTrue(dt.is_day_set)
+        self.assertEqual(dt.to_goolabs_format(), "2016-04-01T10:30:00")
+
+    def test_from_goolabs_format_keeps_timezone(self) -> None:
+        dt = GoolabsDatetime.from_goolabs_format("2016-04-01T10:30:00+09:00")
+
+        self.assertEqual(
+            dt, datetime(2016, 4, 1, 10, 30, tzinfo=timezone(timedelta(hours=9)))
+        )
+
+    def test_from_goolabs_format_returns_new_instances_for_memoized_strings(
+        self,
+    ) -> None:
+        first = GoolabsDatetime.from_goolabs_format("2022-06")
+        first.is_month_set = False
+        second = GoolabsDatetime.from_goolabs_format("2022-06")
+
+        self.assertIsNot(first, second)
+        self.assertTrue(second.is_month_set)
+
+    def test_raises_ValueError_on_from_goolabs_format_incorrect_formats(self) -> None:
+        for date_string in ("incorrect", "", "2016-", "2016-13", "0", "2016-04-"):
+            with self.subTest(date_string=date_string):
+                with self.assertRaises(ValueError):
+                    GoolabsDatetime.from_goolabs_format(date_string)
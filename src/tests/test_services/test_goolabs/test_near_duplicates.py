@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from services.goolabs.near_duplicates import MinHashLSHIndex
+
+
+class TestMinHashLSHIndex(TestCase):
+    def setUp(self) -> None:
+        self.index = MinHashLSHIndex(2)
+
+    def test_finds_the_same_text_with_similarity_one(self) -> None:
+        self.index.insert("今日は良い天気ですね。")
+
+        self.assertEqual(
+            self.index.find_near_duplicates("今日は良い天気ですね。", 0.9),
+            [("今日は良い天気ですね。", 1.0)],
+        )
+
+    def test_finds_near_duplicates_above_threshold(self) -> None:
+        self.index.insert("今日は良い天気ですね。")
+        self.index.insert("猫が好きです。")
+
+        near_duplicates = self.index.find_near_duplicates("今日は良い天気ですね！", 0.5)
+
+        self.assertEqual(
+            [text for text, _ in near_duplicates], ["今日は良い天気ですね。"]
+        )
+        self.assertLess(near_duplicates[0][1], 1.0)
+
+    def test_does_not_find_dissimilar_texts(self) -> None:
+        self.index.insert("今日は良い天気ですね。")
+
+        self.assertEqual(self.index.find_near_duplicates("猫が好きです。", 0.5), [])
+
+    def test_evicts_the_least_recently_used_text(self) -> None:
+        self.index.insert("今日は良い天気ですね。")
+        self.index.insert("猫が好きです。")
+        self.index.find_near_duplicates("今日は良い天気ですね。", 0.9)
+
+        self.index.insert("明日は雨が降るでしょう。")
+
+        self.assertEqual(len(self.index), 2)
+        self.assertNotIn("猫が好きです。", self.index)
+        self.assertEqual(self.index.find_near_duplicates("猫が好きです。", 0.5), [])
+
+    def test_signatures_do_not_depend_on_the_index(self) -> None:
+        self.assertEqual(
+            MinHashLSHIndex().get_signature("猫が好きです。"),
+            self.index.get_signature("猫が好きです。"),
+        )
+
+    def test_raises_ValueError_on_permutations_not_divisible_by_bands(self) -> None:
+        with self.assertRaises(ValueError):
+            MinHashLSHIndex(num_permutations=10, bands=4)
@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+from services.goolabs.prefilters import GoolabsPrefilter
+
+# Sentences the API may build a non-empty result from, must never be skipped
+CHRONO_SENTENCES = (
+    "今日の10時半に出かけます。",
+    "昨日は9時43分に起床",
+    "六月",
+    "平成27年",
+    "明治4年2月6日に生まれました。",
+    "鈴木さんがきょうの9時30分に横浜に行きます。",
+    "きょうはあめ",
+    "あしたあいましょう",
+    "おとといのよる",
+    "ごご３じ",
+    "クリスマスにあおう",
+    "いまいく",
+    "はるがきた",
+    "なつやすみ",
+    "あきのよる",
+    "ふゆになった",
+    "げつようびにあおう",
+    "おととしのこと",
+    "さらいねん",
+    "しゅうまつにいく",
+    "Monday",
+)
+ENTITY_SENTENCES = (
+    *CHRONO_SENTENCES,
+    "全世界の人々が平和を切望している。",
+    "グーグル",
+    "Google",
+    "ＮＨＫ",
+    "ｸﾞｰｸﾞﾙ",
+    "さくらちゃんとあそぶ",
+    "100えんです",
+)
+SLOT_SENTENCES = (
+    "名前は田中太郎で、男性で、30歳です。港区芝浦3-4-1に住んでいます。",
+    "私の電話番号は(03)1234-5678です",
+    "私は2002年10月12日に生まれました",
+    "たなかさんです",
+    "おとこです",
+    "はたちです",
+    "にじゅうさいです",
+    "Taro",
+)
+# Sentences none of the APIs can build a non-empty result from
+EMPTY_SENTENCES = (
+    "？？？",
+    "!!",
+    "……",
+    "👍👍",
+)
+
+
+class TestGoolabsPrefilter(TestCase):
+    def setUp(self) -> None:
+        self.prefilter = GoolabsPrefilter()
+
+    def test_does_not_skip_sentences_with_possible_times(self) -> None:
+        for sentence in CHRONO_SENTENCES:
+            with self.subTest(sentence=sentence):
+                self.assertFalse(self.prefilter.can_skip("chrono", sentence))
+
+    def test_does_not_skip_sentences_with_possible_named_entities(self) -> None:
+        for sentence in ENTITY_SENTENCES:
+            with self.subTest(sentence=sentence):
+                self.assertFalse(self.prefilter.can_skip("entity", sentence))
+
+    def test_does_not_skip_sentences_with_possible_slot_values(self) -> None:
+        for sentence in SLOT_SENTENCES:
+            with self.subTest(sentence=sentence):
+                self.assertFalse(self.prefilter.can_skip("slot", sentence))
+
+    def test_skips_sentences_without_anything_to_extract(self) -> None:
+        for api_name in GoolabsPrefilter.API_NAMES:
+            for sentence in EMPTY_SENTENCES:
+                with self.subTest(api_name=api_name, sentence=sentence):
+                    self.assertTrue(self.prefilter.can_skip(api_name, sentence))
+
+    def test_skips_sentences_without_times_for_chrono(self) -> None:
+        for sentence in ("東京都", "漢字検定", "！？"):
+            with self.subTest(sentence=sentence):
+                self.assertTrue(self.prefilter.can_skip("chrono", sentence))
+
+    def test_counts_hit_rate(self) -> None:
+        self.prefilter.can_skip("entity", "？？？")
+        self.prefilter.can_skip("entity", "グーグル")
+        self.prefilter.can_skip("entity", "!!")
+        self.prefilter.can_skip("entity", "Google")
+
+        stats = self.prefilter.stats["entity"]
+        self.assertEqual((stats.checked, stats.skipped), (4, 2))
+        self.assertEqual(stats.hit_rate, 0.5)
+        self.assertEqual(self.prefilter.stats["chrono"].hit_rate, 0.0)
@@ -0,0 +1,118 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from services.goolabs import AnalyzedMorpheme, PartOfSpeechType
+from services.goolabs.reading_dictionary import ReadingDictionary, ReadingToken
+
+
+class TestReadingDictionary(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.dictionary = ReadingDictionary(self.directory.name)
+        for form, reading in (
+            ("今日", "キョウ"),
+            ("今日", "キョウ"),
+            ("今日", "コンニチ"),
+            ("日本", "ニホン"),
+            ("日本語", "ニホンゴ"),
+            ("を", "ヲ"),
+        ):
+            self.dictionary.observe(form, reading, "名詞")
+
+    def test_lookup_returns_the_most_frequent_reading_with_confidence(self) -> None:
+        self.assertEqual(self.dictionary.lookup("今日"), ("キョウ", "名詞", 2 / 3))
+        self.assertIsNone(self.dictionary.lookup("明日"))
+
+    def test_observe_sentences_skips_morphemes_without_readings(self) -> None:
+        self.dictionary.observe_sentences(
+            [
+                [
+                    AnalyzedMorpheme("猫", PartOfSpeechType.NOUN, "ネコ"),
+                    AnalyzedMorpheme("犬", PartOfSpeechType.NOUN, None),
+                ]
+            ]
+        )
+
+        self.assertEqual(self.dictionary.lookup("猫"), ("ネコ", "名詞", 1.0))
+        self.assertIsNone(self.dictionary.lookup("犬"))
+
+    def test_segment_uses_the_longest_known_forms(self) -> None:
+        self.assertEqual(
+            self.dictionary.segment("日本語を 今日は勉", 0.9),
+            [
+                ReadingToken("日本語", "ニホンゴ", "名詞"),
+                ReadingToken("を", "ヲ", "名詞"),
+                ReadingToken("今日", None, "名詞"),
+                ReadingToken("は", "は", None),
+                ReadingToken("勉", None, None),
+            ],
+        )
+
+    def test_saved_snapshot_is_merged_with_new_observations(self) -> None:
+        self.dictionary.save()
+        dictionary = ReadingDictionary(self.directory.name)
+        dictionary.observe("今日", "キョウ")
+        dictionary.observe("猫", "ネコ")
+
+        self.assertEqual(dictionary.lookup("今日"), ("キョウ", "名詞", 3 / 4))
+        self.assertEqual(dictionary.lookup("日本語"), ("ニホンゴ", "名詞", 1.0))
+        self.assertEqual(len(dictionary), 5)
+
+    def test_save_replaces_the_previous_generation(self) -> None:
+        self.dictionary.save()
+        self.dictionary.observe("猫", "ネコ")
+        self.dictionary.save()
+
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["2", "current.json"])
+        self.assertEqual(
+            ReadingDictionary(self.directory.name).lookup("猫"), ("ネコ", None, 1.0)
+        )
+
+    def test_saves_automatically_every_n_observations_in_background(self) -> None:
+        with TemporaryDirectory() as path:
+            dictionary = ReadingDictionary(path, save_every=2)
+            dictionary.observe("猫", "ネコ")
+            self.assertIsNone(dictionary._saving_thread)
+
+            dictionary.observe("犬", "イヌ")
+            dictionary._saving_thread.join()
+            self.assertEqual(ReadingDictionary(path).lookup("猫"), ("ネコ", None, 1.0))
+
+    def test_observations_made_while_saving_are_kept_for_the_next_save(self) -> None:
+        merge_rows = self.dictionary._merge_rows
+        readings_while_saving = []
+
+        def observe_while_saving(*args):
+            self.dictionary.observe("猫", "ネコ")
+            readings_while_saving.append(self.dictionary.lookup("日本"))
+            return merge_rows(*args)
+
+        with patch.object(self.dictionary, "_merge_rows", observe_while_saving):
+            self.dictionary.save()
+
+        self.assertEqual(readings_while_saving, [("ニホン", "名詞", 1.0)])
+        self.assertEqual(self.dictionary.lookup("猫"), ("ネコ", None, 1.0))
+        self.assertIsNone(ReadingDictionary(self.directory.name).lookup("猫"))
+
+    def test_failed_save_keeps_observations_for_the_next_save(self) -> None:
+        with patch.object(self.dictionary, "_write_snapshot", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.dictionary.save()
+
+        self.assertEqual(self.dictionary.lookup("今日"), ("キョウ", "名詞", 2 / 3))
+        self.dictionary.save()
+        self.assertEqual(
+            ReadingDictionary(self.directory.name).lookup("今日"),
+            ("キョウ", "名詞", 2 / 3),
+        )
+
+    def test_close_saves_remaining_observations(self) -> None:
+        self.dictionary.close()
+
+        self.assertEqual(
+            ReadingDictionary(self.directory.name).lookup("日本"),
+            ("ニホン", "名詞", 1.0),
+        )
@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+from services.goolabs import AnalyzedMorpheme, PartOfSpeechType
+from services.goolabs.sentences import (
+    split_sentences,
+    group_segments_into_chunks,
+    assign_analyzed_sentences_to_segments,
+)
+
+
+def _analyzed_sentence(text: str) -> list[AnalyzedMorpheme]:
+    return [AnalyzedMorpheme(form, PartOfSpeechType.NOUN, form) for form in text]
+
+
+class TestSplitSentences(TestCase):
+    def test_splits_on_terminal_punctuation_and_line_breaks(self) -> None:
+        self.assertEqual(
+            split_sentences("今日は晴れ。明日は雨！\n本当？「はい。」と言った\n\nまた"),
+            [
+                "今日は晴れ。",
+                "明日は雨！\n",
+                "本当？",
+                "「はい。」",
+                "と言った\n\n",
+                "また",
+            ],
+        )
+
+    def test_segments_concatenate_back_to_the_text(self) -> None:
+        for text in ("", "。。", "\n\n今日\n", "今日は晴れ。 明日は雨。 ", "!?!?"):
+            with self.subTest(text=text):
+                self.assertEqual("".join(split_sentences(text)), text)
+
+
+class TestGroupSegmentsIntoChunks(TestCase):
+    def test_groups_segments_not_exceeding_max_chunk_size(self) -> None:
+        self.assertEqual(
+            group_segments_into_chunks(["猫だ。", "犬だ。", "鳥だ。"], 6),
+            [["猫だ。", "犬だ。"], ["鳥だ。"]],
+        )
+
+    def test_puts_long_segment_into_separate_chunk(self) -> None:
+        self.assertEqual(
+            group_segments_into_chunks(["猫だ。", "とても長い文だ。", "犬だ。"], 6),
+            [["猫だ。"], ["とても長い文だ。"], ["犬だ。"]],
+        )
+
+    def test_returns_one_chunk_without_max_chunk_size(self) -> None:
+        self.assertEqual(
+            group_segments_into_chunks(["猫だ。", "犬だ。"], None),
+            [["猫だ。", "犬だ。"]],
+        )
+        self.assertEqual(group_segments_into_chunks([], None), [])
+
+
+class TestAssignAnalyzedSentencesToSegments(TestCase):
+    def test_assigns_sentences_to_segments(self) -> None:
+        word_list = [
+            _analyzed_sentence("今日は晴れ。"),
+            _analyzed_sentence("明日は雨。"),
+        ]
+
+        self.assertEqual(
+            assign_analyzed_sentences_to_segments(
+                ["今日は晴れ。", "\n", "明日は雨。 "], word_list
+            ),
+            [[word_list[0]], [], [word_list[1]]],
+        )
+
+    def test_assigns_several_sentences_to_one_segment(self) -> None:
+        word_list = [_analyzed_sentence("「はい。"), _analyzed_sentence("」")]
+
+        self.assertEqual(
+            assign_analyzed_sentences_to_segments(["「はい。」"], word_list),
+            [word_list],
+        )
+
+    def test_returns_None_if_a_sentence_spans_several_segments(self) -> None:
+        self.assertIsNone(
+            assign_analyzed_sentences_to_segments(
+                ["今日は晴れ。", "明日は雨。"],
+                [_analyzed_sentence("今日は晴れ。明日は雨。")],
+            )
+        )
+
+    def test_returns_None_if_forms_do_not_match_segments(self) -> None:
+        self.assertIsNone(
+            assign_analyzed_sentences_to_segments(
+                ["今日は晴れ。"], [_analyzed_sentence("今日は雨。")]
+            )
+        )
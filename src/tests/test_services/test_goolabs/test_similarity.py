@@ -0,0 +1,41 @@
+from math import isnan
+from unittest import TestCase
+
+from services.goolabs.similarity import (
+    SimilarityMatrix,
+    get_character_ngrams,
+    calculate_ngram_similarity,
+    get_pair_key,
+)
+
+
+class TestSimilarityMatrix(TestCase):
+    def test_empty_matrix_has_ones_on_the_diagonal_and_nan_elsewhere(self) -> None:
+        matrix = SimilarityMatrix.empty(["a", "b"], [0, 1])
+
+        self.assertEqual(matrix.get_score(0, 0), 1.0)
+        self.assertTrue(isnan(matrix.get_score(0, 1)))
+
+    def test_set_score_is_symmetric(self) -> None:
+        matrix = SimilarityMatrix.empty(["a", "b", "c"], [0, 1, 2, 0])
+
+        matrix.set_score(0, 2, 0.5)
+
+        self.assertEqual(matrix.get_score(2, 0), 0.5)
+        self.assertEqual(matrix.get_score(3, 2), 0.5)
+        self.assertEqual(matrix.to_rows()[2][0], 0.5)
+
+
+class TestNgramSimilarity(TestCase):
+    def test_get_character_ngrams(self) -> None:
+        self.assertEqual(get_character_ngrams("猫です"), {"猫で", "です"})
+        self.assertEqual(get_character_ngrams("猫"), {"猫"})
+
+    def test_calculate_ngram_similarity(self) -> None:
+        self.assertEqual(
+            calculate_ngram_similarity({"猫で", "です"}, {"犬で", "です"}), 1 / 3
+        )
+        self.assertEqual(calculate_ngram_similarity(set(), {"です"}), 0.0)
+
+    def test_get_pair_key_does_not_depend_on_the_order(self) -> None:
+        self.assertEqual(get_pair_key("犬", "猫"), get_pair_key("猫", "犬"))
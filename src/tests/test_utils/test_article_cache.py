@@ -0,0 +1,108 @@
+import asyncio
+import os
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from utils.article_cache import ArticleCache
+from utils.article_fetcher import FetchedArticle
+
+_HEADERS = {"ETag": '"v1"', "Last-Modified": "Mon, 10 Oct 2022 00:00:00 GMT"}
+
+
+async def _extract(article: FetchedArticle) -> tuple[str, str]:
+    return "記事", article.content.decode()
+
+
+class TestArticleCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.now = 100.0
+        self.fetcher = MagicMock()
+        self.fetcher.fetch = AsyncMock(
+            return_value=FetchedArticle("http://a", "本文".encode(), headers=_HEADERS)
+        )
+        self.extract = AsyncMock(side_effect=_extract)
+        self.cache = ArticleCache(
+            max_bytes=1024, ttl=60, path=None, clock=lambda: self.now
+        )
+
+    async def test_reuses_fresh_article_without_fetching(self) -> None:
+        self.assertEqual(
+            await self.cache.load("http://a", self.fetcher, self.extract),
+            ("記事", "本文"),
+        )
+        self.assertEqual(
+            await self.cache.load("http://a", self.fetcher, self.extract),
+            ("記事", "本文"),
+        )
+
+        self.fetcher.fetch.assert_awaited_once_with("http://a", None)
+        self.extract.assert_called_once()
+
+    async def test_revalidates_stale_article(self) -> None:
+        await self.cache.load("http://a", self.fetcher, self.extract)
+        self.now += 61
+        self.fetcher.fetch.return_value = FetchedArticle("http://a", b"", status=304)
+
+        self.assertEqual(
+            await self.cache.load("http://a", self.fetcher, self.extract),
+            ("記事", "本文"),
+        )
+        self.fetcher.fetch.assert_awaited_with(
+            "http://a",
+            {
+                "If-None-Match": '"v1"',
+                "If-Modified-Since": "Mon, 10 Oct 2022 00:00:00 GMT",
+            },
+        )
+        self.extract.assert_called_once()
+        self.assertTrue(self.cache.is_fresh(self.cache.get("http://a")))
+
+    async def test_replaces_modified_article(self) -> None:
+        await self.cache.load("http://a", self.fetcher, self.extract)
+        self.now += 61
+        self.fetcher.fetch.return_value = FetchedArticle(
+            "http://a", "新しい本文".encode(), headers={"ETag": '"v2"'}
+        )
+
+        self.assertEqual(
+            await self.cache.load("http://a", self.fetcher, self.extract),
+            ("記事", "新しい本文"),
+        )
+        self.assertEqual(self.cache.get("http://a").etag, '"v2"')
+
+    async def test_shares_simultaneous_fetches(self) -> None:
+        results = await asyncio.gather(
+            *(self.cache.load("http://a", self.fetcher, self.extract) for _ in range(4))
+        )
+
+        self.assertEqual(results, [("記事", "本文")] * 4)
+        self.fetcher.fetch.assert_awaited_once()
+
+    async def test_evicts_least_recently_used_articles_over_max_bytes(self) -> None:
+        for url in ("http://a", "http://b", "http://c"):
+            self.cache.set(url, "記事", "本" * 100, {})
+        self.cache.get("http://a")
+        self.cache.set("http://d", "記事", "本" * 100, {})
+
+        self.assertIsNone(self.cache.get("http://b"))
+        self.assertIsNotNone(self.cache.get("http://a"))
+        self.assertLessEqual(self.cache.size, 1024)
+
+    async def test_does_not_cache_article_larger_than_max_bytes(self) -> None:
+        self.cache.set("http://a", "記事", "本" * 1024, {})
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+
+    async def test_persists_articles(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "articles.json")
+            cache = ArticleCache(max_bytes=1024, ttl=60, path=path)
+            cache.set("http://a", "記事", "本文", _HEADERS)
+            cache.save()
+
+            article = ArticleCache(max_bytes=1024, ttl=60, path=path).get("http://a")
+
+        self.assertEqual((article.title, article.body), ("記事", "本文"))
+        self.assertEqual(article.etag, '"v1"')
@@ -0,0 +1,108 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import web
+
+from utils.article_fetcher import ArticleFetcher
+from utils.exceptions import (
+    ArticleFetchError,
+    ArticleFetchTimeoutError,
+    ArticleTooLargeError,
+    UnsupportedArticleContentTypeError,
+)
+
+HTML = "<html><head><title>記事</title></head><body>本文</body></html>"
+
+
+async def _html(request: web.Request) -> web.Response:
+    return web.Response(text=HTML, content_type="text/html", charset="utf-8")
+
+
+async def _versioned(request: web.Request) -> web.Response:
+    if request.headers.get("If-None-Match") == '"v1"':
+        return web.Response(status=304, headers={"ETag": '"v1"'})
+    response = await _html(request)
+    response.headers["ETag"] = '"v1"'
+    return response
+
+
+async def _image(request: web.Request) -> web.Response:
+    return web.Response(body=b"\x89PNG", content_type="image/png")
+
+
+async def _stream(request: web.Request) -> web.StreamResponse:
+    # Does not send Content-Length, so the size is only known while streaming
+    response = web.StreamResponse(headers={"Content-Type": "text/html"})
+    await response.prepare(request)
+    for _ in range(16):
+        await response.write(b"x" * 1024)
+    return response
+
+
+async def _slow(request: web.Request) -> web.Response:
+    await asyncio.sleep(1)
+    return await _html(request)
+
+
+async def _missing(request: web.Request) -> web.Response:
+    raise web.HTTPNotFound()
+
+
+class TestArticleFetcher(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        app = web.Application()
+        for path, handler in (
+            ("/html", _html),
+            ("/versioned", _versioned),
+            ("/image", _image),
+            ("/stream", _stream),
+            ("/slow", _slow),
+            ("/missing", _missing),
+        ):
+            app.router.add_get(path, handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.fetcher = ArticleFetcher(
+            connect_timeout=1, read_timeout=0.2, total_timeout=2, max_bytes=8 * 1024
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.fetcher.close()
+        await self.runner.cleanup()
+
+    async def test_fetches_html(self) -> None:
+        article = await self.fetcher.fetch(f"{self.base_url}/html")
+
+        self.assertEqual(article.content, HTML.encode())
+        self.assertEqual(article.charset, "utf-8")
+        self.assertEqual(article.url, f"{self.base_url}/html")
+
+    async def test_rejects_non_html_content_type(self) -> None:
+        with self.assertRaises(UnsupportedArticleContentTypeError):
+            await self.fetcher.fetch(f"{self.base_url}/image")
+
+    async def test_stops_streaming_after_max_bytes(self) -> None:
+        with self.assertRaises(ArticleTooLargeError):
+            await self.fetcher.fetch(f"{self.base_url}/stream")
+
+    async def test_raises_timeout_error_on_slow_response(self) -> None:
+        with self.assertRaises(ArticleFetchTimeoutError):
+            await self.fetcher.fetch(f"{self.base_url}/slow")
+
+    async def test_raises_fetch_error_on_error_status(self) -> None:
+        with self.assertRaises(ArticleFetchError):
+            await self.fetcher.fetch(f"{self.base_url}/missing")
+
+    async def test_returns_not_modified_article_on_conditional_request(self) -> None:
+        article = await self.fetcher.fetch(f"{self.base_url}/versioned")
+        revalidated = await self.fetcher.fetch(
+            f"{self.base_url}/versioned", {"If-None-Match": article.headers["ETag"]}
+        )
+
+        self.assertFalse(article.is_not_modified)
+        self.assertTrue(revalidated.is_not_modified)
+        self.assertEqual(revalidated.content, b"")
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from utils.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCache(TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache = LRUCache(2, clock=self.clock)
+
+    def test_get_returns_the_stored_value(self) -> None:
+        self.cache.set("key", "value")
+
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+
+    def test_get_returns_default_for_missing_key(self) -> None:
+        self.assertEqual(self.cache.get("key", "default"), "default")
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_evicts_the_least_recently_used_entry(self) -> None:
+        self.cache.set("first", 1)
+        self.cache.set("second", 2)
+        self.cache.get("first")
+        self.cache.set("third", 3)
+
+        self.assertIn("first", self.cache)
+        self.assertNotIn("second", self.cache)
+        self.assertIn("third", self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_drops_expired_entries(self) -> None:
+        self.cache.set("key", "value", expires_at=10.0)
+        self.clock.now = 9.0
+        self.assertEqual(self.cache.get("key"), "value")
+
+        self.clock.now = 10.0
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_does_not_store_entries_with_zero_max_size(self) -> None:
+        cache = LRUCache(0)
+        cache.set("key", "value")
+
+        self.assertNotIn("key", cache)
@@ -0,0 +1,63 @@
+import codecs
+from unittest import TestCase
+
+from utils.charset import guess_japanese_charset, normalize_charset, resolve_charset
+
+_TEXT = "<p>東京都内で十日、新しい駅が開業し、多くの利用者が訪れた。</p>" * 4
+
+
+class TestResolveCharset(TestCase):
+    def test_prefers_byte_order_mark(self) -> None:
+        content = codecs.BOM_UTF8 + _TEXT.encode()
+
+        self.assertEqual(resolve_charset(content, "shift_jis"), "utf-8-sig")
+
+    def test_uses_header_charset(self) -> None:
+        self.assertEqual(resolve_charset(_TEXT.encode("euc_jp"), "EUC-JP"), "euc-jp")
+
+    def test_maps_shift_jis_to_its_windows_superset(self) -> None:
+        self.assertEqual(resolve_charset(b"", "Shift_JIS"), "cp932")
+
+    def test_ignores_unknown_header_charset(self) -> None:
+        content = f'<meta charset="euc-jp">{_TEXT}'.encode("euc_jp")
+
+        self.assertEqual(resolve_charset(content, "unknown"), "euc-jp")
+
+    def test_finds_meta_charset(self) -> None:
+        for meta in (
+            '<meta charset="Shift_JIS">',
+            "<meta http-equiv='Content-Type' content='text/html; charset=shift_jis'>",
+        ):
+            with self.subTest(meta=meta):
+                content = f"<html><head>{meta}</head>{_TEXT}".encode("cp932")
+
+                self.assertEqual(resolve_charset(content), "cp932")
+
+    def test_ignores_utf_16_meta_charset(self) -> None:
+        content = f'<meta charset="utf-16">{_TEXT}'.encode()
+
+        self.assertEqual(resolve_charset(content), "utf-8")
+
+    def test_guesses_charset_of_unlabeled_japanese_pages(self) -> None:
+        for charset in ("utf-8", "cp932", "euc_jp", "iso2022_jp"):
+            with self.subTest(charset=charset):
+                self.assertEqual(resolve_charset(_TEXT.encode(charset)), charset)
+
+    def test_defaults_to_utf_8(self) -> None:
+        self.assertEqual(resolve_charset(b"<p>ascii</p>"), "utf-8")
+
+
+class TestGuessJapaneseCharset(TestCase):
+    def test_ignores_character_cut_at_prefix_end(self) -> None:
+        content = _TEXT.encode()
+
+        self.assertEqual(guess_japanese_charset(content[:-5]), "utf-8")
+
+    def test_returns_none_for_ascii(self) -> None:
+        self.assertIsNone(guess_japanese_charset(b"<p>ascii</p>"))
+
+
+class TestNormalizeCharset(TestCase):
+    def test_returns_none_for_unknown_charset(self) -> None:
+        self.assertIsNone(normalize_charset("unknown"))
+        self.assertIsNone(normalize_charset(None))
@@ -0,0 +1,241 @@
+import asyncio
+from threading import Event
+from unittest import IsolatedAsyncioTestCase
+
+from utils.exceptions import SchedulerOverloadedError
+from utils.fair_scheduler import FairScheduler, Priority
+
+
+def _create_scheduler(**kwargs) -> FairScheduler:
+    limits = dict(
+        max_concurrency=1,
+        max_concurrency_per_guild=1,
+        max_concurrency_per_user=1,
+        max_queued=100,
+        max_queued_per_guild=100,
+        max_queued_per_user=100,
+        interactive_reserved=0,
+    )
+    return FairScheduler(**(limits | kwargs))
+
+
+class TestFairScheduler(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.order = []
+        self.blocker = Event()
+        # Threads of a failed test must not block the exit
+        self.addCleanup(self.blocker.set)
+
+    async def _block(
+        self, scheduler: FairScheduler, guild: int, user: int
+    ) -> asyncio.Task:
+        # Keeps the only slot busy until the rest of the jobs are queued
+        task = asyncio.create_task(scheduler.run(guild, user, self.blocker.wait))
+        await asyncio.sleep(0)
+        return task
+
+    def _run(
+        self,
+        scheduler: FairScheduler,
+        guild: int,
+        user: int,
+        name: str,
+        cost: float,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> asyncio.Task:
+        return asyncio.create_task(
+            scheduler.run(
+                guild, user, self.order.append, name, cost=cost, priority=priority
+            )
+        )
+
+    async def _run_all(self, blocker: asyncio.Task, tasks: list[asyncio.Task]) -> None:
+        await asyncio.sleep(0)
+        self.blocker.set()
+        await asyncio.gather(blocker, *tasks)
+
+    async def test_interleaves_users_by_cost(self) -> None:
+        scheduler = _create_scheduler()
+        blocker = await self._block(scheduler, 1, "a")
+        tasks = [self._run(scheduler, 1, "a", f"a{index}", 100) for index in range(2)]
+        tasks += [self._run(scheduler, 1, "b", f"b{index}", 10) for index in range(3)]
+
+        await self._run_all(blocker, tasks)
+
+        self.assertEqual(self.order, ["b0", "a0", "b1", "b2", "a1"])
+
+    async def test_shares_turns_between_guilds_not_users(self) -> None:
+        scheduler = _create_scheduler(max_concurrency_per_guild=2)
+        blocker = await self._block(scheduler, 1, "a")
+        tasks = [
+            self._run(scheduler, 1, user, f"{user}{index}", 1)
+            for index in range(2)
+            for user in ("b", "c")
+        ]
+        tasks += [self._run(scheduler, 2, "d", f"d{index}", 1) for index in range(2)]
+
+        await self._run_all(blocker, tasks)
+
+        self.assertEqual(self.order, ["d0", "b0", "d1", "c0", "b1", "c1"])
+
+    async def test_respects_weights(self) -> None:
+        scheduler = _create_scheduler(user_weights={"b": 2})
+        blocker = await self._block(scheduler, 1, "a")
+        tasks = [
+            self._run(scheduler, 1, user, f"{user}{index}", 10)
+            for user in ("a", "b")
+            for index in range(3)
+        ]
+
+        await self._run_all(blocker, tasks)
+
+        self.assertEqual(self.order, ["b0", "a0", "b1", "a1", "b2", "a2"])
+
+    async def test_limits_running_jobs_per_user(self) -> None:
+        scheduler = _create_scheduler(
+            max_concurrency=4, max_concurrency_per_guild=4, max_concurrency_per_user=2
+        )
+        tasks = [
+            asyncio.create_task(scheduler.run(1, "a", self.blocker.wait))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        self.assertEqual((scheduler.running, scheduler.queued), (2, 1))
+        self.blocker.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual((scheduler.running, scheduler.queued), (0, 0))
+        self.assertEqual([lane.guilds for lane in scheduler._lanes.values()], [{}, {}])
+
+    async def test_rejects_jobs_over_queue_limit_of_user(self) -> None:
+        scheduler = _create_scheduler(max_queued_per_user=1)
+        blocker = await self._block(scheduler, 1, "a")
+        task = self._run(scheduler, 1, "a", "a0", 1)
+        await asyncio.sleep(0)
+
+        with self.assertRaises(SchedulerOverloadedError):
+            await scheduler.run(1, "a", self.order.append, "a1")
+        await self._run_all(blocker, [task, self._run(scheduler, 1, "b", "b0", 1)])
+        self.assertEqual(self.order, ["b0", "a0"])
+
+    async def test_rejected_jobs_leave_no_flows(self) -> None:
+        scheduler = _create_scheduler(max_queued=1)
+        blocker = await self._block(scheduler, 1, "a")
+        task = self._run(scheduler, 1, "a", "a0", 1)
+        await asyncio.sleep(0)
+
+        for guild in range(2, 5):
+            with self.assertRaises(SchedulerOverloadedError):
+                await scheduler.run(guild, "b", self.order.append, "b0")
+
+        self.assertEqual(list(scheduler._lanes[Priority.INTERACTIVE].guilds), [1])
+        await self._run_all(blocker, [task])
+        self.assertEqual([lane.guilds for lane in scheduler._lanes.values()], [{}, {}])
+
+    async def test_removes_cancelled_queued_jobs(self) -> None:
+        scheduler = _create_scheduler()
+        blocker = await self._block(scheduler, 1, "a")
+        cancelled = self._run(scheduler, 1, "b", "b0", 1)
+        task = self._run(scheduler, 1, "c", "c0", 1)
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await self._run_all(blocker, [task])
+
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(self.order, ["c0"])
+        self.assertEqual((scheduler.running, scheduler.queued), (0, 0))
+
+    async def test_dispatches_interactive_jobs_before_queued_bulk_jobs(self) -> None:
+        scheduler = _create_scheduler()
+        blocker = await self._block(scheduler, 1, "a")
+        tasks = [
+            self._run(scheduler, 1, "b", f"bulk{index}", 1, Priority.BULK)
+            for index in range(2)
+        ]
+        tasks.append(self._run(scheduler, 2, "c", "interactive", 100))
+
+        await self._run_all(blocker, tasks)
+
+        self.assertEqual(self.order, ["interactive", "bulk0", "bulk1"])
+
+    async def test_keeps_reserved_slots_for_interactive_jobs(self) -> None:
+        scheduler = _create_scheduler(
+            max_concurrency=3,
+            max_concurrency_per_guild=3,
+            max_concurrency_per_user=3,
+            interactive_reserved=1,
+        )
+        tasks = [
+            asyncio.create_task(
+                scheduler.run(1, "a", self.blocker.wait, priority=Priority.BULK)
+            )
+            for _ in range(3)
+        ]
+        tasks.append(asyncio.create_task(scheduler.run(1, "b", self.blocker.wait)))
+        await asyncio.sleep(0)
+
+        self.assertEqual((scheduler.running, scheduler.queued), (3, 1))
+        self.assertEqual(scheduler._lanes[Priority.INTERACTIVE].running, 1)
+        self.blocker.set()
+        await asyncio.gather(*tasks)
+
+    async def test_limits_running_jobs_per_user_across_lanes(self) -> None:
+        scheduler = _create_scheduler(max_concurrency=3, max_concurrency_per_guild=3)
+        blocker = asyncio.create_task(
+            scheduler.run(1, "a", self.blocker.wait, priority=Priority.BULK)
+        )
+        await asyncio.sleep(0)
+        task = self._run(scheduler, 1, "a", "a0", 1)
+        await asyncio.sleep(0)
+
+        self.assertEqual((scheduler.running, scheduler.queued), (1, 1))
+        await self._run_all(blocker, [task])
+        self.assertEqual(self.order, ["a0"])
+        self.assertEqual(
+            (scheduler._guilds_running, scheduler._users_running), ({}, {})
+        )
+
+    async def test_preempts_latest_queued_bulk_job_over_queue_limit(self) -> None:
+        scheduler = _create_scheduler(max_queued=2)
+        blocker = await self._block(scheduler, 1, "a")
+        bulk = [
+            self._run(scheduler, 1, "b", f"bulk{index}", 1, Priority.BULK)
+            for index in range(2)
+        ]
+        await asyncio.sleep(0)
+
+        with self.assertRaises(SchedulerOverloadedError):
+            await scheduler.run(
+                1, "c", self.order.append, "bulk2", priority=Priority.BULK
+            )
+        interactive = self._run(scheduler, 1, "c", "interactive", 1)
+        await asyncio.sleep(0)
+        self.blocker.set()
+        await asyncio.gather(blocker, bulk[0], interactive)
+
+        with self.assertRaises(SchedulerOverloadedError):
+            await bulk[1]
+        self.assertEqual(self.order, ["interactive", "bulk0"])
+        self.assertEqual((scheduler.running, scheduler.queued), (0, 0))
+
+    async def test_cancelling_preempted_job_keeps_running_jobs(self) -> None:
+        scheduler = _create_scheduler(max_queued=1)
+        running = asyncio.create_task(
+            scheduler.run(1, "a", self.blocker.wait, priority=Priority.BULK)
+        )
+        await asyncio.sleep(0)
+        preempted = self._run(scheduler, 1, "a", "bulk", 1, Priority.BULK)
+        await asyncio.sleep(0)
+        interactive = self._run(scheduler, 1, "b", "interactive", 1)
+        await asyncio.sleep(0)
+        # Cancelled after the preemption, before the job sees its rejection
+        preempted.cancel()
+        await asyncio.sleep(0)
+
+        self.assertEqual((scheduler.running, self.order), (1, []))
+        self.blocker.set()
+        await asyncio.gather(running, interactive)
+        self.assertTrue(preempted.cancelled())
+        self.assertEqual(self.order, ["interactive"])
+        self.assertEqual((scheduler.running, scheduler.queued), (0, 0))
@@ -0,0 +1,48 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from utils.host_limiter import HostLimiter
+
+
+class TestHostLimiter(IsolatedAsyncioTestCase):
+    async def _run(self, limiter: HostLimiter, urls: list[str]) -> dict[str, int]:
+        running = {"total": 0}
+        max_running = {}
+
+        async def job(url: str) -> None:
+            host = url.split("/")[2]
+            async with limiter.acquire(url):
+                for key in ("total", host):
+                    running[key] = running.get(key, 0) + 1
+                    max_running[key] = max(max_running.get(key, 0), running[key])
+                await asyncio.sleep(0.01)
+                for key in ("total", host):
+                    running[key] -= 1
+
+        await asyncio.gather(*(job(url) for url in urls))
+        return max_running
+
+    async def test_limits_jobs_per_host(self) -> None:
+        limiter = HostLimiter(limit=8, limit_per_host=2)
+
+        max_running = await self._run(
+            limiter, [f"http://a.jp/{index}" for index in range(5)] + ["http://b.jp/"]
+        )
+
+        self.assertEqual(max_running, {"total": 3, "a.jp": 2, "b.jp": 1})
+
+    async def test_limits_jobs_in_total(self) -> None:
+        limiter = HostLimiter(limit=2, limit_per_host=2)
+
+        max_running = await self._run(
+            limiter, [f"http://{host}.jp/" for host in "abcde"]
+        )
+
+        self.assertEqual(max_running["total"], 2)
+
+    async def test_drops_idle_host_semaphores(self) -> None:
+        limiter = HostLimiter(limit=2, limit_per_host=1)
+
+        await self._run(limiter, ["http://a.jp/1", "http://a.jp/2"])
+
+        self.assertEqual(limiter._host_semaphores, {})
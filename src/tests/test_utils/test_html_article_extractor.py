@@ -0,0 +1,54 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from utils import html_article_extractor
+from utils.html_article_extractor import (
+    ArticleTextExtractor,
+    extract_article,
+    iter_article_chunks,
+)
+
+
+class TestExtractArticle(TestCase):
+    def test_extracts_title_and_body(self) -> None:
+        content = (
+            "<html><head><title>記事 &amp; ニュース</title></head>"
+            "<body><h1>見出し</h1>\r\n<p>今日は<b>いい</b>天気  ですね。</p></body></html>"
+        ).encode()
+
+        title, body = extract_article(content)
+
+        self.assertEqual(title, "記事 & ニュース")
+        self.assertEqual(body, "記事 & ニュース見出し\n今日はいい天気\nですね。")
+
+    def test_skips_scripts_styles_and_embedded_documents(self) -> None:
+        content = (
+            "<body><script>var a = '<p>';</script><style>p {}</style>"
+            "<noscript>Enable JavaScript</noscript>"
+            "<svg><title>アイコン</title><text>SVG</text></svg><p>本文</p></body>"
+        ).encode()
+
+        title, body = extract_article(content)
+
+        self.assertIsNone(title)
+        self.assertEqual(body, "本文")
+
+    def test_decodes_with_charset(self) -> None:
+        content = "<title>記事</title><p>本文</p>".encode("shift_jis")
+
+        self.assertEqual(extract_article(content, "shift_jis"), ("記事", "記事本文"))
+
+    def test_detects_charset_of_unlabeled_page(self) -> None:
+        content = "<title>記事</title><p>本文です。</p>".encode("euc_jp")
+
+        self.assertEqual(extract_article(content), ("記事", "記事本文です。"))
+
+    def test_keeps_lines_and_characters_split_between_feeds(self) -> None:
+        content = ("<p>" + "あ" * 10 + "</p>\n<p>" + "い" * 10 + "</p>").encode()
+        extractor = ArticleTextExtractor()
+
+        # Pieces of 7 bytes end in the middle of 3 byte characters
+        with patch.object(html_article_extractor, "_FEED_SIZE", 7):
+            chunks = list(iter_article_chunks(extractor, content))
+
+        self.assertEqual(chunks, ["あ" * 10, "い" * 10])
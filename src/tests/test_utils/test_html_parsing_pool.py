@@ -0,0 +1,84 @@
+import os
+import signal
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from utils import html_parsing_pool
+from utils.exceptions import ArticleParsingError, ArticleParsingTimeoutError
+from utils.html_parsing_pool import (
+    HTMLParsingPool,
+    extract_main_content_with_cpu_limit,
+)
+
+_PAGE = (
+    "<title>記事</title><div class='article'>"
+    "<p>東京都内で十日、新しい駅が開業し、多くの利用者が訪れた。</p></div>"
+).encode()
+
+
+class TestHTMLParsingPool(IsolatedAsyncioTestCase):
+    async def test_extracts_articles_in_worker_processes(self) -> None:
+        pool = HTMLParsingPool(processes=1, max_jobs_per_process=10, cpu_time_limit=5)
+        try:
+            self.assertEqual(
+                await pool.extract_main_content(_PAGE, "utf-8", 10),
+                ("記事", "東京都内で十日、新し"),
+            )
+        finally:
+            pool.close()
+
+    async def test_replaces_pool_after_max_jobs_per_process(self) -> None:
+        pool = HTMLParsingPool(processes=1, max_jobs_per_process=2, cpu_time_limit=5)
+        try:
+            executors = []
+            for _ in range(3):
+                await pool.extract_main_content(_PAGE)
+                executors.append(pool._executor)
+        finally:
+            pool.close()
+
+        self.assertIs(executors[0], executors[1])
+        self.assertIsNot(executors[1], executors[2])
+
+    async def test_replaces_pool_after_worker_crash(self) -> None:
+        pool = HTMLParsingPool(processes=1, max_jobs_per_process=10, cpu_time_limit=5)
+        try:
+            await pool.extract_main_content(_PAGE)
+            executor = pool._executor
+            for process in executor._processes.values():
+                os.kill(process.pid, signal.SIGKILL)
+
+            with self.assertRaises(ArticleParsingError):
+                await pool.extract_main_content(_PAGE)
+            self.assertIsNot(pool._executor, executor)
+            self.assertEqual((await pool.extract_main_content(_PAGE))[0], "記事")
+        finally:
+            pool.close()
+
+    async def test_extracts_articles_in_place_without_processes(self) -> None:
+        pool = HTMLParsingPool(processes=0, max_jobs_per_process=2, cpu_time_limit=5)
+
+        self.assertEqual(
+            await pool.extract_main_content(_PAGE),
+            ("記事", "東京都内で十日、新しい駅が開業し、多くの利用者が訪れた。"),
+        )
+        self.assertIsNone(pool._executor)
+
+
+class TestExtractMainContentWithCPULimit(TestCase):
+    def setUp(self) -> None:
+        handler = signal.getsignal(signal.SIGVTALRM)
+        self.addCleanup(signal.signal, signal.SIGVTALRM, handler)
+        html_parsing_pool._initialize_worker()
+
+    def test_raises_timeout_error_after_cpu_time_limit(self) -> None:
+        page = b"<div><p>" + "あ。".encode() * 1_000_000 + b"</p></div>" * 10_000
+
+        with self.assertRaises(ArticleParsingTimeoutError):
+            extract_main_content_with_cpu_limit(page, None, None, 0.01)
+        self.assertEqual(signal.getitimer(signal.ITIMER_VIRTUAL), (0.0, 0.0))
+
+    def test_clears_timer_after_extraction(self) -> None:
+        self.assertEqual(
+            extract_main_content_with_cpu_limit(_PAGE, None, None, 5)[0], "記事"
+        )
+        self.assertEqual(signal.getitimer(signal.ITIMER_VIRTUAL), (0.0, 0.0))
@@ -0,0 +1,84 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from utils import html_article_extractor
+from utils.main_content_extractor import extract_main_content, truncate_chunks
+
+_PAGE = """<html><head><title>ニュース記事</title></head><body>
+<header><div class="menu"><a href="/">トップ</a> <a href="/news">ニュース</a></div></header>
+<nav><ul><li><a href="/a">政治</a></li><li><a href="/b">経済</a></li></ul></nav>
+<div id="main"><article class="article-body">
+<h1>東京で新しい駅が開業</h1>
+<p>東京都内で十日、新しい駅が開業し、多くの利用者が訪れた。駅は、都心と空港を結ぶ路線の途中にあり、利便性の向上が期待されている。</p>
+<p>鉄道会社によると、一日あたりの利用者は、およそ三万人を見込んでいる。</p>
+</article>
+<div class="related"><h2>関連記事</h2><ul>
+<li><a href="/1">別の駅が改装されたというとても長いタイトルのニュース記事です</a></li>
+<li><a href="/2">もう一つの関連記事のタイトルがここに入ります、とても長い</a></li>
+</ul></div>
+<div class="comments"><p>コメント：とても便利になりますね、楽しみです。早く使ってみたいと思います。</p></div>
+</div>
+<footer><p>Copyright 2022 News Company. All rights reserved, 無断転載を禁じます。</p></footer>
+</body></html>"""
+
+
+class TestExtractMainContent(TestCase):
+    def test_keeps_only_main_article_blocks(self) -> None:
+        title, body = extract_main_content(_PAGE.encode())
+
+        self.assertEqual(title, "ニュース記事")
+        self.assertEqual(
+            body,
+            "東京で新しい駅が開業\n"
+            "東京都内で十日、新しい駅が開業し、多くの利用者が訪れた。"
+            "駅は、都心と空港を結ぶ路線の途中にあり、利便性の向上が期待されている。\n"
+            "鉄道会社によると、一日あたりの利用者は、およそ三万人を見込んでいる。",
+        )
+
+    def test_drops_link_lists_inside_main_container(self) -> None:
+        content = (
+            "<body><div class='post'><p>本文の最初の段落です。長い文章が、ここに続きます。</p>"
+            "<ul><li><a href='/1'>関連リンク</a></li></ul>"
+            "<p>二番目の段落です、これも<a href='/2'>記事</a>の一部です。</p></div></body>"
+        ).encode()
+
+        self.assertEqual(
+            extract_main_content(content)[1],
+            "本文の最初の段落です。長い文章が、ここに続きます。\n"
+            "二番目の段落です、これも記事の一部です。",
+        )
+
+    def test_keeps_all_text_without_scored_blocks(self) -> None:
+        content = "<title>短い</title><div><p>短い文。</p><nav>メニュー</nav></div>"
+
+        self.assertEqual(
+            extract_main_content(content.encode()), ("短い", "短い文。\nメニュー")
+        )
+
+    def test_extracts_documents_fed_in_pieces(self) -> None:
+        content = _PAGE.encode("shift_jis")
+
+        # Pieces of 5 bytes split tags and 2 byte characters
+        with patch.object(html_article_extractor, "_FEED_SIZE", 5):
+            self.assertEqual(
+                extract_main_content(content, "shift_jis"),
+                extract_main_content(_PAGE.encode()),
+            )
+
+    def test_caps_body_length(self) -> None:
+        self.assertEqual(
+            extract_main_content(_PAGE.encode(), max_length=15)[1],
+            "東京で新しい駅が開業",
+        )
+
+
+class TestTruncateChunks(TestCase):
+    def test_counts_line_breaks_between_chunks(self) -> None:
+        self.assertEqual(truncate_chunks(["abc", "de", "f"], 6), ["abc", "de"])
+        self.assertEqual(truncate_chunks(["abc", "de", "f"], 8), ["abc", "de", "f"])
+
+    def test_cuts_first_chunk_longer_than_max_length(self) -> None:
+        self.assertEqual(truncate_chunks(["abcdef", "g"], 4), ["abcd"])
+
+    def test_keeps_chunks_without_max_length(self) -> None:
+        self.assertEqual(truncate_chunks(["abc"], None), ["abc"])
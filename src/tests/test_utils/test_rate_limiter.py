@@ -0,0 +1,19 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from utils import rate_limiter
+from utils.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(TestCase):
+    def test_spreads_calls_evenly(self) -> None:
+        with patch.object(rate_limiter, "monotonic", return_value=10.0), patch.object(
+            rate_limiter, "sleep"
+        ) as sleep:
+            limiter = RateLimiter(4)
+            for _ in range(3):
+                limiter.acquire()
+
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list], [0.0, 0.25, 0.5]
+        )
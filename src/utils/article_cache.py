@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from time import time
+from typing import Awaitable, Callable
+
+import config
+from utils.article_fetcher import ArticleFetcher, FetchedArticle
+
+
+@dataclass
+class CachedArticle:
+    url: str
+    title: str | None
+    body: str
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def size(self) -> int:
+        return sum(
+            len(value.encode())
+            for value in (
+                self.url,
+                self.title,
+                self.body,
+                self.etag,
+                self.last_modified,
+            )
+            if value is not None
+        )
+
+    def get_conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ArticleCache:
+    """
+    Least recently used cache of titles and bodies extracted from fetched pages,
+    bounded by the total size of entries in bytes. A fresh entry is returned
+    without a request, a stale entry with an ETag or a Last-Modified header
+    is revalidated with a conditional request and reused when the page
+    is not modified, so neither the download nor the extraction is repeated.
+    Simultaneous loads of the same URL share one fetch.
+
+    Args:
+        max_bytes (int): the max total size of cached entries,
+            the cache is disabled if it is not positive
+        ttl (float): the number of seconds an entry is used without revalidation
+        path (str): the path of a JSON file the cache is loaded from and saved to,
+            the cache is not persisted if it is None
+        clock (Callable[[], float]): returns the current time in seconds,
+            defaults to time.time
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = config.ARTICLE_CACHE_MAX_BYTES,
+        ttl: float = config.ARTICLE_CACHE_TTL,
+        path: str = config.ARTICLE_CACHE_PATH,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.size = 0
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedArticle] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                for entry in json.load(file)["entries"]:
+                    self._add(CachedArticle(**entry))
+
+    def get(self, url: str) -> CachedArticle | None:
+        """Returns the entry of the URL even if it is stale"""
+        if (article := self._entries.get(url)) is not None:
+            self._entries.move_to_end(url)
+        return article
+
+    def set(
+        self, url: str, title: str | None, body: str, headers: dict[str, str]
+    ) -> CachedArticle:
+        headers = {name.lower(): value for name, value in headers.items()}
+        article = CachedArticle(
+            url,
+            title,
+            body,
+            self._clock() + self.ttl,
+            headers.get("etag"),
+            headers.get("last-modified"),
+        )
+        self._add(article)
+        return article
+
+    def is_fresh(self, article: CachedArticle) -> bool:
+        return article.expires_at > self._clock()
+
+    async def load(
+        self,
+        url: str,
+        fetcher: ArticleFetcher,
+        extract: Callable[[FetchedArticle], Awaitable[tuple[str | None, str]]],
+    ) -> tuple[str | None, str]:
+        """Returns the title and the body of the article, fetching and extracting
+        them with the passed coroutine function unless a valid cached entry exists"""
+        if (loading := self._loading.get(url)) is not None:
+            return await asyncio.shield(loading)
+        article = self.get(url)
+        if article is not None and self.is_fresh(article):
+            return article.title, article.body
+        # The shared fetch is shielded, so a cancelled caller
+        # does not cancel it for the others
+        loading = asyncio.ensure_future(self._fetch(url, article, fetcher, extract))
+        self._loading[url] = loading
+        return await asyncio.shield(loading)
+
+    async def _fetch(
+        self,
+        url: str,
+        article: CachedArticle | None,
+        fetcher: ArticleFetcher,
+        extract: Callable[[FetchedArticle], Awaitable[tuple[str | None, str]]],
+    ) -> tuple[str | None, str]:
+        try:
+            headers = article.get_conditional_headers() if article else {}
+            fetched = await fetcher.fetch(url, headers or None)
+            if fetched.is_not_modified and article is not None:
+                article.expires_at = self._clock() + self.ttl
+                return article.title, article.body
+            title, body = await extract(fetched)
+            self.set(url, title, body, fetched.headers)
+            return title, body
+        finally:
+            self._loading.pop(url, None)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with open(f"{self.path}.tmp", "w") as file:
+            json.dump(
+                {"entries": [asdict(article) for article in self._entries.values()]},
+                file,
+                ensure_ascii=False,
+            )
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add(self, article: CachedArticle) -> None:
+        if (previous := self._entries.pop(article.url, None)) is not None:
+            self.size -= previous.size
+        if article.size > self.max_bytes:
+            return
+        self._entries[article.url] = article
+        self.size += article.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
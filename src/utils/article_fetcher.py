@@ -0,0 +1,119 @@
+import asyncio
+from dataclasses import dataclass, field
+
+import aiohttp
+
+import config
+from utils.exceptions import (
+    ArticleFetchError,
+    ArticleFetchTimeoutError,
+    ArticleTooLargeError,
+    UnsupportedArticleContentTypeError,
+)
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class FetchedArticle:
+    url: str
+    content: bytes
+    charset: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+    status: int = 200
+
+    @property
+    def is_not_modified(self) -> bool:
+        return self.status == 304
+
+
+class ArticleFetcher:
+    """
+    Fetches HTML pages asynchronously reusing pooled connections to every host.
+    The body is streamed and the download is stopped as soon as it exceeds
+    max_bytes, pages with a content type other than HTML are rejected
+    before their body is downloaded.
+
+    Args:
+        connect_timeout (float): the max number of seconds to connect to a host
+        read_timeout (float): the max number of seconds between received chunks
+        total_timeout (float): the max number of seconds of a whole fetch
+        max_bytes (int): the max size of a page body
+        limit_per_host (int): the max number of simultaneous connections to a host
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = config.ARTICLE_FETCH_CONNECT_TIMEOUT,
+        read_timeout: float = config.ARTICLE_FETCH_READ_TIMEOUT,
+        total_timeout: float = config.ARTICLE_FETCH_TOTAL_TIMEOUT,
+        max_bytes: int = config.ARTICLE_MAX_BYTES,
+        limit_per_host: int = config.ARTICLE_FETCH_LIMIT_PER_HOST,
+    ) -> None:
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout, connect=connect_timeout, sock_read=read_timeout
+        )
+        self.max_bytes = max_bytes
+        self.limit_per_host = limit_per_host
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # The session is created lazily, because it has to be created
+        # inside the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit_per_host=self.limit_per_host),
+            )
+        return self._session
+
+    async def fetch(self, url: str, headers: dict[str, str] = None) -> FetchedArticle:
+        try:
+            async with self._get_session().get(url, headers=headers) as response:
+                response.raise_for_status()
+                # Conditional requests are answered without a body
+                # when the cached copy is still valid
+                if response.status == 304:
+                    return FetchedArticle(
+                        str(response.url), b"", None, dict(response.headers), 304
+                    )
+                self._check_content_type(url, response)
+                if (response.content_length or 0) > self.max_bytes:
+                    raise ArticleTooLargeError(
+                        f"Article {url=} has {response.content_length} bytes"
+                    )
+                content = bytearray()
+                async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                    content += chunk
+                    if len(content) > self.max_bytes:
+                        raise ArticleTooLargeError(
+                            f"Article {url=} has more than {self.max_bytes} bytes"
+                        )
+                return FetchedArticle(
+                    str(response.url),
+                    bytes(content),
+                    response.charset,
+                    dict(response.headers),
+                    response.status,
+                )
+        except asyncio.TimeoutError as exception:
+            raise ArticleFetchTimeoutError(f"Fetching {url=} timed out") from exception
+        except aiohttp.ClientError as exception:
+            raise ArticleFetchError(
+                f"Fetching {url=} failed: {exception}"
+            ) from exception
+
+    @staticmethod
+    def _check_content_type(url: str, response: aiohttp.ClientResponse) -> None:
+        # Pages without a content type are accepted and left to the extractor
+        if "Content-Type" in response.headers and (
+            response.content_type not in HTML_CONTENT_TYPES
+        ):
+            raise UnsupportedArticleContentTypeError(
+                f"Article {url=} has content type {response.content_type}"
+            )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
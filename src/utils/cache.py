@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from threading import Lock
+from time import time
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """
+    Thread-safe least recently used cache with optional per-entry expiration.
+
+    Args:
+        max_size (int): the max number of entries kept in the cache
+        clock (Callable[[], float]): returns the current time in seconds,
+            compared with expires_at values of entries, defaults to time.time
+    """
+
+    def __init__(self, max_size: int = 1024, clock: Callable[[], float] = time) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if not self._is_fresh(key):
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._is_fresh(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_fresh(self, key: Hashable) -> bool:
+        # Drops the expired entry, should be called with the lock acquired
+        if key not in self._entries:
+            return False
+        expires_at = self._entries[key][1]
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            return False
+        return True
@@ -0,0 +1,92 @@
+import codecs
+import re
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Browsers decode pages labeled as Shift_JIS with its Windows superset
+_CHARSET_ALIASES = {
+    "shift_jis": "cp932",
+    "shift-jis": "cp932",
+    "sjis": "cp932",
+    "x-sjis": "cp932",
+    "windows-31j": "cp932",
+}
+_META_SCAN_SIZE = 4096
+_META_CHARSET_PATTERN = re.compile(
+    rb"""<meta[^>]*?charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE
+)
+_HEURISTIC_SCAN_SIZE = 64 * 1024
+_ISO_2022_JP_ESCAPES = (b"\x1b$B", b"\x1b$@")
+_JAPANESE_PATTERN = re.compile(r"[぀-ヿ一-鿿　-〿]")
+DEFAULT_CHARSET = "utf-8"
+
+
+def normalize_charset(charset: str | None) -> str | None:
+    """Returns the name of a Python codec for the charset label,
+    None if there is no such codec"""
+    if not charset:
+        return None
+    charset = charset.strip().strip("\"'").lower()
+    charset = _CHARSET_ALIASES.get(charset, charset)
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        return None
+    return charset
+
+
+def _decodes_strictly(prefix: bytes, charset: str) -> bool:
+    # The prefix may end in the middle of a character
+    try:
+        codecs.getincrementaldecoder(charset)().decode(prefix, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _count_japanese_characters(prefix: bytes, charset: str) -> int:
+    text = codecs.getincrementaldecoder(charset)(errors="ignore").decode(prefix)
+    return len(_JAPANESE_PATTERN.findall(text))
+
+
+def guess_japanese_charset(content: bytes) -> str | None:
+    """Guesses a charset of a page without a label from its prefix,
+    recognizes UTF-8, ISO-2022-JP, Shift_JIS and EUC-JP"""
+    prefix = content[:_HEURISTIC_SCAN_SIZE]
+    if prefix.isascii():
+        return None
+    if _decodes_strictly(prefix, "utf-8"):
+        return "utf-8"
+    candidates = [
+        charset for charset in ("cp932", "euc_jp") if _decodes_strictly(prefix, charset)
+    ]
+    if len(candidates) == 1:
+        return candidates[0]
+    # Both decode without errors, the right one gives more Japanese characters
+    return max(
+        ("cp932", "euc_jp"),
+        key=lambda charset: _count_japanese_characters(prefix, charset),
+    )
+
+
+def resolve_charset(content: bytes, header_charset: str = None) -> str:
+    """Returns the charset to decode the HTML page with: the one of a byte order
+    mark, the one of the Content-Type header, the one declared in a meta tag
+    in the beginning of the page, the one guessed from Japanese text
+    or DEFAULT_CHARSET"""
+    for bom, charset in _BOMS:
+        if content.startswith(bom):
+            return charset
+    if charset := normalize_charset(header_charset):
+        return charset
+    if (match := _META_CHARSET_PATTERN.search(content[:_META_SCAN_SIZE])) and (
+        charset := normalize_charset(match.group(1).decode("ascii"))
+    ):
+        # Pages decoded as ASCII compatible charsets cannot declare UTF-16
+        return DEFAULT_CHARSET if charset.startswith("utf-16") else charset
+    if any(escape in content[:_HEURISTIC_SCAN_SIZE] for escape in _ISO_2022_JP_ESCAPES):
+        return "iso2022_jp"
+    return guess_japanese_charset(content) or DEFAULT_CHARSET
@@ -0,0 +1,40 @@
+class ArticleFetchError(Exception):
+    """Failed to fetch an article"""
+
+    code = "ARTICLE_FETCH_ERROR"
+
+
+class ArticleFetchTimeoutError(ArticleFetchError):
+    """Fetching an article took longer than allowed"""
+
+    code = "ARTICLE_FETCH_TIMEOUT_ERROR"
+
+
+class ArticleTooLargeError(ArticleFetchError):
+    """An article is larger than the max allowed size"""
+
+    code = "ARTICLE_TOO_LARGE_ERROR"
+
+
+class UnsupportedArticleContentTypeError(ArticleFetchError):
+    """A fetched page is not an HTML document"""
+
+    code = "UNSUPPORTED_ARTICLE_CONTENT_TYPE_ERROR"
+
+
+class ArticleParsingError(ArticleFetchError):
+    """Extracting the text of an article failed"""
+
+    code = "ARTICLE_PARSING_ERROR"
+
+
+class ArticleParsingTimeoutError(ArticleParsingError):
+    """Extracting the text of an article took more CPU time than allowed"""
+
+    code = "ARTICLE_PARSING_TIMEOUT_ERROR"
+
+
+class SchedulerOverloadedError(Exception):
+    """Too many jobs are waiting to be run"""
+
+    code = "SCHEDULER_OVERLOADED_ERROR"
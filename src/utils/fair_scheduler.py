@@ -0,0 +1,314 @@
+import asyncio
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
+from itertools import count
+from typing import Any, Callable, Hashable
+
+import config
+from utils.exceptions import SchedulerOverloadedError
+
+
+class Priority(Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+@dataclass
+class _Job:
+    function: Callable[[], Any]
+    cost: float
+    slot: asyncio.Future
+    number: int
+    dispatched: bool = False
+
+
+@dataclass
+class _Flow:
+    """Queued jobs of a principal and its share of service in virtual time"""
+
+    weight: float
+    virtual_time: float = 0.0
+    running: int = 0
+    queued: int = 0
+    # The number of the last dispatch served, flows served earlier win ties
+    served_at: int = -1
+    jobs: deque[_Job] = field(default_factory=deque)
+    users: dict[Hashable, "_Flow"] = field(default_factory=dict)
+
+
+@dataclass
+class _Lane:
+    """Flows of jobs of one priority and the threads running them"""
+
+    max_concurrency: int
+    executor: ThreadPoolExecutor
+    running: int = 0
+    guilds: dict[Hashable, _Flow] = field(default_factory=dict)
+
+
+class FairScheduler:
+    """
+    Runs blocking jobs in threads dispatching them fairly between guilds
+    and between users of a guild. Every flow of jobs accumulates the cost
+    of its dispatched jobs divided by its weight as its virtual time,
+    the guild with the least virtual time is served first and inside it
+    the user with the least virtual time. Flows which become active take
+    the least virtual time of active flows, so being idle does not earn credit.
+    Guilds and users running max concurrency jobs wait, jobs over queue limits
+    are rejected with SchedulerOverloadedError.
+
+    Interactive and bulk jobs are queued in separate lanes and run in separate
+    thread pools. Queued interactive jobs are dispatched before any queued
+    bulk job, bulk jobs never take the slots reserved for interactive ones,
+    and an interactive job over the total queue limit rejects the latest
+    queued bulk job instead of being rejected. Concurrency limits of guilds
+    and users count jobs of both lanes, queue limits apply to each lane.
+
+    Args:
+        max_concurrency (int): the max number of simultaneously running jobs
+        max_concurrency_per_guild (int): the max number of running jobs of a guild
+        max_concurrency_per_user (int): the max number of running jobs of a user
+        max_queued (int): the max number of waiting jobs
+        max_queued_per_guild (int): the max number of waiting jobs of a guild
+        max_queued_per_user (int): the max number of waiting jobs of a user
+        interactive_reserved (int): the number of slots of max_concurrency
+            only interactive jobs run in
+        guild_weights (dict[Hashable, float]): weights of guilds, defaults to 1
+        user_weights (dict[Hashable, float]): weights of users, defaults to 1
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = config.SCHEDULER_MAX_CONCURRENCY,
+        max_concurrency_per_guild: int = config.SCHEDULER_MAX_CONCURRENCY_PER_GUILD,
+        max_concurrency_per_user: int = config.SCHEDULER_MAX_CONCURRENCY_PER_USER,
+        max_queued: int = config.SCHEDULER_MAX_QUEUED,
+        max_queued_per_guild: int = config.SCHEDULER_MAX_QUEUED_PER_GUILD,
+        max_queued_per_user: int = config.SCHEDULER_MAX_QUEUED_PER_USER,
+        interactive_reserved: int = config.SCHEDULER_INTERACTIVE_RESERVED,
+        guild_weights: dict[Hashable, float] = None,
+        user_weights: dict[Hashable, float] = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_guild = max_concurrency_per_guild
+        self.max_concurrency_per_user = max_concurrency_per_user
+        self.max_queued = max_queued
+        self.max_queued_per_guild = max_queued_per_guild
+        self.max_queued_per_user = max_queued_per_user
+        self.interactive_reserved = interactive_reserved
+        self.guild_weights = guild_weights or {}
+        self.user_weights = user_weights or {}
+        self.running = 0
+        self.queued = 0
+        # Running jobs of guilds and users in both lanes
+        self._guilds_running: Counter[Hashable] = Counter()
+        self._users_running: Counter[tuple[Hashable, Hashable]] = Counter()
+        bulk_concurrency = max(max_concurrency - interactive_reserved, 0)
+        # Dicts keep the order, so the interactive lane is dispatched first
+        self._lanes = {
+            Priority.INTERACTIVE: _Lane(
+                max_concurrency, ThreadPoolExecutor(max(max_concurrency, 1))
+            ),
+            Priority.BULK: _Lane(
+                bulk_concurrency, ThreadPoolExecutor(max(bulk_concurrency, 1))
+            ),
+        }
+        self._dispatches = 0
+        self._job_numbers = count()
+
+    async def run(
+        self,
+        guild: Hashable,
+        user: Hashable,
+        function: Callable,
+        *args,
+        cost: float = 1.0,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs,
+    ) -> Any:
+        """Waits for the turn of the user and runs the function in a thread
+        of the lane of the priority, the cost is the amount of work of the job,
+        e.g. the length of its text"""
+        lane = self._lanes[priority]
+        # Limits are checked before flows are created, so rejected jobs
+        # leave no idle flows behind
+        self._check_limits(priority, lane, guild, user)
+        guild_flow, user_flow = self._get_flows(lane, guild, user)
+        job = _Job(
+            partial(function, *args, **kwargs),
+            max(cost, 1.0),
+            asyncio.get_running_loop().create_future(),
+            next(self._job_numbers),
+        )
+        user_flow.jobs.append(job)
+        self._change_queued(guild_flow, user_flow, 1)
+        self._dispatch()
+        try:
+            await job.slot
+        except asyncio.CancelledError:
+            # A preempted job was rejected without taking a slot
+            if job.dispatched:
+                self._release(lane, guild, user)
+            elif job in user_flow.jobs:
+                user_flow.jobs.remove(job)
+                self._change_queued(guild_flow, user_flow, -1)
+                self._drop_idle_flows(lane, guild, user)
+            raise
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                lane.executor, job.function
+            )
+        finally:
+            self._release(lane, guild, user)
+
+    def close(self) -> None:
+        for lane in self._lanes.values():
+            lane.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_flows(
+        self, lane: _Lane, guild: Hashable, user: Hashable
+    ) -> tuple[_Flow, _Flow]:
+        if (guild_flow := lane.guilds.get(guild)) is None:
+            guild_flow = lane.guilds[guild] = _Flow(
+                self.guild_weights.get(guild, 1.0),
+                self._get_min_virtual_time(lane.guilds.values()),
+            )
+        if (user_flow := guild_flow.users.get(user)) is None:
+            user_flow = guild_flow.users[user] = _Flow(
+                self.user_weights.get(user, 1.0),
+                self._get_min_virtual_time(guild_flow.users.values()),
+            )
+        return guild_flow, user_flow
+
+    @staticmethod
+    def _get_min_virtual_time(flows) -> float:
+        return min((flow.virtual_time for flow in flows), default=0.0)
+
+    def _check_limits(
+        self, priority: Priority, lane: _Lane, guild: Hashable, user: Hashable
+    ) -> None:
+        guild_flow = lane.guilds.get(guild)
+        user_flow = guild_flow and guild_flow.users.get(user)
+        for flow, max_queued in (
+            (guild_flow, self.max_queued_per_guild),
+            (user_flow, self.max_queued_per_user),
+        ):
+            if (queued := flow.queued if flow else 0) >= max_queued:
+                raise SchedulerOverloadedError(f"{queued} jobs are already queued")
+        if self.queued >= self.max_queued and not (
+            priority is Priority.INTERACTIVE and self._preempt_bulk_job()
+        ):
+            raise SchedulerOverloadedError(f"{self.queued} jobs are already queued")
+
+    def _preempt_bulk_job(self) -> bool:
+        """Rejects the latest queued bulk job, returns False if there is none"""
+        lane = self._lanes[Priority.BULK]
+        latest = max(
+            (
+                (user_flow.jobs[-1].number, guild, user)
+                for guild, guild_flow in lane.guilds.items()
+                for user, user_flow in guild_flow.users.items()
+                if user_flow.jobs
+            ),
+            default=None,
+        )
+        if latest is None:
+            return False
+        _, guild, user = latest
+        guild_flow = lane.guilds[guild]
+        user_flow = guild_flow.users[user]
+        job = user_flow.jobs.pop()
+        self._change_queued(guild_flow, user_flow, -1)
+        self._drop_idle_flows(lane, guild, user)
+        if not job.slot.cancelled():
+            job.slot.set_exception(
+                SchedulerOverloadedError("The job was preempted by an interactive job")
+            )
+        return True
+
+    def _change_queued(self, guild_flow: _Flow, user_flow: _Flow, delta: int) -> None:
+        self.queued += delta
+        guild_flow.queued += delta
+        user_flow.queued += delta
+
+    def _dispatch(self) -> None:
+        while self.running < self.max_concurrency:
+            # Bulk jobs are dispatched only if no interactive job can be
+            for lane in self._lanes.values():
+                if lane.running < lane.max_concurrency and (
+                    (keys := self._select_flows(lane)) is not None
+                ):
+                    break
+            else:
+                return
+            guild, user = keys
+            guild_flow = lane.guilds[guild]
+            user_flow = guild_flow.users[user]
+            job = user_flow.jobs.popleft()
+            self._change_queued(guild_flow, user_flow, -1)
+            # The caller was cancelled but has not removed the job yet
+            if job.slot.cancelled():
+                self._drop_idle_flows(lane, guild, user)
+                continue
+            guild_flow.virtual_time += job.cost / guild_flow.weight
+            user_flow.virtual_time += job.cost / user_flow.weight
+            guild_flow.served_at = user_flow.served_at = self._dispatches
+            self._dispatches += 1
+            self.running += 1
+            lane.running += 1
+            guild_flow.running += 1
+            user_flow.running += 1
+            self._guilds_running[guild] += 1
+            self._users_running[guild, user] += 1
+            job.dispatched = True
+            job.slot.set_result(None)
+
+    def _select_flows(self, lane: _Lane) -> tuple[Hashable, Hashable] | None:
+        """Returns keys of the guild and the user with the least virtual time
+        among ones having queued jobs and running less than max concurrency jobs"""
+        selected = None
+        selected_priority = None
+        for guild, guild_flow in lane.guilds.items():
+            priority = (guild_flow.virtual_time, guild_flow.served_at)
+            if self._guilds_running[guild] >= self.max_concurrency_per_guild or (
+                selected is not None and priority >= selected_priority
+            ):
+                continue
+            users = [
+                ((user_flow.virtual_time, user_flow.served_at), user)
+                for user, user_flow in guild_flow.users.items()
+                if user_flow.jobs
+                and self._users_running[guild, user] < self.max_concurrency_per_user
+            ]
+            if users:
+                selected = (guild, min(users, key=lambda item: item[0])[1])
+                selected_priority = priority
+        return selected
+
+    def _release(self, lane: _Lane, guild: Hashable, user: Hashable) -> None:
+        guild_flow = lane.guilds[guild]
+        user_flow = guild_flow.users[user]
+        self.running -= 1
+        lane.running -= 1
+        guild_flow.running -= 1
+        user_flow.running -= 1
+        for counter, key in (
+            (self._guilds_running, guild),
+            (self._users_running, (guild, user)),
+        ):
+            counter[key] -= 1
+            if not counter[key]:
+                del counter[key]
+        self._drop_idle_flows(lane, guild, user)
+        self._dispatch()
+
+    @staticmethod
+    def _drop_idle_flows(lane: _Lane, guild: Hashable, user: Hashable) -> None:
+        guild_flow = lane.guilds[guild]
+        if not guild_flow.users[user].running and not guild_flow.users[user].jobs:
+            del guild_flow.users[user]
+        if not guild_flow.users:
+            del lane.guilds[guild]
@@ -0,0 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+
+class HostLimiter:
+    """
+    Limits the number of simultaneous jobs processing URLs, in total
+    and per host of the URL. Semaphores of hosts are dropped once they are idle.
+
+    Args:
+        limit (int): the max number of simultaneous jobs
+        limit_per_host (int): the max number of simultaneous jobs for one host
+    """
+
+    def __init__(self, limit: int, limit_per_host: int) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._semaphore = asyncio.Semaphore(limit)
+        self._host_semaphores: dict[str, tuple[asyncio.Semaphore, int]] = {}
+
+    @asynccontextmanager
+    async def acquire(self, url: str) -> AsyncIterator[None]:
+        host = urlsplit(url).netloc.lower()
+        semaphore, users = self._host_semaphores.get(
+            host, (asyncio.Semaphore(self.limit_per_host), 0)
+        )
+        self._host_semaphores[host] = (semaphore, users + 1)
+        try:
+            # The host slot is taken first, so jobs waiting for a busy host
+            # do not hold global slots other hosts could use
+            async with semaphore, self._semaphore:
+                yield
+        finally:
+            semaphore, users = self._host_semaphores[host]
+            if users == 1:
+                del self._host_semaphores[host]
+            else:
+                self._host_semaphores[host] = (semaphore, users - 1)
@@ -1,18 +1,104 @@
-from bs4 import BeautifulSoup
-import requests
-
-
-def extract_article(url: str) -> tuple[str, str]:
-    soup = BeautifulSoup(requests.get(url).content, features="html.parser")
-    title = soup.title.string
-    for script in soup(["script", "style"]):
-        script.extract()
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = tuple(
-        chunk
-        for line in lines
-        for phrase in line.split("  ")
-        if (chunk := phrase.strip())
+import codecs
+from html.parser import HTMLParser
+from typing import Iterator
+
+from utils.charset import resolve_charset
+
+# Text inside these elements is not a part of the article
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "math"}
+_FEED_SIZE = 64 * 1024
+
+
+class ArticleTextExtractor(HTMLParser):
+    """
+    Extracts the title and the text of an HTML document in one pass
+    without building a tree. Text of skipped elements is dropped as it is read,
+    the rest is split into lines and phrases separated with double spaces,
+    stripped non-empty phrases are collected in chunks as soon as their line ends.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title: str | None = None
+        self.chunks: list[str] = []
+        self._title_parts: list[str] | None = None
+        self._is_title_read = False
+        self._skipped_depth = 0
+        self._line = ""
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag == "title" and not self._is_title_read and not self._skipped_depth:
+            self._title_parts = []
+        elif tag in _SKIPPED_TAGS:
+            self._skipped_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts) or None
+            self._title_parts = None
+            self._is_title_read = True
+        elif tag in _SKIPPED_TAGS and self._skipped_depth:
+            self._skipped_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+            self._add_text(data)
+        elif not self._skipped_depth:
+            self._add_text(data)
+
+    def close(self) -> None:
+        super().close()
+        if self._title_parts is not None:
+            self.handle_endtag("title")
+        self._add_line(self._line)
+        self._line = ""
+
+    def _add_text(self, text: str) -> None:
+        lines = (self._line + text).splitlines(keepends=True)
+        # The last line may continue in the next piece of text
+        self._line = (
+            lines.pop()
+            if lines and lines[-1] == lines[-1].rstrip("\r\n\v\f\x1c\x1d\x1e\x85  ")
+            else ""
+        )
+        for line in lines:
+            self._add_line(line)
+
+    def _add_line(self, line: str) -> None:
+        self.chunks.extend(
+            chunk for phrase in line.strip().split("  ") if (chunk := phrase.strip())
+        )
+
+
+def iter_html_pieces(content: bytes, charset: str = None) -> Iterator[str]:
+    """Decodes the page in pieces of _FEED_SIZE bytes with the charset resolved
+    from the header charset, the page prefix or its Japanese text,
+    so the whole page is never decoded at once"""
+    decoder = codecs.getincrementaldecoder(resolve_charset(content, charset))(
+        errors="replace"
     )
-    return title, "\n".join(chunks)
+    for start in range(0, len(content), _FEED_SIZE):
+        if text := decoder.decode(content[start : start + _FEED_SIZE]):
+            yield text
+    if text := decoder.decode(b"", final=True):
+        yield text
+
+
+def iter_article_chunks(
+    extractor: ArticleTextExtractor, content: bytes, charset: str = None
+) -> Iterator[str]:
+    """Feeds the page to the extractor in pieces yielding chunks as they are extracted"""
+    for text in iter_html_pieces(content, charset):
+        extractor.feed(text)
+        yield from extractor.chunks
+        extractor.chunks.clear()
+    extractor.close()
+    yield from extractor.chunks
+    extractor.chunks.clear()
+
+
+def extract_article(content: bytes, charset: str = None) -> tuple[str | None, str]:
+    extractor = ArticleTextExtractor()
+    body = "\n".join(iter_article_chunks(extractor, content, charset))
+    return extractor.title, body
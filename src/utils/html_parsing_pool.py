@@ -0,0 +1,108 @@
+import asyncio
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import config
+from utils.exceptions import ArticleParsingError, ArticleParsingTimeoutError
+from utils.main_content_extractor import extract_main_content
+
+
+def _raise_parsing_timeout(signum, frame) -> None:
+    raise ArticleParsingTimeoutError("Extracting the article took too much CPU time")
+
+
+def _initialize_worker() -> None:
+    signal.signal(signal.SIGVTALRM, _raise_parsing_timeout)
+
+
+def extract_main_content_with_cpu_limit(
+    content: bytes,
+    charset: str | None,
+    max_length: int | None,
+    cpu_time_limit: float | None,
+) -> tuple[str | None, str]:
+    """Runs extract_main_content in a worker process, raises
+    ArticleParsingTimeoutError once the process spends cpu_time_limit seconds
+    of CPU time on it"""
+    if cpu_time_limit:
+        signal.setitimer(signal.ITIMER_VIRTUAL, cpu_time_limit)
+    try:
+        return extract_main_content(content, charset, max_length)
+    finally:
+        signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+
+
+class HTMLParsingPool:
+    """
+    Extracts articles from HTML pages in worker processes, so parsing
+    does not hold the GIL of the bot process. Python 3.10 process pools
+    cannot replace their workers after a number of tasks, so the whole pool
+    is replaced after max_jobs_per_process jobs per process. The replaced pool
+    finishes its submitted jobs before its workers exit.
+
+    Args:
+        processes (int): the number of worker processes,
+            articles are extracted in the calling thread if it is not positive
+        max_jobs_per_process (int): the number of jobs per process
+            after which the pool is replaced, pools are never replaced if it is None
+        cpu_time_limit (float): the max number of seconds of CPU time of a job,
+            jobs are not limited if it is None
+    """
+
+    def __init__(
+        self,
+        processes: int = config.ARTICLE_PARSING_PROCESSES,
+        max_jobs_per_process: int = config.ARTICLE_PARSING_MAX_JOBS_PER_PROCESS,
+        cpu_time_limit: float = config.ARTICLE_PARSING_CPU_TIME_LIMIT,
+    ) -> None:
+        self.processes = processes
+        self.max_jobs_per_process = max_jobs_per_process
+        self.cpu_time_limit = cpu_time_limit
+        self._executor: ProcessPoolExecutor | None = None
+        self._jobs = 0
+
+    async def extract_main_content(
+        self, content: bytes, charset: str = None, max_length: int = None
+    ) -> tuple[str | None, str]:
+        if self.processes <= 0:
+            return extract_main_content(content, charset, max_length)
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor,
+                extract_main_content_with_cpu_limit,
+                content,
+                charset,
+                max_length,
+                self.cpu_time_limit,
+            )
+        except BrokenProcessPool as exception:
+            # A worker was killed, the next job starts a new pool
+            if self._executor is executor:
+                self._replace_executor()
+            raise ArticleParsingError(
+                "A worker process died while extracting the article"
+            ) from exception
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None or (
+            self.max_jobs_per_process
+            and self._jobs >= self.max_jobs_per_process * self.processes
+        ):
+            self._replace_executor()
+        self._jobs += 1
+        return self._executor
+
+    def _replace_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ProcessPoolExecutor(
+            self.processes, initializer=_initialize_worker
+        )
+        self._jobs = 0
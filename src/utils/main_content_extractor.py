@@ -0,0 +1,280 @@
+import re
+from dataclasses import dataclass, field
+
+from utils.html_article_extractor import ArticleTextExtractor, iter_article_chunks
+
+# Elements which text makes separate blocks
+_BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "td",
+    "th",
+    "tr",
+    "ul",
+}
+# Elements which may hold the main content and receive scores of their blocks
+_CONTAINER_TAGS = {
+    "article": 10,
+    "blockquote": 3,
+    "body": 0,
+    "div": 5,
+    "main": 10,
+    "section": 5,
+    "td": 3,
+}
+# Elements which never hold the main content
+_BOILERPLATE_TAGS = {"aside", "footer", "form", "header", "nav"}
+_POSITIVE_PATTERN = re.compile(
+    r"article|body|content|entry|main|news|page|post|story|text", re.IGNORECASE
+)
+_NEGATIVE_PATTERN = re.compile(
+    r"ad-|ads|banner|breadcrumb|comment|footer|footnote|header|menu|meta|nav|"
+    r"popular|promo|ranking|related|share|sidebar|social|sponsor|widget",
+    re.IGNORECASE,
+)
+_CLASS_WEIGHT = 25
+# Blocks shorter than this are kept in the main content but do not score it
+_MIN_SCORED_LENGTH = 25
+_MAX_LINK_DENSITY = 0.5
+_PUNCTUATION_PATTERN = re.compile(r"[、。，,．！？!?]")
+
+
+@dataclass
+class _Container:
+    tag: str
+    id: int
+    score: float
+    is_boilerplate: bool
+    text_length: int = 0
+    link_length: int = 0
+    is_scored: bool = False
+
+
+@dataclass
+class _Block:
+    containers: tuple[int, ...]
+    is_boilerplate: bool
+    chunks: list[str] = field(default_factory=list)
+    text_length: int = 0
+    link_length: int = 0
+
+    @property
+    def link_density(self) -> float:
+        return self.link_length / self.text_length if self.text_length else 0.0
+
+
+def _get_class_weight(attrs: list[tuple[str, str | None]]) -> int:
+    names = " ".join(
+        value for name, value in attrs if name in ("class", "id") and value
+    )
+    if not names:
+        return 0
+    weight = 0
+    if _NEGATIVE_PATTERN.search(names):
+        weight -= _CLASS_WEIGHT
+    if _POSITIVE_PATTERN.search(names):
+        weight += _CLASS_WEIGHT
+    return weight
+
+
+def _get_text_length(text: str) -> int:
+    return len("".join(text.split()))
+
+
+class MainContentExtractor(ArticleTextExtractor):
+    """
+    Extracts the title and the main content of an HTML document in one pass.
+    Text is collected in blocks split by block-level elements. Like readability,
+    blocks score the containers they are nested in by their length and punctuation
+    weighted by the share of text outside links, container scores are adjusted
+    by their class and id names and link density. Blocks of the best container
+    are kept unless they mostly consist of links or are nested in navigation,
+    headers, footers, forms or asides. If no block is long enough to be scored,
+    all text is kept. The main content is known only once the whole document
+    is read, so its chunks are emitted on close.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.blocks: list[_Block] = []
+        self._containers: dict[int, _Container] = {}
+        self._stack: list[_Container] = []
+        self._link_depth = 0
+        self._block: _Block | None = None
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if not self._skipped_depth and tag not in ("title", "a"):
+            if tag in _BLOCK_TAGS or tag in _CONTAINER_TAGS:
+                self._end_block()
+            if tag in _CONTAINER_TAGS or tag in _BOILERPLATE_TAGS:
+                self._push_container(tag, attrs)
+        elif tag == "a" and not self._skipped_depth:
+            self._link_depth += 1
+        super().handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        super().handle_endtag(tag)
+        if self._skipped_depth or tag == "title":
+            return
+        if tag == "a":
+            self._link_depth = max(self._link_depth - 1, 0)
+        elif tag in _BLOCK_TAGS or tag in _CONTAINER_TAGS:
+            self._end_block()
+            if tag in _CONTAINER_TAGS or tag in _BOILERPLATE_TAGS:
+                self._pop_container(tag)
+
+    def handle_data(self, data: str) -> None:
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        elif not self._skipped_depth:
+            block = self._get_block()
+            if self._link_depth:
+                block.link_length += _get_text_length(data)
+            self._add_text(data)
+
+    def close(self) -> None:
+        super().close()
+        self._end_block()
+        self.chunks.extend(self.get_main_chunks())
+
+    def get_main_chunks(self) -> list[str]:
+        best = max(
+            (
+                container
+                for container in self._containers.values()
+                if container.is_scored
+            ),
+            key=lambda container: container.score
+            * (1 - container.link_length / (container.text_length or 1)),
+            default=None,
+        )
+        if best is None:
+            return [chunk for block in self.blocks for chunk in block.chunks]
+        return [
+            chunk
+            for block in self.blocks
+            if best.id in block.containers
+            and (best.is_boilerplate or not block.is_boilerplate)
+            and block.link_density <= _MAX_LINK_DENSITY
+            for chunk in block.chunks
+        ]
+
+    def _add_line(self, line: str) -> None:
+        block = self._get_block()
+        for phrase in line.strip().split("  "):
+            if chunk := phrase.strip():
+                block.chunks.append(chunk)
+                block.text_length += _get_text_length(chunk)
+
+    def _get_block(self) -> _Block:
+        if self._block is None:
+            self._block = _Block(
+                tuple(container.id for container in self._stack),
+                bool(self._stack) and self._stack[-1].is_boilerplate,
+            )
+        return self._block
+
+    def _end_block(self) -> None:
+        if self._line:
+            self._add_line(self._line)
+            self._line = ""
+        if (block := self._block) is None:
+            return
+        self._block = None
+        if not block.chunks:
+            return
+        self.blocks.append(block)
+        for container in self._stack:
+            container.text_length += block.text_length
+            container.link_length += min(block.link_length, block.text_length)
+        if block.text_length < _MIN_SCORED_LENGTH:
+            return
+        score = (
+            1
+            + len(_PUNCTUATION_PATTERN.findall("".join(block.chunks)))
+            + min(block.text_length // 100, 3)
+        ) * (1 - block.link_density)
+        scored = [
+            container
+            for container in reversed(self._stack)
+            if container.tag in _CONTAINER_TAGS
+        ][:3]
+        for level, container in enumerate(scored):
+            container.is_scored = True
+            container.score += score / (1 if level == 0 else level * 2)
+
+    def _push_container(self, tag: str, attrs: list) -> None:
+        is_boilerplate = (bool(self._stack) and self._stack[-1].is_boilerplate) or (
+            tag in _BOILERPLATE_TAGS
+        )
+        weight = _get_class_weight(attrs)
+        if weight < 0 and tag != "body":
+            is_boilerplate = True
+        container = _Container(
+            tag,
+            len(self._containers),
+            _CONTAINER_TAGS.get(tag, 0) + weight,
+            is_boilerplate,
+        )
+        self._containers[container.id] = container
+        self._stack.append(container)
+
+    def _pop_container(self, tag: str) -> None:
+        # Unclosed elements nested in the closed one are closed with it
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                return
+
+
+def truncate_chunks(chunks: list[str], max_length: int | None) -> list[str]:
+    """Keeps leading chunks with total length, including line breaks between them,
+    not exceeding max_length, cuts the first chunk if it is longer on its own"""
+    if not max_length:
+        return chunks
+    truncated = []
+    length = 0
+    for chunk in chunks:
+        length += len(chunk) + bool(truncated)
+        if length > max_length:
+            if not truncated:
+                truncated.append(chunk[:max_length])
+            break
+        truncated.append(chunk)
+    return truncated
+
+
+def extract_main_content(
+    content: bytes, charset: str = None, max_length: int = None
+) -> tuple[str | None, str]:
+    """Returns the title and the main content of an HTML document,
+    the content is cut to max_length characters if it is passed"""
+    extractor = MainContentExtractor()
+    chunks = list(iter_article_chunks(extractor, content, charset))
+    body = "\n".join(truncate_chunks(chunks, max_length))
+    return extractor.title, body
@@ -0,0 +1,23 @@
+from threading import Lock
+from time import monotonic, sleep
+
+
+class RateLimiter:
+    """
+    Spreads calls evenly, so acquire returns at most rate times per second.
+
+    Args:
+        rate (float): the max number of calls per second
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate
+        self._next_call_at = monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = monotonic()
+            call_at = max(now, self._next_call_at)
+            self._next_call_at = call_at + self._interval
+        sleep(call_at - now)